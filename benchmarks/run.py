@@ -0,0 +1,246 @@
+"""Benchmarks for the page fault analyzer, its logging and the file operations.
+
+Run from the repository root:
+
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --quick --compare results.json
+
+Every benchmark uses fixed seeds and reports the best of --repeat runs.
+Results are written as JSON; --compare prints the change of each result
+against an earlier run, so regressions show up across versions.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pagefault.analyzer import PageFaultAnalyzer
+from pagefault.fileops import UserFiles
+from pagefault.pageid import HASH_FUNCTIONS, PageIdGenerator
+from pagefault.policies import POLICIES, make_policy
+from pagefault.workloads import WORKLOADS, filenames, generate
+
+# Metrics where smaller is better; everything else is a rate
+LOWER_IS_BETTER = ("ns_per_ref", "ns_per_call", "median_us", "p95_us")
+
+
+def best_of(func, repeat):
+    """Smallest wall time of `repeat` calls to func()"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def result(benchmark, params, metric, value, **extra):
+    return dict(benchmark=benchmark, params=params, metric=metric, value=value, **extra)
+
+
+# --- Analyzer ---
+def bench_process_page(args):
+    results = []
+    for workload in args.workloads:
+        ids = generate(workload, args.refs, args.pages)
+        names = filenames(ids)
+        # OPT is given the page ids the analyzer will compute, outside the timed run
+        future = PageIdGenerator(page_space=args.pages).page_ids(names)
+        for policy in POLICIES:
+            for frames in args.frames:
+                def run():
+                    instance = make_policy("opt", frames, future=future) if policy == "opt" else policy
+                    analyzer = PageFaultAnalyzer(frames, None, instance, page_space=args.pages)
+                    process_page = analyzer.process_page
+                    for name in names:
+                        process_page(name, "READ")
+                    run.hit_ratio = analyzer.get_stats()['hit_ratio']
+                seconds = best_of(run, args.repeat)
+                results.append(result("process_page", {'workload': workload, 'policy': policy, 'frames': frames},
+                                      "refs_per_sec", len(names) / seconds, hit_ratio=run.hit_ratio))
+    return results
+
+
+def bench_log_page(args, tmp):
+    """Cost per reference of each logging mode, and its overhead over no logging"""
+    names = filenames(generate("zipf", args.refs, args.pages))
+    modes = [("none", {'log_path': None}),
+             ("buffered", {'log_path': os.path.join(tmp, "buffered.log")}),
+             ("sync", {'log_path': os.path.join(tmp, "sync.log"), 'buffered_log': False}),
+             ("binary", {'log_path': None, 'binary_log_path': os.path.join(tmp, "trace.bin")})]
+    timings = {}
+    for mode, options in modes:
+        refs = names if mode != "sync" else names[:max(1000, len(names) // 20)]
+
+        def run():
+            analyzer = PageFaultAnalyzer(16, policy="lru", page_space=args.pages, **options)
+            analyzer.reset()
+            for name in refs:
+                analyzer.process_page(name, "READ")
+            analyzer.flush()
+            analyzer.close()
+        timings[mode] = best_of(run, args.repeat) / len(refs) * 1e9
+    return [result("log_page", {'mode': mode}, "ns_per_ref", ns, overhead_ns=ns - timings["none"])
+            for mode, ns in timings.items()]
+
+
+def bench_generate_page_id(args):
+    names = filenames(generate("zipf", args.refs, args.pages))
+    results = []
+    for hash_name in HASH_FUNCTIONS:
+        generator = PageIdGenerator(hash_name, args.pages)
+        seconds = best_of(lambda: [generator._compute(name) for name in names], args.repeat)
+        results.append(result("generate_page_id", {'hash': hash_name, 'cache': "off"},
+                              "ns_per_call", seconds / len(names) * 1e9))
+
+        def cached():
+            generator.clear()
+            page_id = generator.page_id
+            for name in names:
+                page_id(name)
+        seconds = best_of(cached, args.repeat)
+        results.append(result("generate_page_id", {'hash': hash_name, 'cache': "on"},
+                              "ns_per_call", seconds / len(names) * 1e9,
+                              cache_hit_ratio=generator.cache_hits / len(names) * 100))
+    return results
+
+
+# --- File Operations ---
+def latency(func, repeat):
+    """(median, p95) latency of func() in microseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return statistics.median(samples), samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+
+def bench_file_ops(args, tmp):
+    results = []
+    line = "the quick brown fox jumps over the lazy dog\n"
+    for label, size in (("small", 1 << 10), ("large", args.large_bytes)):
+        content = (line * (size // len(line) + 1))[:size].rstrip("\n")
+        for cached in (False, True):
+            analyzer = PageFaultAnalyzer(log_path=None, page_size=4096,
+                                         cache_bytes=2 * args.large_bytes if cached else None)
+            files = UserFiles(os.path.join(tmp, f"{label}-{cached}"), analyzer)
+            files.create("bench.txt")
+            files.modify("bench.txt", content)
+            cases = [
+                ("read", lambda: files.read("bench.txt")),
+                ("search_miss", lambda: files.search("bench.txt", "zebra")),
+                ("search_first", lambda: files.search("bench.txt", "fox", 1)),
+                ("write", lambda: files.write("bench.txt", "appended line")),
+                ("modify", lambda: files.modify("bench.txt", content)),
+                ("create_delete", lambda: (files.create("tmp.txt"), files.delete("tmp.txt"))),
+            ]
+            for op, func in cases:
+                # Warm up so cached runs measure hits rather than the first load
+                func()
+                median, p95 = latency(func, args.op_repeat)
+                results.append(result("file_op", {'op': op, 'size': label, 'bytes': size,
+                                                  'content_cache': cached},
+                                      "median_us", median, p95_us=p95))
+    return results
+
+
+# --- Reporting ---
+def metadata(args):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {
+        'commit': commit,
+        'time': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'numpy': numpy_version,
+        'options': {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+    }
+
+
+def key_of(entry):
+    return entry['benchmark'], json.dumps(entry['params'], sort_keys=True), entry['metric']
+
+
+def compare(baseline, results):
+    """Print the change of each result against the same benchmark in baseline"""
+    old = {key_of(entry): entry['value'] for entry in baseline['results']}
+    print(f"{'benchmark':<18} {'params':<60} {'change':>9}")
+    for entry in results:
+        before = old.get(key_of(entry))
+        if not before:
+            continue
+        change = (entry['value'] - before) / before * 100
+        if entry['metric'] in LOWER_IS_BETTER:
+            change = -change
+        flag = "  REGRESSION" if change < -10 else ""
+        print(f"{entry['benchmark']:<18} {json.dumps(entry['params'], sort_keys=True):<60} {change:>+8.1f}%{flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the page fault analyzer and file operations")
+    parser.add_argument("--quick", action="store_true", help="small sizes for a fast smoke run")
+    parser.add_argument("--refs", type=int, help="references per analyzer run (default: 100000, quick: 10000)")
+    parser.add_argument("--pages", type=int, default=1024, help="distinct pages in the workloads")
+    parser.add_argument("--frames", type=int, nargs="+", default=[4, 16, 64, 256], help="frame sizes")
+    parser.add_argument("--workloads", nargs="+", choices=list(WORKLOADS), default=list(WORKLOADS))
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark; the best is kept")
+    parser.add_argument("--op-repeat", type=int, default=50, help="samples per file operation")
+    parser.add_argument("--large-bytes", type=int, help="size of the large file (default: 8 MiB, quick: 1 MiB)")
+    parser.add_argument("--only", nargs="+", choices=["process_page", "log_page", "generate_page_id", "file_ops"],
+                        help="run only these benchmarks")
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    parser.add_argument("--compare", help="earlier JSON results to compare against")
+    args = parser.parse_args(argv)
+    args.refs = args.refs or (10_000 if args.quick else 100_000)
+    args.large_bytes = args.large_bytes or ((1 if args.quick else 8) << 20)
+    if args.quick:
+        args.repeat, args.op_repeat = 1, min(args.op_repeat, 10)
+
+    selected = args.only or ["process_page", "log_page", "generate_page_id", "file_ops"]
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in selected:
+            print(f"Running {name}...", file=sys.stderr)
+            if name == "process_page":
+                results += bench_process_page(args)
+            elif name == "log_page":
+                results += bench_log_page(args, tmp)
+            elif name == "generate_page_id":
+                results += bench_generate_page_id(args)
+            else:
+                results += bench_file_ops(args, tmp)
+
+    report = {'meta': metadata(args), 'results': results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    elif not args.compare:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,31 @@
+"""Page replacement analysis core shared by the Tk front ends.
+
+Only pagefault.gui imports Tk, and NumPy is only imported by the code
+that uses it, so the analyzer can run headless. The names below are
+loaded on first access: `import pagefault` costs nothing until one of
+them is used.
+"""
+
+import importlib
+
+_EXPORTS = {
+    'ReplacementPolicy': 'policies', 'FIFOPolicy': 'policies', 'LRUPolicy': 'policies',
+    'OPTPolicy': 'policies', 'ClockPolicy': 'policies', 'LFUPolicy': 'policies',
+    'ARCPolicy': 'policies', 'POLICIES': 'policies', 'make_policy': 'policies',
+    'PageFaultAnalyzer': 'analyzer', 'LRUPageFaultAnalyzer': 'analyzer', 'compare_policies': 'analyzer',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module("." + module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,332 @@
+import os
+import threading
+import time
+
+from . import snapshot
+from .binlog import BinaryTraceWriter
+from .history import HistoryRing
+from .logbuffer import BufferedLogWriter, format_record
+from .metrics import ReferenceMetrics
+from .pagecache import ContentCache
+from .pageid import PageIdGenerator
+from .policies import POLICIES, make_policy
+
+
+# --- Page Fault Analyzer Class ---
+class PageFaultAnalyzer:
+    """Counts page hits and faults for file operations under a replacement policy.
+
+    `policy` is either a policy name from POLICIES or a ReplacementPolicy
+    instance. OPT needs the future reference string, so it is only useful
+    when built with one (see compare_policies). log_path=None disables the
+    text log; otherwise records go through a BufferedLogWriter unless
+    buffered_log=False asks for the old synchronous append per reference.
+    log_writer shares an existing BufferedLogWriter instead, e.g. between
+    the per-user analyzers of an AnalyzerService; the analyzer then neither
+    truncates nor closes it. log_max_bytes and log_max_age rotate the
+    buffered log (see logrotate.py). binary_log_path additionally records
+    every reference in the compact binary trace format. page_history
+    keeps the last `history_size` references in a HistoryRing. Page ids
+    hash the file's basename with `hash_function` into 1..page_space (see
+    PageIdGenerator).
+
+    With page_size set, process_range() models files page by page: each
+    fixed-size page an operation touches is a separate reference keyed by
+    (page id, page index).
+
+    With working_set_window set, every recorded reference also updates a
+    ReferenceMetrics: the working set over the last `working_set_window`
+    references, reuse times, faults per file and operation and fault
+    inter-arrival times, reported under get_stats()['metrics']. They
+    roughly double the cost of a reference, so they are off by default.
+
+    snapshot_path makes the analyzer persistent: it resumes from the
+    snapshot there (see snapshot.resume) and saves a new one every
+    `checkpoint_every` references, on checkpoint() and on close(). The
+    binary trace is the journal between snapshots, so pair it with
+    binary_log_path; without one, references since the last checkpoint
+    are lost on a crash. OPT cannot be snapshotted.
+
+    cache_bytes enables a real ContentCache of that size, evicted by the
+    same policy (LRU when the analyzer simulates OPT). Its measured hits
+    and misses are reported next to the simulated ones in get_stats().
+
+    Recording, get_stats() and reset() hold an internal lock, so file
+    operations may run on worker threads while the GUI reads statistics.
+    """
+
+    def __init__(self, frame_size=4, log_path="page_fault_log.txt", policy="lru", buffered_log=True,
+                 binary_log_path=None, history_size=1000, hash_function="md5", page_space=100,
+                 page_size=None, cache_bytes=None, log_writer=None, working_set_window=None,
+                 snapshot_path=None, checkpoint_every=10000, log_max_bytes=None, log_max_age=None):
+        if isinstance(policy, str):
+            policy = make_policy(policy, frame_size)
+        self.frame_size = policy.capacity
+        self.policy = policy
+        self.page_faults = 0
+        self.page_hits = 0
+        self.page_history = HistoryRing(history_size)
+        self.metrics = ReferenceMetrics(working_set_window) if working_set_window else None
+        self.id_generator = PageIdGenerator(hash_function, page_space)
+        self.page_size = page_size
+        self.content_cache = None
+        if cache_bytes:
+            self.content_cache = ContentCache("lru" if policy.name == "opt" else policy.name, cache_bytes)
+        self._owns_log = log_writer is None
+        if log_writer is not None:
+            log_path = log_writer.path
+        elif log_path is not None and buffered_log:
+            log_writer = BufferedLogWriter(log_path, max_bytes=log_max_bytes, max_age=log_max_age)
+        self.log_path = log_path
+        self.log_writer = log_writer
+        self.binary_log = BinaryTraceWriter(binary_log_path) if binary_log_path else None
+        self._lock = threading.RLock()
+        self.snapshot_path = snapshot_path
+        self.checkpoint_every = checkpoint_every
+        self._unsaved = 0
+        if snapshot_path is not None:
+            if policy.name == "opt":
+                raise ValueError("OPT depends on its future reference string and cannot be snapshotted")
+            snapshot.resume(self, snapshot_path)
+
+    @property
+    def frames(self):
+        return self.policy.pages()
+
+    def generate_page_id(self, filename):
+        """Generate consistent page ID based on filename using hash"""
+        return self.id_generator.page_id(filename)
+
+    def access(self, page_id):
+        """Count one reference to page_id without recording history or logging"""
+        if self.policy.access(page_id):
+            self.page_hits += 1
+            return True
+        self.page_faults += 1
+        return False
+
+    def process_page(self, filename, operation):
+        """Process page reference using the configured replacement policy"""
+        with self._lock:
+            page_id = self.generate_page_id(filename)
+            timestamp = time.time()
+            hit = self.access(page_id)
+            status = "Hit" if hit else "Page Fault"
+
+            self.page_history.append(page_id, operation, filename, hit, timestamp)
+            if self.metrics is not None:
+                self.metrics.record(page_id, operation, filename, hit, timestamp)
+            self.log_page(page_id, operation, filename, status, timestamp)
+            if self.binary_log is not None:
+                self.binary_log.write(timestamp, operation, filename, page_id, hit)
+            self._recorded(1)
+
+    def page_keys(self, filename, offset=0, length=0):
+        """Page keys an operation on [offset, offset + length) of filename references.
+
+        Without page_size this is the file's single page id. A zero-length
+        range still touches the page holding `offset`.
+        """
+        with self._lock:
+            page_id = self.generate_page_id(filename)
+        if not self.page_size:
+            return [page_id]
+        first = offset // self.page_size
+        last = (offset + max(length, 1) - 1) // self.page_size
+        return [(page_id, index) for index in range(first, last + 1)]
+
+    def process_range(self, filename, operation, offset, length):
+        """Process every page of filename overlapping [offset, offset + length).
+
+        Falls back to one whole-file reference when page_size is not set.
+        """
+        if not self.page_size:
+            return self.process_page(filename, operation)
+
+        access, append, log_page = self.access, self.page_history.append, self.log_page
+        record = self.metrics.record if self.metrics is not None else None
+        binary_log = self.binary_log
+        with self._lock:
+            timestamp = time.time()
+            keys = self.page_keys(filename, offset, length)
+            for key in keys:
+                hit = access(key)
+                append(key, operation, filename, hit, timestamp)
+                if record is not None:
+                    record(key, operation, filename, hit, timestamp)
+                log_page(key, operation, filename, "Hit" if hit else "Page Fault", timestamp)
+                if binary_log is not None:
+                    binary_log.write(timestamp, operation, filename, key, hit)
+            self._recorded(len(keys))
+
+    def process_batch(self, references):
+        """Record a group of operations under one lock, with one log write and one flush.
+
+        `references` holds (filename, operation, offset, length) tuples;
+        length None references the whole file as process_page() does,
+        otherwise the range is split into pages as in process_range().
+        Returns the page keys referenced, in order.
+        """
+        access, append = self.access, self.page_history.append
+        record = self.metrics.record if self.metrics is not None else None
+        binary_log = self.binary_log
+        records, keys = [], []
+        with self._lock:
+            timestamp = time.time()
+            for filename, operation, offset, length in references:
+                if length is None or not self.page_size:
+                    group = [self.generate_page_id(filename)]
+                else:
+                    group = self.page_keys(filename, offset, length)
+                for key in group:
+                    hit = access(key)
+                    append(key, operation, filename, hit, timestamp)
+                    if record is not None:
+                        record(key, operation, filename, hit, timestamp)
+                    records.append((timestamp, operation, filename, key, "Hit" if hit else "Page Fault"))
+                    if binary_log is not None:
+                        binary_log.write(timestamp, operation, filename, key, hit)
+                keys.extend(group)
+            if self.log_writer is not None:
+                self.log_writer.write_many(records)
+            elif self.log_path is not None and records:
+                try:
+                    with open(self.log_path, "a") as f:
+                        f.write("".join(map(format_record, records)))
+                except Exception as e:
+                    print("Logging failed:", e)
+            self._recorded(len(records))
+        self.flush()
+        return keys
+
+    def _recorded(self, count):
+        self._unsaved += count
+        if self.snapshot_path is not None and self._unsaved >= self.checkpoint_every:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Save a snapshot now; returns its size in bytes, or None without snapshot_path"""
+        if self.snapshot_path is None:
+            return None
+        with self._lock:
+            size = snapshot.save(self, self.snapshot_path)
+            self._unsaved = 0
+            return size
+
+    def simulate(self, references):
+        """Evaluate a whole trace offline with this analyzer's policy and frame size.
+
+        `references` is a sequence of filenames or page ids. Live frames,
+        counters, history and logs are left untouched; see batch.simulate.
+        """
+        from .batch import simulate
+
+        if len(references) and isinstance(references[0], str):
+            references = self.id_generator.page_ids(references)
+        return simulate(references, self.policy.name, self.frame_size)
+
+    def log_page(self, page_id, operation, filename, status, timestamp):
+        record = (timestamp, operation, filename, page_id, status)
+        if self.log_writer is not None:
+            self.log_writer.write(record)
+            return
+        if self.log_path is None:
+            return
+        try:
+            with open(self.log_path, "a") as f:
+                f.write(format_record(record))
+        except Exception as e:
+            print("Logging failed:", e)
+
+    def flush(self):
+        """Write any buffered log records to disk"""
+        if self.log_writer is not None:
+            self.log_writer.flush()
+        if self.binary_log is not None:
+            self.binary_log.flush()
+
+    def close(self):
+        if self.snapshot_path is not None and self._unsaved:
+            self.checkpoint()
+        if self.log_writer is not None:
+            if self._owns_log:
+                self.log_writer.close()
+            else:
+                self.log_writer.flush()
+        if self.binary_log is not None:
+            self.binary_log.close()
+
+    def get_stats(self):
+        with self._lock:
+            total = self.page_faults + self.page_hits
+            hit_ratio = (self.page_hits / total * 100) if total > 0 else 0
+            return {
+                'policy': self.policy.label,
+                'total': total,
+                'hits': self.page_hits,
+                'faults': self.page_faults,
+                'hit_ratio': hit_ratio,
+                'frames': self.policy.pages(),
+                'history': self.page_history.last(10),
+                'metrics': self.metrics.get_stats() if self.metrics is not None else None,
+                'cache': self.content_cache.get_stats() if self.content_cache is not None else None,
+            }
+
+    def reset(self):
+        with self._lock:
+            self.policy.reset()
+            self.page_faults = 0
+            self.page_hits = 0
+            self.page_history.clear()
+            if self.metrics is not None:
+                self.metrics.clear()
+            if self.content_cache is not None:
+                self.content_cache.clear()
+            if self.binary_log is not None:
+                self.binary_log.truncate()
+            self._unsaved = 0
+            if self.snapshot_path is not None and os.path.exists(self.snapshot_path):
+                os.remove(self.snapshot_path)
+            if self.log_writer is not None:
+                if self._owns_log:
+                    self.log_writer.truncate()
+                return
+            if self.log_path is None:
+                return
+            try:
+                open(self.log_path, 'w').close()
+            except:
+                pass
+
+
+class LRUPageFaultAnalyzer(PageFaultAnalyzer):
+    """PageFaultAnalyzer fixed to the LRU policy"""
+
+    def __init__(self, frame_size=4, log_path="page_fault_log.txt"):
+        super().__init__(frame_size, log_path, policy="lru")
+
+
+def compare_policies(page_ids, frame_size, policies=None):
+    """Replay the same reference string under several policies.
+
+    Returns {policy name: {'hits', 'faults', 'total', 'hit_ratio'}} so the
+    policies can be ranked by fault count on identical input.
+    """
+    page_ids = list(page_ids)
+    results = {}
+    for name in policies or POLICIES:
+        options = {'future': page_ids} if name == "opt" else {}
+        policy = make_policy(name, frame_size, **options)
+        access = policy.access
+        hits = 0
+        for page_id in page_ids:
+            if access(page_id):
+                hits += 1
+        total = len(page_ids)
+        results[policy.name] = {
+            'hits': hits,
+            'faults': total - hits,
+            'total': total,
+            'hit_ratio': (hits / total * 100) if total > 0 else 0,
+        }
+    return results
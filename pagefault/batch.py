@@ -0,0 +1,183 @@
+from collections import OrderedDict
+
+from .policies import make_policy
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class BatchResult:
+    """Outcome of simulate(): a per-reference hit vector plus final state"""
+
+    def __init__(self, policy, hits, frames):
+        self.policy = policy
+        self.frame_size = policy.capacity
+        self.frames = frames
+        if np is not None and not isinstance(hits, np.ndarray):
+            hits = np.frombuffer(hits, dtype=np.bool_)
+        self.hits = hits
+        self.total = len(hits)
+        self.hit_count = sum(hits) if np is None else int(hits.sum())
+
+    @property
+    def faults(self):
+        """Per-reference fault vector (the complement of hits)"""
+        if np is not None:
+            return ~self.hits
+        return bytearray(1 - hit for hit in self.hits)
+
+    def get_stats(self):
+        faults = self.total - self.hit_count
+        return {
+            'policy': self.policy.label,
+            'total': self.total,
+            'hits': self.hit_count,
+            'faults': faults,
+            'hit_ratio': (self.hit_count / self.total * 100) if self.total > 0 else 0,
+            'frames': self.frames,
+        }
+
+
+# --- Batched Simulation ---
+def _run_lru(ids, capacity, hits):
+    frames = OrderedDict()
+    move, evict = frames.move_to_end, frames.popitem
+    size = 0
+    for i, page_id in enumerate(ids):
+        if page_id in frames:
+            move(page_id)
+            hits[i] = 1
+        else:
+            if size >= capacity:
+                evict(False)
+            else:
+                size += 1
+            frames[page_id] = None
+    return list(frames)
+
+
+def _run_fifo(ids, capacity, hits):
+    frames = OrderedDict()
+    evict = frames.popitem
+    size = 0
+    for i, page_id in enumerate(ids):
+        if page_id in frames:
+            hits[i] = 1
+        else:
+            if size >= capacity:
+                evict(False)
+            else:
+                size += 1
+            frames[page_id] = None
+    return list(frames)
+
+
+def _run_clock(ids, capacity, hits):
+    slots = []
+    ref = bytearray(capacity)
+    slot = {}
+    hand = 0
+    for i, page_id in enumerate(ids):
+        index = slot.get(page_id)
+        if index is not None:
+            ref[index] = 1
+            hits[i] = 1
+            continue
+        if len(slots) < capacity:
+            index = len(slots)
+            slots.append(page_id)
+        else:
+            while ref[hand]:
+                ref[hand] = 0
+                hand = hand + 1 if hand + 1 < capacity else 0
+            index = hand
+            del slot[slots[index]]
+            slots[index] = page_id
+            hand = hand + 1 if hand + 1 < capacity else 0
+        slot[page_id] = index
+        ref[index] = 1
+    return slots[hand:] + slots[:hand]
+
+
+def _run_policy(policy, ids, hits):
+    access = policy.access
+    for i, page_id in enumerate(ids):
+        if access(page_id):
+            hits[i] = 1
+    return policy.pages()
+
+
+# Policies for which re-referencing the page just accessed is a hit that
+# leaves the frame state unchanged, so runs of repeats can be collapsed.
+RUN_INVARIANT = ("lru", "fifo", "clock")
+
+
+def _run(built, ids):
+    hits = bytearray(len(ids))
+    if built.name == "lru":
+        frames = _run_lru(ids, built.capacity, hits)
+    elif built.name == "fifo":
+        frames = _run_fifo(ids, built.capacity, hits)
+    elif built.name == "clock":
+        frames = _run_clock(ids, built.capacity, hits)
+    else:
+        frames = _run_policy(built, ids, hits)
+    return hits, frames
+
+
+def simulate(page_ids, policy="lru", frame_size=4):
+    """Evaluate a whole reference string and return a BatchResult.
+
+    LRU, FIFO and Clock run specialised loops over plain ints with the
+    frame store bound to locals, and with NumPy, runs of repeated
+    references are marked as hits without entering the loop. LFU, ARC and
+    OPT call policy.access per reference, which is no faster than feeding
+    the analyzer; they skip only its history and logging.
+    """
+    built = make_policy(policy, frame_size)
+    array = None
+    if np is not None and built.name in RUN_INVARIANT:
+        try:
+            array = np.asarray(page_ids)
+        except (ValueError, TypeError):
+            pass
+        if array is not None and (array.ndim != 1 or array.dtype.kind not in "iu"):
+            array = None
+
+    if array is None:
+        ids = page_ids.tolist() if np is not None and isinstance(page_ids, np.ndarray) else list(page_ids)
+        if built.name == "opt":
+            built = make_policy(policy, frame_size, future=ids)
+        hits, frames = _run(built, ids)
+        return BatchResult(built, hits, frames)
+
+    repeat = np.zeros(len(array), dtype=np.bool_)
+    if len(array) > 1:
+        np.equal(array[1:], array[:-1], out=repeat[1:])
+    fresh = ~repeat
+    run_hits, frames = _run(built, array[fresh].tolist())
+    hits = repeat
+    hits[fresh] = np.frombuffer(run_hits, dtype=np.bool_)
+    return BatchResult(built, hits, frames)
+
+
+def cross_check(page_ids, policy="lru", frame_size=4):
+    """Replay page_ids through the scalar analyzer and compare with simulate().
+
+    Returns the index of the first reference where the two disagree, or
+    None when hit vectors and final frames match.
+    """
+    from .analyzer import PageFaultAnalyzer
+
+    ids = page_ids.tolist() if np is not None and isinstance(page_ids, np.ndarray) else list(page_ids)
+    result = simulate(ids, policy, frame_size)
+    options = {'future': ids} if policy == "opt" else {}
+    analyzer = PageFaultAnalyzer(frame_size, log_path=None, policy=make_policy(policy, frame_size, **options))
+    for i, page_id in enumerate(ids):
+        if analyzer.access(page_id) != bool(result.hits[i]):
+            return i
+    if analyzer.frames != result.frames:
+        return len(ids)
+    return None
@@ -0,0 +1,266 @@
+import mmap
+import os
+import struct
+import time
+
+from .optional import numpy
+from .pageid import NO_PAGE, split_page_key
+
+# --- Binary Trace Format ---
+# A 16 byte header (magic, version, record size) followed by fixed-width
+# little-endian records:
+#   timestamp   float64  seconds since the epoch
+#   page_id     uint32
+#   file_id     uint32   index into the "<trace>.names" sidecar, one name per line
+#   op          uint8    index into OPERATIONS (unknown operations are stored as REF)
+#   hit         uint8    1 for a hit, 0 for a page fault
+#   (2 bytes padding)
+#   page_index  uint32   page within the file, NO_PAGE for whole-file references
+#                        (version 2 only; version 1 records end at the padding)
+# Filenames are interned so each record stays 24 bytes whatever the name length.
+
+MAGIC = b"PFTRACE\0"
+VERSION = 2
+HEADER = struct.Struct("<8sHHI")
+RECORDS = {1: struct.Struct("<dIIBB2x"), 2: struct.Struct("<dIIBB2xI")}
+RECORD = RECORDS[VERSION]
+OPERATIONS = ("REF", "CREATE", "WRITE", "MODIFY", "READ", "SEARCH", "DELETE")
+OP_CODES = {name: code for code, name in enumerate(OPERATIONS)}
+NO_FILE = 0xFFFFFFFF
+
+_record_dtypes = {}
+
+
+def record_dtype(version=VERSION):
+    """NumPy structured dtype of one record, built on first use"""
+    dtype = _record_dtypes.get(version)
+    if dtype is None:
+        np = numpy()
+        if np is None:
+            raise RuntimeError("NumPy is required for structured record access")
+        names = ['timestamp', 'page_id', 'file_id', 'op', 'hit']
+        formats = ['<f8', '<u4', '<u4', 'u1', 'u1']
+        offsets = [0, 8, 12, 16, 17]
+        if version >= 2:
+            names.append('page_index')
+            formats.append('<u4')
+            offsets.append(20)
+        dtype = _record_dtypes[version] = np.dtype({
+            'names': names, 'formats': formats, 'offsets': offsets, 'itemsize': RECORDS[version].size,
+        })
+    return dtype
+
+
+def names_path(path):
+    return path + ".names"
+
+
+def is_binary_trace(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+# --- Writer ---
+class BinaryTraceWriter:
+    """Appends fixed-width records to a binary trace, buffering writes.
+
+    An existing trace in an older format (version 1) is rewritten in the
+    current one when opened, keeping its records; anything else that is
+    not a current trace raises ValueError.
+    """
+
+    def __init__(self, path, buffer_size=1 << 16):
+        self.path = path
+        self.buffer_size = buffer_size
+        self._buffer = bytearray()
+        self._names = {}
+        self._open()
+
+    def _open(self):
+        if os.path.exists(self.path) and os.path.getsize(self.path) >= HEADER.size:
+            self._check_header()
+            if os.path.exists(names_path(self.path)):
+                with open(names_path(self.path), "r", encoding="utf-8") as f:
+                    for line in f:
+                        self._names.setdefault(line.rstrip("\n"), len(self._names))
+        else:
+            with open(self.path, "wb") as f:
+                f.write(HEADER.pack(MAGIC, VERSION, RECORD.size, 0))
+            open(names_path(self.path), "w").close()
+
+    def _check_header(self):
+        with open(self.path, "rb") as f:
+            magic, version, size, _ = HEADER.unpack(f.read(HEADER.size))
+        if magic == MAGIC and version < VERSION and version in RECORDS and size == RECORDS[version].size:
+            self._upgrade(RECORDS[version])
+        elif magic != MAGIC or version != VERSION or size != RECORD.size:
+            raise ValueError(f"{self.path} is not a version {VERSION} binary trace")
+
+    def _upgrade(self, old):
+        """Rewrite the trace from records of the `old` layout to the current one"""
+        tmp = self.path + ".tmp"
+        step = old.size * 4096
+        with open(self.path, "rb") as src, open(tmp, "wb") as out:
+            src.seek(HEADER.size)
+            out.write(HEADER.pack(MAGIC, VERSION, RECORD.size, 0))
+            while True:
+                chunk = src.read(step)
+                # A record cut short by a crash is dropped, as readers ignore it too
+                chunk = chunk[:len(chunk) - len(chunk) % old.size]
+                if not chunk:
+                    break
+                out.write(b"".join(RECORD.pack(*fields, NO_PAGE) for fields in old.iter_unpack(chunk)))
+        os.replace(tmp, self.path)
+
+    def intern(self, filename):
+        if filename is None:
+            return NO_FILE
+        file_id = self._names.get(filename)
+        if file_id is None:
+            file_id = self._names[filename] = len(self._names)
+            with open(names_path(self.path), "a", encoding="utf-8") as f:
+                f.write(filename.replace("\n", " ") + "\n")
+        return file_id
+
+    def write(self, timestamp, operation, filename, page_id, hit):
+        """Append one record; page_id may be a (page id, page index) key"""
+        page_id, page_index = split_page_key(page_id)
+        self._buffer += RECORD.pack(timestamp, page_id, self.intern(filename),
+                                    OP_CODES.get(operation, 0), 1 if hit else 0, page_index)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            with open(self.path, "ab") as f:
+                f.write(self._buffer)
+            self._buffer.clear()
+
+    def position(self):
+        """(records written, timestamp of the first record or None), after a flush.
+
+        Snapshots store this to find the tail they do not cover; the first
+        timestamp tells a truncated and refilled trace from the one they saw.
+        """
+        self.flush()
+        with open(self.path, "rb") as f:
+            f.seek(HEADER.size)
+            first = f.read(RECORD.size)
+            count = (os.fstat(f.fileno()).st_size - HEADER.size) // RECORD.size
+        return count, RECORD.unpack(first)[0] if len(first) == RECORD.size else None
+
+    def truncate(self):
+        self._buffer.clear()
+        self._names = {}
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self._open()
+
+    close = flush
+
+
+# --- Reader ---
+class BinaryTrace:
+    """Memory-mapped view of a binary trace.
+
+    `records` is a NumPy structured array over the mapping when NumPy is
+    installed, so columns such as records['page_id'] are zero-copy views;
+    drop those arrays before close() since they borrow the mapping.
+    Iterating yields (page key, operation, filename) like replay.read_trace.
+    Version 1 traces are still readable.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, size, _ = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version not in RECORDS or size != RECORDS[version].size:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a binary trace")
+        self.version = version
+        self._record = RECORDS[version]
+        self._count = (len(self._mmap) - HEADER.size) // size
+        self._view = memoryview(self._mmap)[HEADER.size:HEADER.size + self._count * size]
+        self.names = []
+        if os.path.exists(names_path(path)):
+            with open(names_path(path), "r", encoding="utf-8") as f:
+                self.names = [line.rstrip("\n") for line in f]
+
+    @property
+    def records(self):
+        dtype = record_dtype(self.version)
+        return numpy().frombuffer(self._view, dtype=dtype)
+
+    def page_ids(self):
+        """The page_id column; page indexes of page-granular records are not included"""
+        if numpy() is not None:
+            return self.records['page_id']
+        return [record[1] for record in self._record.iter_unpack(self._view)]
+
+    def page_keys(self):
+        """All page keys in order: a copied page_id array when every record is
+        whole-file and NumPy is installed, otherwise a list of keys"""
+        if numpy() is not None:
+            records = self.records
+            if self.version < 2 or not (records['page_index'] != NO_PAGE).any():
+                return records['page_id'].copy()
+        return [key for key, _operation, _filename in self]
+
+    def filename(self, file_id):
+        return None if file_id == NO_FILE else self.names[file_id]
+
+    def iter_records(self, start=0):
+        """Yield raw (timestamp, page_id, file_id, op, hit[, page_index]) tuples from record `start` on"""
+        return self._record.iter_unpack(self._view[min(start, self._count) * self._record.size:])
+
+    def __iter__(self):
+        names = self.names
+        for record in self._record.iter_unpack(self._view):
+            page_id, file_id, op = record[1], record[2], record[3]
+            if len(record) > 5 and record[5] != NO_PAGE:
+                page_id = (page_id, record[5])
+            yield page_id, OPERATIONS[op], None if file_id == NO_FILE else names[file_id]
+
+    def __len__(self):
+        return self._count
+
+    def close(self):
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# --- Text Log Conversion ---
+def convert_text_log(source, destination, page_id_for=None):
+    """Convert a page_fault_log.txt (or plain reference string) to a binary trace"""
+    from .pageid import PageIdGenerator
+    from .replay import iter_lines, parse_trace
+
+    page_id_for = page_id_for or PageIdGenerator().page_id
+    if os.path.exists(destination):
+        os.remove(destination)
+    writer = BinaryTraceWriter(destination)
+    last_stamp, last_time = None, 0.0
+    count = 0
+    for line in iter_lines(source):
+        stamp, hit = None, False
+        if " | Page ID: " in line:
+            stamp = line.split(" | ", 1)[0]
+            hit = line.rstrip().endswith("| Hit")
+        if stamp != last_stamp:
+            last_stamp = stamp
+            last_time = time.mktime(time.strptime(stamp, "%Y-%m-%d %H:%M:%S")) if stamp else 0.0
+        for page_id, operation, filename in parse_trace((line,), page_id_for):
+            writer.write(last_time, operation, filename, page_id, hit)
+            count += 1
+    writer.close()
+    return count
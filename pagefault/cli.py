@@ -0,0 +1,243 @@
+import argparse
+import sys
+
+from .pageid import HASH_FUNCTIONS, PageIdGenerator
+from .policies import POLICIES
+from .importers import TRACE_FORMATS
+from .users import KDFS
+
+
+def page_id_for(args):
+    return PageIdGenerator(args.hash, args.page_space).page_id
+
+
+def cmd_replay(args):
+    from .replay import replay_file, format_summary
+    for policy in args.policy:
+        stats = replay_file(args.trace, policy, args.frames, args.lookahead, page_id_for(args),
+                            args.format, args.page_size)
+        print(format_summary(args.trace, stats))
+        print()
+    return 0
+
+
+def cmd_curve(args):
+    from .replay import read_trace, page_ids
+    from .stackdist import StackDistanceAnalyzer, fifo_sweep, belady_anomalies
+    references = page_ids(read_trace(args.trace, page_id_for(args), args.format, args.page_size))
+    if args.fifo:
+        curve = fifo_sweep(references, range(1, args.max_frames + 1))
+        title = "FIFO"
+    else:
+        curve = StackDistanceAnalyzer().feed(references).miss_ratio_curve(args.max_frames)
+        title = "LRU"
+
+    print(f"{title} fault curve for {args.trace}")
+    print("Frames | Hits       | Faults     | Hit Ratio")
+    print("-" * 46)
+    for point in curve:
+        print(f"{point['frames']:<6} | {point['hits']:<10} | {point['faults']:<10} | {point['hit_ratio']:.2f}%")
+    if args.fifo:
+        anomalies = belady_anomalies(curve)
+        if anomalies:
+            print("\nBelady's anomaly (more frames, more faults):")
+            for smaller, larger in anomalies:
+                print(f"  {smaller} -> {larger} frames")
+        else:
+            print("\nNo Belady's anomaly in this range.")
+    return 0
+
+
+def cmd_convert(args):
+    from .binlog import convert_text_log
+    count = convert_text_log(args.source, args.destination, page_id_for(args))
+    print(f"Wrote {count} records to {args.destination}")
+    return 0
+
+
+def cmd_simulate(args):
+    import time
+    from .batch import simulate, cross_check
+    from .binlog import BinaryTrace
+    from .replay import read_trace, page_ids, trace_format
+
+    if args.format == "binary" or args.format == "auto" and trace_format(args.trace) == "binary":
+        with BinaryTrace(args.trace) as trace:
+            ids = trace.page_keys()
+    else:
+        ids = list(page_ids(read_trace(args.trace, page_id_for(args), args.format, args.page_size)))
+    for policy in args.policy:
+        start = time.perf_counter()
+        stats = simulate(ids, policy, args.frames).get_stats()
+        elapsed = time.perf_counter() - start
+        rate = stats['total'] / elapsed if elapsed > 0 else 0.0
+        print(f"{stats['policy']:<6} {args.frames} frames: {stats['hits']} hits, {stats['faults']} faults, "
+              f"{stats['hit_ratio']:.2f}% hit ratio ({rate:,.0f} refs/sec)")
+        if args.check:
+            mismatch = cross_check(ids, policy, args.frames)
+            if mismatch is not None:
+                print(f"  cross-check FAILED at reference {mismatch}")
+                return 1
+            print("  cross-check against the scalar analyzer passed")
+    return 0
+
+
+def cmd_passwd(args):
+    import getpass
+    from .users import UserStore
+    store = UserStore(args.users, args.kdf, iterations=args.iterations)
+    password = getpass.getpass(f"Password for {args.username}: ")
+    if password != getpass.getpass("Repeat password: "):
+        print("Passwords do not match.", file=sys.stderr)
+        return 1
+    store.set_password(args.username, password)
+    print(f"Updated {args.username} in {args.users}")
+    return 0
+
+
+def parse_time(text):
+    """Epoch seconds from "YYYY-MM-DD HH:MM:SS", "YYYY-MM-DD" or a number"""
+    import time
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    for layout in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return time.mktime(time.strptime(text, layout))
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognised time: {text!r}")
+
+
+def cmd_query(args):
+    from .logrotate import query
+    start = parse_time(args.since) if args.since else None
+    end = parse_time(args.until) if args.until else None
+    count = 0
+    for line in query(args.log, start, end):
+        if args.faults and not line.rstrip().endswith("| Page Fault"):
+            continue
+        count += 1
+        if not args.count:
+            sys.stdout.write(line)
+    if args.count:
+        print(count)
+    return 0
+
+
+def cmd_serve(args):
+    import asyncio
+    from .server import FileServer
+    from .service import AnalyzerService
+    from .users import UserStore
+    service = AnalyzerService(args.frames, args.pool_frames, args.policy, args.log, args.page_size,
+                              args.cache_bytes, hash_function=args.hash, page_space=args.page_space,
+                              state_dir=args.state, checkpoint_every=args.checkpoint_every,
+                              log_max_bytes=args.log_max_bytes, log_max_age=args.log_max_age)
+    server = FileServer(service, UserStore(args.users), args.data)
+    ready = lambda srv: print(f"Serving on http://{args.host}:{args.port}", flush=True)
+    try:
+        asyncio.run(server.serve(args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m pagefault",
+                                     description="Headless page replacement analysis")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    # Page id options for traces that name files instead of logging page ids
+    ids = argparse.ArgumentParser(add_help=False)
+    ids.add_argument("--hash", choices=sorted(HASH_FUNCTIONS), default="md5",
+                     help="hash used to map filenames to page ids; crc32 is the fastest (default: md5)")
+    ids.add_argument("--page-space", type=int, default=100,
+                     help="number of distinct page ids filenames map to (default: 100)")
+
+    # Trace format options for commands that read a trace
+    traces = argparse.ArgumentParser(add_help=False)
+    traces.add_argument("--format", choices=TRACE_FORMATS, default="auto",
+                        help="trace format; strace and blktrace dumps are imported directly (default: auto)")
+    traces.add_argument("--page-size", type=int,
+                        help="split imported strace/blktrace accesses into pages of this size")
+
+    replay = commands.add_parser("replay", parents=[ids, traces], help="replay a trace file through the analyzer")
+    replay.add_argument("trace", help="page_fault_log.txt, a reference string, or a strace/blktrace dump")
+    replay.add_argument("--policy", action="append", choices=list(POLICIES),
+                        help="replacement policy; repeat to compare several (default: lru)")
+    replay.add_argument("--frames", type=int, default=4, help="number of page frames")
+    replay.add_argument("--lookahead", type=int, default=100000,
+                        help="OPT lookahead window in references (default: 100000)")
+    replay.set_defaults(func=cmd_replay)
+
+    curve = commands.add_parser("curve", parents=[ids, traces], help="fault counts for every frame size in one pass")
+    curve.add_argument("trace", help="page_fault_log.txt, a reference string, or a strace/blktrace dump")
+    curve.add_argument("--max-frames", type=int, default=16, help="largest frame count to report")
+    curve.add_argument("--fifo", action="store_true",
+                       help="sweep FIFO instead of LRU and report Belady's anomaly")
+    curve.set_defaults(func=cmd_curve)
+
+    convert = commands.add_parser("convert", parents=[ids], help="convert a text log to the binary trace format")
+    convert.add_argument("source", help="page_fault_log.txt or a plain reference string file")
+    convert.add_argument("destination", help="binary trace to write")
+    convert.set_defaults(func=cmd_convert)
+
+    simulate = commands.add_parser("simulate", parents=[ids, traces], help="evaluate a whole trace with the batch simulator")
+    simulate.add_argument("trace", help="binary trace, page_fault_log.txt, a reference string, or a strace/blktrace dump")
+    simulate.add_argument("--policy", action="append", choices=list(POLICIES),
+                          help="replacement policy; repeat to compare several (default: lru)")
+    simulate.add_argument("--frames", type=int, default=4, help="number of page frames")
+    simulate.add_argument("--check", action="store_true",
+                          help="verify the result against the scalar analyzer")
+    simulate.set_defaults(func=cmd_simulate)
+
+    passwd = commands.add_parser("passwd", help="add a user or change a password in users.txt")
+    passwd.add_argument("users", help="users.txt to update")
+    passwd.add_argument("username")
+    passwd.add_argument("--kdf", choices=KDFS, default="pbkdf2_sha256",
+                        help="password hashing function (default: pbkdf2_sha256)")
+    passwd.add_argument("--iterations", type=int, default=200_000, help="PBKDF2 iterations (default: 200000)")
+    passwd.set_defaults(func=cmd_passwd)
+
+    query = commands.add_parser("query", help="print log lines between two times, across rotated segments")
+    query.add_argument("log", help="page_fault_log.txt; its rotated .gz segments are searched too")
+    query.add_argument("--since", help='start time, "YYYY-MM-DD HH:MM:SS" or epoch seconds')
+    query.add_argument("--until", help='end time, inclusive, in the same forms')
+    query.add_argument("--faults", action="store_true", help="only page faults")
+    query.add_argument("--count", action="store_true", help="print the number of matching lines instead")
+    query.set_defaults(func=cmd_query)
+
+    serve = commands.add_parser("serve", parents=[ids], help="serve the file operations as a local HTTP API")
+    serve.add_argument("--host", default="127.0.0.1", help="address to bind (default: 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=8765, help="port to listen on (default: 8765)")
+    serve.add_argument("--users", default="users.txt", help="user store (default: users.txt)")
+    serve.add_argument("--data", default="users_data", help="folder holding each user's files (default: users_data)")
+    serve.add_argument("--log", default="page_fault_log.txt", help="page fault log (default: page_fault_log.txt)")
+    serve.add_argument("--policy", choices=list(POLICIES), default="lru", help="replacement policy (default: lru)")
+    serve.add_argument("--frames", type=int, default=4, help="page frames per user")
+    serve.add_argument("--pool-frames", type=int, default=16, help="frames in the pool shared by all users")
+    serve.add_argument("--page-size", type=int, help="model files page by page with this page size")
+    serve.add_argument("--cache-bytes", type=int, default=8 << 20, help="content cache size (default: 8 MiB)")
+    serve.add_argument("--state", help="keep each user's analyzer snapshots and trace here and resume from them")
+    serve.add_argument("--checkpoint-every", type=int, default=10000,
+                       help="references between snapshots with --state (default: 10000)")
+    serve.add_argument("--log-max-bytes", type=int, default=16 << 20,
+                       help="rotate and compress the log past this size (default: 16 MiB)")
+    serve.add_argument("--log-max-age", type=float, help="also rotate the log after this many seconds")
+    serve.set_defaults(func=cmd_serve)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if getattr(args, "policy", ()) is None:
+        args.policy = ["lru"]
+    try:
+        return args.func(args)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
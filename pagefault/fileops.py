@@ -0,0 +1,275 @@
+import fnmatch
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .largefile import read_range, replace_range, write_atomic
+from .search import READ_CHUNK, InvertedIndex, search_file, search_text
+
+
+def read_manifest(path):
+    """[(filename, initial content or None)] from a manifest file.
+
+    One file per line: "name", or "name<TAB>content" to give it a first
+    line. Blank lines and lines starting with '#' are skipped.
+    """
+    entries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            name, sep, content = line.partition("\t")
+            entries.append((name.strip(), content if sep else None))
+    return entries
+
+
+def read_chunked(path, progress, chunk_size=READ_CHUNK):
+    """Read a text file in chunks, calling progress(characters read, file size) after each"""
+    parts = []
+    done = 0
+    with open(path, "r") as f:
+        size = os.fstat(f.fileno()).st_size
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            parts.append(chunk)
+            done += len(chunk)
+            progress(min(done, size), size)
+    return "".join(parts)
+
+
+# --- User File Operations ---
+class UserFiles:
+    """File operations on one user's folder, each recorded with the analyzer.
+
+    Errors surface as the usual OSError subclasses (FileNotFoundError,
+    FileExistsError, ...) for the caller to report. Reads go through the
+    analyzer's content cache when it has one; writes, modifies and deletes
+    invalidate it. With indexed=True an InvertedIndex of the folder is
+    built up front and kept current by every change made through here.
+
+    read() and search() take an optional progress(done, total) callback
+    for callers running them off the GUI thread; it may raise to abort.
+    read_range() and replace_range() work on byte ranges (UTF-8 text) so
+    large files never have to be loaded whole.
+
+    The batch operations (import_directory, create_many, delete_glob) do
+    their file I/O on a thread pool and record the whole group with one
+    analyzer.process_batch() call, so thousands of files cost one log
+    write and flush. They return {'done': [names], 'failed': {name: error}};
+    a failure skips that file only.
+    """
+
+    def __init__(self, folder, analyzer, indexed=False):
+        self.folder = folder
+        self.analyzer = analyzer
+        os.makedirs(folder, exist_ok=True)
+        self.index = InvertedIndex(folder).build() if indexed else None
+
+    @property
+    def cache(self):
+        return self.analyzer.content_cache
+
+    def get_full_path(self, filename):
+        return os.path.join(self.folder, filename.strip())
+
+    def exists(self, filename):
+        return os.path.exists(self.get_full_path(filename))
+
+    def _require(self, filename):
+        path = self.get_full_path(filename)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"File '{filename}' doesn't exist.")
+        return path
+
+    def _invalidate(self, path):
+        if self.cache is not None:
+            self.cache.invalidate(path)
+
+    def create(self, filename):
+        with open(self.get_full_path(filename), 'x'):
+            pass
+        if self.index is not None:
+            self.index.replaced(filename.strip())
+        self.analyzer.process_page(filename, "CREATE")
+
+    def write(self, filename, content):
+        """Append a line of content"""
+        path = self._require(filename)
+        offset = os.path.getsize(path)
+        with open(path, "a") as f:
+            f.write(content + "\n")
+        self._invalidate(path)
+        if self.index is not None:
+            self.index.appended(filename.strip(), content)
+        self.analyzer.process_range(filename, "WRITE", offset, os.path.getsize(path) - offset)
+
+    def modify(self, filename, content):
+        """Replace the file's contents atomically"""
+        path = self._require(filename)
+        write_atomic(path, content + "\n")
+        self._invalidate(path)
+        if self.index is not None:
+            self.index.replaced(filename.strip())
+        self.analyzer.process_range(filename, "MODIFY", 0, os.path.getsize(path))
+
+    def read(self, filename, progress=None):
+        path = self._require(filename)
+        loader = None if progress is None else (lambda p: read_chunked(p, progress))
+        if self.cache is not None:
+            content = self.cache.read(path, loader)
+        elif loader is not None:
+            content = loader(path)
+        else:
+            with open(path, "r") as f:
+                content = f.read()
+        self.analyzer.process_range(filename, "READ", 0, os.path.getsize(path))
+        return content
+
+    def read_range(self, filename, offset, length):
+        """Text of the `length` bytes at offset"""
+        path = self._require(filename)
+        data = read_range(path, offset, length)
+        self.analyzer.process_range(filename, "READ", offset, len(data))
+        return data.decode("utf-8", "replace")
+
+    def replace_range(self, filename, offset, length, content):
+        """Replace `length` bytes at offset with content; True if written in place.
+
+        Equal-length edits overwrite the bytes where they are; others
+        stream the file through a temporary copy (see largefile.replace_range).
+        Pages from offset to the end of what changed are recorded as MODIFY.
+        """
+        path = self._require(filename)
+        data = content.encode("utf-8")
+        in_place = replace_range(path, offset, length, data)
+        self._invalidate(path)
+        if self.index is not None:
+            self.index.replaced(filename.strip())
+        changed = len(data) if in_place else os.path.getsize(path) - offset
+        self.analyzer.process_range(filename, "MODIFY", offset, changed)
+        return in_place
+
+    def search(self, filename, keyword, limit=None, progress=None):
+        """Up to `limit` lines containing keyword (case-insensitive) as "Line N: text" strings.
+
+        Searches the cached text when the content cache holds the file,
+        otherwise scans the file (see search_file) and stops at `limit`.
+        Only the part of the file searched up to that point is recorded.
+        """
+        path = self._require(filename)
+        text = self.cache.peek(path) if self.cache is not None else None
+        if text is not None:
+            found, end = search_text(text, keyword, limit)
+            scanned = len(text[:end].encode()) if end < len(text) else os.path.getsize(path)
+        else:
+            found, scanned = search_file(path, keyword, limit, progress)
+        self.analyzer.process_range(filename, "SEARCH", 0, scanned)
+        return [f"Line {lineno}: {line.strip()}" for lineno, line in found]
+
+    def search_all(self, keyword):
+        """{filename: line numbers} for keyword across the folder, from the index"""
+        if self.index is None:
+            self.index = InvertedIndex(self.folder).build()
+        return self.index.lookup(keyword)
+
+    def delete(self, filename):
+        path = self._require(filename)
+        os.remove(path)
+        self._invalidate(path)
+        if self.index is not None:
+            self.index.removed(filename.strip())
+        self.analyzer.process_page(filename, "DELETE")
+
+    # --- Batch Operations ---
+    def _batch(self, func, names, workers, progress):
+        """Run func(name) -> references for each name on a pool; record the references of those that succeed.
+
+        progress(done, total) is called as files finish; if it raises
+        (a cancelled task), files not started yet are skipped, and what
+        did finish is still recorded before the error propagates.
+        """
+        references, done, failed = [], [], {}
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fms-batch")
+        futures = {}
+
+        def collect(future):
+            name = futures.pop(future)
+            try:
+                references.extend(future.result())
+                done.append(name)
+            except (OSError, ValueError) as e:
+                failed[name] = str(e)
+
+        try:
+            futures.update((pool.submit(func, name), name) for name in names)
+            total = len(futures)
+            for count, future in enumerate(as_completed(list(futures)), 1):
+                collect(future)
+                if progress is not None:
+                    progress(count, total)
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            # Files that finished after a cancel are on disk, so they are recorded too
+            for future in [future for future in futures if not future.cancelled()]:
+                collect(future)
+            if references:
+                self.analyzer.process_batch(references)
+        return {'done': sorted(done), 'failed': failed}
+
+    def import_directory(self, source, pattern="*", overwrite=False, workers=8, progress=None):
+        """Copy the files in source matching pattern into the folder"""
+        names = sorted(name for name in os.listdir(source)
+                       if fnmatch.fnmatch(name, pattern) and os.path.isfile(os.path.join(source, name)))
+
+        def copy(name):
+            path = self.get_full_path(name)
+            if not overwrite and os.path.exists(path):
+                raise FileExistsError(f"File '{name}' already exists.")
+            shutil.copyfile(os.path.join(source, name), path)
+            self._invalidate(path)
+            if self.index is not None:
+                self.index.replaced(name)
+            return [(name, "CREATE", 0, None), (name, "WRITE", 0, os.path.getsize(path))]
+        return self._batch(copy, names, workers, progress)
+
+    def create_many(self, entries, workers=8, progress=None):
+        """Create files from (name, initial content or None) pairs, e.g. read_manifest()'s"""
+        contents = {}
+        for name, content in entries:
+            contents[name.strip()] = content
+
+        def create(name):
+            if not name or os.path.basename(name) != name:
+                raise ValueError(f"Invalid file name: {name!r}")
+            content = contents[name]
+            path = self.get_full_path(name)
+            with open(path, "x") as f:
+                if content is not None:
+                    f.write(content + "\n")
+            if self.index is not None:
+                self.index.replaced(name)
+            references = [(name, "CREATE", 0, None)]
+            if content is not None:
+                references.append((name, "WRITE", 0, os.path.getsize(path)))
+            return references
+        return self._batch(create, list(contents), workers, progress)
+
+    def delete_glob(self, pattern, workers=8, progress=None):
+        """Delete every file in the folder whose name matches pattern"""
+        return self._batch(self._delete_one, self.match(pattern), workers, progress)
+
+    def match(self, pattern):
+        """Names of the folder's files matching a glob pattern"""
+        return sorted(name for name in os.listdir(self.folder)
+                      if fnmatch.fnmatch(name, pattern) and os.path.isfile(os.path.join(self.folder, name)))
+
+    def _delete_one(self, name):
+        path = self._require(name)
+        os.remove(path)
+        self._invalidate(path)
+        if self.index is not None:
+            self.index.removed(name)
+        return [(name, "DELETE", 0, None)]
@@ -0,0 +1,681 @@
+"""The Tk file manager with page fault analysis, shared by gui_lru.py and gui_fms.py.
+
+This is the only module of the package that imports Tk; the scripts are
+thin entry points that differ only in the wording of the fault analysis
+labels.
+"""
+
+import os
+import queue
+import sys
+import threading
+import tkinter as tk
+from tkinter import filedialog, font as tkfont, messagebox, simpledialog, ttk
+import tkinter.scrolledtext as scrolledtext
+
+from .fileops import UserFiles, read_manifest
+from .largefile import MappedFile
+from .pageid import format_page_key
+from .policies import POLICIES
+from .search import ParallelSearch
+from .service import AnalyzerService
+from .users import UserStore
+from .worker import BackgroundWorker
+
+# Files larger than this open in the paged viewer instead of a message box
+VIEWER_THRESHOLD = 64 << 10
+
+# --- Progress Dialog ---
+class ProgressDialog:
+    """Progress bar with a Cancel button, shown only if the task outlasts delay_ms.
+
+    Progress counts bytes by default; pass another unit (e.g. "files") to
+    show the counts as they are.
+    """
+
+    def __init__(self, root, title, on_cancel=None, delay_ms=300, unit="bytes"):
+        self.on_cancel = on_cancel
+        self.unit = unit
+        self.win = tk.Toplevel(root)
+        self.win.title(title)
+        self.win.withdraw()
+        self.label = tk.Label(self.win, text="Working...", font=("Arial", 11))
+        self.label.pack(padx=20, pady=10)
+        self.bar = ttk.Progressbar(self.win, length=300, mode='determinate', maximum=100)
+        self.bar.pack(padx=20, pady=5)
+        tk.Button(self.win, text="Cancel", command=self.cancel,
+                  font=("Arial", 11), bg="#F44336", fg="white").pack(pady=10)
+        self.win.protocol("WM_DELETE_WINDOW", self.cancel)
+        root.after(delay_ms, self._show)
+
+    def _show(self):
+        if self.win.winfo_exists():
+            self.win.deiconify()
+
+    def update(self, done, total):
+        if total and self.win.winfo_exists():
+            self.bar['value'] = done * 100 / total
+            if self.unit == "bytes":
+                self.label.config(text=f"{done >> 10} / {total >> 10} KiB")
+            else:
+                self.label.config(text=f"{done} / {total} {self.unit}")
+
+    def cancel(self):
+        if self.on_cancel is not None:
+            self.on_cancel()
+        self.close()
+
+    def close(self):
+        if self.win.winfo_exists():
+            self.win.destroy()
+
+# --- Paged File Viewer ---
+class PagedViewer:
+    """Shows a memory-mapped file a screenful at a time, so its size does not matter.
+
+    Only the visible rows are read from the map and put in the Text widget.
+    on_view(offset, length) is called with each byte range shown; a
+    double-click calls on_edit(offset, length, text) with the line's new
+    text, and the Append button calls on_append(text).
+    """
+
+    def __init__(self, root, path, title, on_view=None, on_edit=None, on_append=None):
+        self.mapped = MappedFile(path)
+        self.on_view = on_view
+        self.on_edit = on_edit
+        self.on_append = on_append
+        self.top = 0
+        self.rows = []
+        self.win = tk.Toplevel(root)
+        self.win.title(title)
+        self.win.geometry("800x600")
+        self.win.protocol("WM_DELETE_WINDOW", self.close)
+
+        bar = tk.Frame(self.win)
+        bar.pack(fill='x')
+        self.status = tk.Label(bar, font=("Arial", 10), anchor='w')
+        self.status.pack(side='left', fill='x', expand=True, padx=5)
+        if on_append is not None:
+            tk.Button(bar, text="Append Line", command=self.append,
+                      font=("Arial", 10), bg="#2196F3", fg="white").pack(side='right', padx=5, pady=3)
+
+        font = tkfont.Font(family="Courier", size=10)
+        self.linespace = font.metrics("linespace")
+        self.scrollbar = tk.Scrollbar(self.win, command=self.scroll)
+        self.scrollbar.pack(side='right', fill='y')
+        self.text = tk.Text(self.win, wrap='none', font=font, state='disabled')
+        self.text.pack(fill='both', expand=True)
+        self.text.bind("<Configure>", lambda e: self.render())
+        self.text.bind("<MouseWheel>", lambda e: self.scroll("scroll", -e.delta // 120 * 3, "units"))
+        self.text.bind("<Button-4>", lambda e: self.scroll("scroll", -3, "units"))
+        self.text.bind("<Button-5>", lambda e: self.scroll("scroll", 3, "units"))
+        self.text.bind("<Prior>", lambda e: self.scroll("scroll", -1, "pages"))
+        self.text.bind("<Next>", lambda e: self.scroll("scroll", 1, "pages"))
+        self.text.bind("<Home>", lambda e: self.scroll("moveto", 0))
+        self.text.bind("<End>", lambda e: self.scroll("moveto", 1))
+        if on_edit is not None:
+            self.text.bind("<Double-Button-1>", self.edit)
+        self.text.focus_set()
+
+    def visible_rows(self):
+        return max(1, self.text.winfo_height() // self.linespace)
+
+    def render(self):
+        # The map is closed while an edit replaces the file, until reload()
+        if not self.win.winfo_exists() or self.mapped.closed:
+            return
+        self.rows = self.mapped.rows(self.top, self.visible_rows())
+        self.text.config(state='normal')
+        self.text.delete('1.0', tk.END)
+        self.text.insert('1.0', "\n".join(text for _start, _end, text in self.rows))
+        self.text.config(state='disabled')
+        size = self.mapped.size
+        end = self.rows[-1][1] if self.rows else size
+        if size:
+            self.scrollbar.set(self.top / size, end / size)
+            self.status.config(text=f"Bytes {self.top:,}-{end:,} of {size:,} ({end * 100 // size}%)")
+        else:
+            self.scrollbar.set(0, 1)
+            self.status.config(text="(File is empty)")
+        if self.rows and self.on_view is not None:
+            self.on_view(self.top, end - self.top)
+
+    def scroll(self, action, amount, unit="units"):
+        if self.mapped.closed:
+            return "break"
+        if action == "moveto":
+            self.top = self.mapped.row_start(int(float(amount) * self.mapped.size))
+        else:
+            rows = int(amount) * (self.visible_rows() if unit == "pages" else 1)
+            if rows < 0:
+                self.top = self.mapped.previous_row(self.top, -rows)
+            else:
+                self.top = self.mapped.next_row(self.top, rows)
+        # Keep the last page full rather than scrolling past the end
+        self.top = min(self.top, self.mapped.previous_row(self.mapped.size, self.visible_rows()))
+        self.render()
+        return "break"
+
+    def edit(self, event):
+        row = int(self.text.index(f"@{event.x},{event.y}").split(".")[0]) - 1
+        if not 0 <= row < len(self.rows):
+            return "break"
+        start, end, text = self.rows[row]
+        new = simpledialog.askstring("Edit Line", "Replace this line with:", initialvalue=text, parent=self.win)
+        if new is not None and new != text:
+            # Release the map first: the edit may replace the file
+            self.mapped.close()
+            self.on_edit(start, end - start, new)
+        return "break"
+
+    def append(self):
+        text = simpledialog.askstring("Append Line", "Enter content to add:", parent=self.win)
+        if text:
+            self.on_append(text)
+
+    def reload(self):
+        """Remap the file after a change and redraw from the same position"""
+        if not self.win.winfo_exists():
+            return
+        self.mapped.refresh()
+        self.top = self.mapped.row_start(self.top)
+        self.render()
+
+    def close(self):
+        self.mapped.close()
+        self.win.destroy()
+
+# --- File Management App ---
+class FileManagementApp:
+    """Login screen and file operations menu; every operation is recorded by the user's analyzer.
+
+    users.txt, users_data/ and analyzer_state/ live in base_dir (the
+    current directory by default). fault_label names the analysis in the
+    menu and statistics window, e.g. "File" or "Page".
+    """
+
+    def __init__(self, root, policy="lru", page_size=None, cache_bytes=8 << 20, base_dir=None,
+                 fault_label="File"):
+        self.root = root
+        self.logged_in_user = None
+        self.fault_label = fault_label
+        self.BASE_DIR = os.path.abspath(base_dir or ".")
+        self.USERS_FILE = os.path.join(self.BASE_DIR, "users.txt")
+        self.USERS_DIR = os.path.join(self.BASE_DIR, "users_data")
+        self.STATE_DIR = os.path.join(self.BASE_DIR, "analyzer_state")
+
+        # Per-user frames and statistics survive logout, and restarts through snapshots in STATE_DIR
+        # (OPT has no state worth keeping); page_analyzer is the logged-in user's session
+        self.service = AnalyzerService(policy=policy, page_size=page_size, cache_bytes=cache_bytes,
+                                       state_dir=self.STATE_DIR if policy != "opt" else None,
+                                       log_max_bytes=16 << 20, working_set_window=1000)
+        self.page_analyzer = None
+        self.policy_label = self.service.policy_label
+        self.root.title(f"Secure File Administration with {self.policy_label} Page Fault Analysis")
+
+        os.makedirs(self.USERS_DIR, exist_ok=True)
+        self.users = UserStore(self.USERS_FILE)
+
+        # File I/O and analysis run here so the Tk main loop never blocks on them
+        self.worker = BackgroundWorker(self.root)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.create_login_screen()
+
+    def create_login_screen(self):
+        for widget in self.root.winfo_children():
+            widget.destroy()
+
+        login_frame = tk.Frame(self.root)
+        login_frame.pack(expand=True, fill='both', padx=20, pady=20)
+
+        tk.Label(login_frame, text="Secure File Administration System", font=("Arial", 16, "bold")).pack(pady=20)
+        tk.Label(login_frame, text="Username:", font=("Arial", 12)).pack(pady=5)
+        self.username_entry = tk.Entry(login_frame, font=("Arial", 12))
+        self.username_entry.pack(pady=5, fill='x')
+
+        tk.Label(login_frame, text="Password:", font=("Arial", 12)).pack(pady=5)
+        self.password_entry = tk.Entry(login_frame, show="*", font=("Arial", 12))
+        self.password_entry.pack(pady=5, fill='x')
+
+        tk.Button(login_frame, text="Login", command=self.authenticate,
+                  font=("Arial", 12), bg="#4CAF50", fg="white", width=20).pack(pady=20)
+
+        self.root.bind('<Return>', lambda event: self.authenticate())
+
+    def authenticate(self):
+        username = self.username_entry.get().strip()
+        password = self.password_entry.get().strip()
+
+        if not username or not password:
+            messagebox.showerror("Error", "Please enter both username and password!")
+            return
+
+        if not os.path.exists(self.USERS_FILE):
+            messagebox.showerror("Error", "users.txt file not found!")
+            return
+
+        user_folder = os.path.join(self.USERS_DIR, username)
+
+        def login():
+            if not self.users.verify(username, password):
+                return None
+            session = self.service.session(username)
+            return session, UserFiles(user_folder, session, indexed=True)
+
+        def logged_in(result):
+            if result is None:
+                messagebox.showerror("Login Failed", "Invalid credentials.")
+                return
+            self.logged_in_user = username
+            self.user_folder = user_folder
+            self.page_analyzer, self.files = result
+            messagebox.showinfo("Login Successful", f"Welcome, {username}!")
+            self.create_main_menu()
+
+        # Password hashing, resuming the session and indexing the user's files are all slow,
+        # so they run off the Tk thread and only the screen change happens here
+        self.run_task(login, error="Login failed", on_done=logged_in)
+
+    def create_main_menu(self):
+        for widget in self.root.winfo_children():
+            widget.destroy()
+
+        main_frame = tk.Frame(self.root)
+        main_frame.pack(expand=True, fill='both', padx=20, pady=20)
+
+        tk.Label(main_frame, text=f"Welcome: {self.logged_in_user}",
+                 font=("Arial", 14, "bold")).pack(pady=10)
+        tk.Label(main_frame, text=f"{self.policy_label} Page Fault Analysis Enabled",
+                 font=("Arial", 10), fg="blue").pack(pady=5)
+
+        buttons = [
+            ("Create File", self.create_file, "#2196F3"),
+            ("Write to File", self.write_file, "#4CAF50"),
+            ("Modify File", self.modify_file, "#FF9800"),
+            ("Read File", self.read_file, "#9C27B0"),
+            ("Search in File", self.search_file, "#607D8B"),
+            ("Search All Files", self.search_all_files, "#455A64"),
+            ("Index Search (Keywords)", self.index_search, "#37474F"),
+            ("Delete File", self.delete_file, "#F44336"),
+            ("Batch Operations", self.batch_operations, "#00796B"),
+            (f"View {self.fault_label} Fault Analysis", self.view_stats, "#795548"),
+            (f"Reset {self.fault_label} Fault Analysis", self.reset_stats, "#FFC107"),
+            ("Logout", self.logout, "#9E9E9E"),
+        ]
+
+        for (text, command, color) in buttons:
+            tk.Button(main_frame, text=text, width=30, command=command,
+                      font=("Arial", 11), bg=color, fg="white", pady=5).pack(pady=3)
+
+    def get_full_path(self, filename):
+        return self.files.get_full_path(filename)
+
+    def run_task(self, func, *args, on_done=None, on_error=None, error="Operation failed", title=None,
+                 unit="bytes"):
+        """Run func(*args) on the worker pool and call on_done(result) back on the Tk thread.
+
+        With a title, func also gets progress=<callback> and a ProgressDialog
+        with a Cancel button is shown while it runs.
+        """
+        dialog = ProgressDialog(self.root, title, unit=unit) if title else None
+
+        def done(result):
+            if dialog is not None:
+                dialog.close()
+            if on_done is not None:
+                on_done(result)
+
+        def failed(e):
+            if dialog is not None:
+                dialog.close()
+            if on_error is not None:
+                on_error(e)
+            else:
+                messagebox.showerror("Error", f"{error}: {str(e)}")
+
+        if dialog is None:
+            return self.worker.run(func, *args, on_done=done, on_error=failed)
+        task = self.worker.run(lambda task, *a: func(*a, progress=task.report), *args, pass_task=True,
+                               on_done=done, on_error=failed, on_progress=dialog.update)
+        dialog.on_cancel = task.cancel
+        return task
+
+    def create_file(self):
+        filename = simpledialog.askstring("Create File", "Enter file name:")
+        if filename:
+            def failed(e):
+                if isinstance(e, FileExistsError):
+                    messagebox.showwarning("File Exists", "File already exists.")
+                else:
+                    messagebox.showerror("Error", f"Failed to create file: {str(e)}")
+            self.run_task(self.files.create, filename, on_error=failed,
+                          on_done=lambda _: messagebox.showinfo("Success", f"File '{filename}' created successfully."))
+
+    def write_file(self):
+        filename = simpledialog.askstring("Write to File", "Enter file name:")
+        if filename:
+            if not self.files.exists(filename):
+                messagebox.showerror("Error", "File doesn't exist. Create it first.")
+                return
+            content = simpledialog.askstring("Write Content", "Enter content to add:")
+            if content:
+                self.run_task(self.files.write, filename, content, error="Failed to write",
+                              on_done=lambda _: messagebox.showinfo("Success", "Content added successfully."))
+
+    def modify_file(self):
+        filename = simpledialog.askstring("Modify File", "Enter file name:")
+        if filename:
+            if not self.files.exists(filename):
+                messagebox.showerror("Error", "File doesn't exist.")
+                return
+            content = simpledialog.askstring("Modify Content", "Enter new content:")
+            if content:
+                self.run_task(self.files.modify, filename, content, error="Failed to modify",
+                              on_done=lambda _: messagebox.showinfo("Success", "File modified successfully."))
+
+    def read_file(self):
+        filename = simpledialog.askstring("Read File", "Enter file name:")
+        if filename:
+            if not self.files.exists(filename):
+                messagebox.showerror("Error", "File doesn't exist.")
+                return
+            if os.path.getsize(self.get_full_path(filename)) > VIEWER_THRESHOLD:
+                self.view_file(filename)
+                return
+            self.run_task(self.files.read, filename, error="Failed to read", title=f"Reading '{filename}'",
+                          on_done=lambda content: messagebox.showinfo(f"Contents of '{filename}'",
+                                                                      content or "(File is empty)"))
+
+    def view_file(self, filename):
+        """Open a large file in a PagedViewer; shown ranges are recorded as READs"""
+        viewer = None
+
+        def edit(offset, length, text):
+            self.run_task(self.files.replace_range, filename, offset, length, text, error="Failed to edit",
+                          on_done=lambda _: viewer.reload(),
+                          on_error=lambda e: (viewer.reload(), messagebox.showerror("Error", f"Failed to edit: {e}")))
+
+        def append(text):
+            self.run_task(self.files.write, filename, text, error="Failed to write",
+                          on_done=lambda _: viewer.reload())
+
+        viewer = PagedViewer(self.root, self.get_full_path(filename), f"Contents of '{filename}'",
+                             on_view=lambda offset, length: self.log_page_op("READ", filename, offset, length),
+                             on_edit=edit, on_append=append)
+
+    def search_file(self):
+        filename = simpledialog.askstring("Search File", "Enter file name:")
+        if filename:
+            keyword = simpledialog.askstring("Search", "Enter keyword to search:")
+            if not self.files.exists(filename):
+                messagebox.showerror("Error", "File doesn't exist.")
+                return
+            if not keyword:
+                return
+
+            def show(matches):
+                if matches:
+                    messagebox.showinfo("Search Results", "\n".join(matches))
+                else:
+                    messagebox.showinfo("No Match", "Keyword not found.")
+            self.run_task(self.files.search, filename, keyword, 10, error="Search failed",
+                          title=f"Searching '{filename}'", on_done=show)
+
+    def search_all_files(self):
+        keyword = simpledialog.askstring("Search All Files", "Enter keyword to search:")
+        if not keyword:
+            return
+        search = ParallelSearch(self.user_folder, keyword, limit_per_file=10)
+        results = queue.Queue()
+        session = self.page_analyzer
+
+        win = tk.Toplevel(self.root)
+        win.title(f"Search All Files: '{keyword}'")
+        win.geometry("600x500")
+        status = tk.Label(win, text="Searching...", font=("Arial", 11))
+        status.pack(pady=5)
+        results_box = scrolledtext.ScrolledText(win, width=70, height=20, font=("Courier", 10))
+        results_box.pack(fill='both', expand=True)
+        cancel_button = tk.Button(win, text="Cancel", command=search.cancel,
+                                  font=("Arial", 11), bg="#F44336", fg="white")
+        cancel_button.pack(pady=5)
+
+        def cancel_and_close():
+            search.cancel()
+            win.destroy()
+        win.protocol("WM_DELETE_WINDOW", cancel_and_close)
+
+        def run():
+            try:
+                for result in search.results():
+                    results.put(result)
+            except Exception as e:
+                results.put(e)
+            results.put(None)
+
+        counts = {'files': 0, 'matches': 0}
+
+        def poll():
+            if self.page_analyzer is not session:
+                # Logged out: nobody to record the rest of the results for
+                search.cancel()
+                return
+            if not win.winfo_exists():
+                return
+            try:
+                while True:
+                    item = results.get_nowait()
+                    if item is None:
+                        state = "Cancelled" if search.cancelled else "Done"
+                        status.config(text=f"{state}: {counts['matches']} matches in {counts['files']} files")
+                        cancel_button.config(state='disabled')
+                        return
+                    if isinstance(item, Exception):
+                        messagebox.showerror("Error", f"Search failed: {str(item)}")
+                        continue
+                    name, scanned, matches = item
+                    self.log_page_op("SEARCH", name, 0, scanned)
+                    if matches:
+                        counts['files'] += 1
+                        counts['matches'] += len(matches)
+                        results_box.insert(tk.END, "".join(f"{name}: Line {n}: {line.strip()}\n"
+                                                           for n, line in matches))
+            except queue.Empty:
+                pass
+            status.config(text=f"Searching... {counts['matches']} matches in {counts['files']} files")
+            self.root.after(100, poll)
+
+        threading.Thread(target=run, daemon=True).start()
+        self.root.after(100, poll)
+
+    def log_page_op(self, operation, filename, offset=0, length=None):
+        if length is None:
+            self.page_analyzer.process_page(filename, operation)
+        else:
+            self.page_analyzer.process_range(filename, operation, offset, length)
+
+    def index_search(self):
+        keyword = simpledialog.askstring("Index Search", "Enter keywords to search:")
+        if keyword:
+            def show(results):
+                if results:
+                    lines = [f"{name}: lines {', '.join(map(str, found[:10]))}"
+                             for name, found in sorted(results.items())[:20]]
+                    messagebox.showinfo("Search Results", "\n".join(lines))
+                else:
+                    messagebox.showinfo("No Match", "Keyword not found.")
+            self.run_task(self.files.search_all, keyword, error="Search failed", on_done=show)
+
+    def delete_file(self):
+        filename = simpledialog.askstring("Delete File", "Enter file name:")
+        if filename:
+            if self.files.exists(filename):
+                confirm = messagebox.askyesno("Delete File", f"Delete '{filename}'?")
+                if confirm:
+                    self.run_task(self.files.delete, filename, error="Failed to delete",
+                                  on_done=lambda _: messagebox.showinfo("Success", "File deleted."))
+            else:
+                messagebox.showerror("Error", "File not found.")
+
+    def batch_operations(self):
+        win = tk.Toplevel(self.root)
+        win.title("Batch Operations")
+        tk.Label(win, text="Batch Operations", font=("Arial", 14, "bold")).pack(pady=10)
+        for text, command, color in [
+            ("Import Directory", self.import_directory, "#2196F3"),
+            ("Create Files from Manifest", self.create_from_manifest, "#4CAF50"),
+            ("Delete Files by Pattern", self.delete_by_pattern, "#F44336"),
+        ]:
+            tk.Button(win, text=text, width=30, command=lambda c=command: (win.destroy(), c()),
+                      font=("Arial", 11), bg=color, fg="white", pady=5).pack(pady=3, padx=20)
+
+    def show_batch_result(self, action, result):
+        text = f"{action} {len(result['done'])} file(s)."
+        if result['failed']:
+            failures = list(result['failed'].items())
+            text += f"\n\n{len(failures)} failed:\n" + "\n".join(f"{name}: {error}" for name, error in failures[:10])
+            if len(failures) > 10:
+                text += f"\n... and {len(failures) - 10} more"
+            messagebox.showwarning("Batch Finished", text)
+        else:
+            messagebox.showinfo("Batch Finished", text)
+
+    def import_directory(self):
+        source = filedialog.askdirectory(title="Import files from directory")
+        if not source:
+            return
+        pattern = simpledialog.askstring("Import Directory", "File name pattern:", initialvalue="*")
+        if pattern:
+            self.run_task(self.files.import_directory, source, pattern, error="Import failed",
+                          title="Importing files", unit="files",
+                          on_done=lambda result: self.show_batch_result("Imported", result))
+
+    def create_from_manifest(self):
+        manifest = filedialog.askopenfilename(title="Manifest (one file name per line, optional TAB and content)")
+        if not manifest:
+            return
+        try:
+            entries = read_manifest(manifest)
+        except (OSError, UnicodeDecodeError) as e:
+            messagebox.showerror("Error", f"Failed to read manifest: {str(e)}")
+            return
+        self.run_task(self.files.create_many, entries, error="Batch create failed",
+                      title="Creating files", unit="files",
+                      on_done=lambda result: self.show_batch_result("Created", result))
+
+    def delete_by_pattern(self):
+        pattern = simpledialog.askstring("Delete Files", "File name pattern (e.g. *.tmp):")
+        if not pattern:
+            return
+        matches = self.files.match(pattern)
+        if not matches:
+            messagebox.showinfo("Delete Files", "No files match.")
+            return
+        preview = "\n".join(matches[:10]) + (f"\n... and {len(matches) - 10} more" if len(matches) > 10 else "")
+        if messagebox.askyesno("Delete Files", f"Delete {len(matches)} file(s)?\n\n{preview}"):
+            self.run_task(self.files.delete_glob, pattern, error="Batch delete failed",
+                          title="Deleting files", unit="files",
+                          on_done=lambda result: self.show_batch_result("Deleted", result))
+
+    def view_stats(self):
+        self.run_task(self.collect_stats, error="Failed to load statistics", on_done=self.show_stats)
+
+    def collect_stats(self):
+        stats = self.page_analyzer.get_stats()
+        stats['all'] = self.service.get_stats()
+        return stats
+
+    def show_stats(self, stats):
+        win = tk.Toplevel(self.root)
+        win.title(f"{self.fault_label} Fault Analysis")
+        win.geometry("800x700")
+
+        tk.Label(win, text=f"=== {stats['policy']} Page Fault Analysis ===", font=("Arial", 14, "bold")).pack(pady=10)
+
+        text = f"""
+Total Page References: {stats['total']}
+Page Hits: {stats['hits']}
+Page Faults: {stats['faults']}
+Hit Ratio: {stats['hit_ratio']:.2f}%
+
+Current Pages in Memory ({stats['policy']} Order): {' → '.join(map(format_page_key, stats['frames']))}
+"""
+        cache = stats['cache']
+        if cache is not None:
+            text += f"""
+Content Cache ({cache['policy']}, measured): {cache['hits']} hits, {cache['misses']} misses, {cache['hit_ratio']:.2f}% hit ratio
+Cached: {cache['entries']} files, {cache['bytes']} / {cache['byte_budget']} bytes, {cache['evictions']} evictions
+"""
+        pool, everyone = stats['pool'], stats['all']
+        text += f"""
+Shared Pool ({pool['policy']}, {pool['frames']} frames): your {pool['hits']} hits, {pool['faults']} faults, {pool['hit_ratio']:.2f}% hit ratio
+Your frames in the pool: {pool['resident']}, taken by other users: {pool['stolen']}
+All {len(everyone['users'])} users: {everyone['total']} references, {everyone['hit_ratio']:.2f}% hit ratio in own frames, {everyone['pool']['hit_ratio']:.2f}% in the pool
+"""
+        metrics = stats['metrics']
+        gaps = metrics['inter_arrival']
+        reuse = ", ".join(f"{low}-{high}: {count}" if high > low else f"{low}: {count}"
+                          for low, high, count in metrics['reuse'])
+        operations = ", ".join(f"{op} {m['fault_rate']:.1f}% ({m['faults']}/{m['references']})"
+                               for op, m in sorted(metrics['operations'].items()))
+        files = ", ".join(f"{name} ({faults})" for name, faults in metrics['file_faults'])
+        text += f"""
+Working Set (last {metrics['window']} references): {metrics['working_set']} pages, mean {metrics['working_set_mean']:.1f}, peak {metrics['working_set_peak']}
+Reuse Time (references): {reuse or '-'}; first references (or last used over {metrics['max_pages']} pages ago): {metrics['cold']}
+Fault Rate by Operation: {operations or '-'}
+Faults by File: {files or '-'}
+Fault Inter-arrival: {gaps['mean']:.3f}s mean, {gaps['stdev']:.3f}s stdev, {gaps['min']:.3f}-{gaps['max']:.3f}s, one fault every {gaps['mean_references']:.1f} references
+"""
+        tk.Label(win, text=text, font=("Arial", 11), justify='left', wraplength=760).pack()
+
+        tk.Label(win, text="Recent Operations:", font=("Arial", 12, "bold")).pack(pady=5)
+
+        history_box = scrolledtext.ScrolledText(win, width=70, height=15, font=("Courier", 10))
+        history_box.pack(fill='both', expand=True)
+
+        history_box.insert('1.0', "Page ID | Operation | Filename        | Status\n")
+        history_box.insert('2.0', "-" * 50 + "\n")
+        for pid, op, fn, st in stats['history']:
+            history_box.insert(tk.END, f"{format_page_key(pid):<7} | {op:<9} | {fn:<15} | {st}\n")
+        history_box.config(state='disabled')
+
+    def reset_stats(self):
+        if messagebox.askyesno("Reset Stats", f"Reset {self.fault_label.lower()} fault statistics?"):
+            self.page_analyzer.reset()
+            messagebox.showinfo("Reset", f"{self.fault_label} fault data cleared.")
+
+    def logout(self):
+        if messagebox.askyesno("Logout", "Are you sure you want to logout?"):
+            # Write out this session's buffered log records before dropping it
+            self.page_analyzer.flush()
+            self.logged_in_user = None
+            self.page_analyzer = None
+            self.create_login_screen()
+
+    def on_close(self):
+        self.worker.shutdown()
+        self.service.close()
+        self.root.destroy()
+
+
+# --- Run App ---
+def main(argv, base_dir=None, fault_label="File"):
+    """Start the app; argv is [policy [page size]] as given on the command line"""
+    usage = f"usage: {os.path.basename(sys.argv[0])} [{'|'.join(POLICIES)}] [page size in bytes]"
+    policy = argv[0] if argv else "lru"
+    if policy.lower() not in POLICIES:
+        sys.exit(f"{usage}\nUnknown replacement policy: {policy!r}")
+    page_size = None
+    if len(argv) > 1:
+        try:
+            page_size = int(argv[1])
+        except ValueError:
+            page_size = 0
+        if page_size < 1:
+            sys.exit(f"{usage}\nPage size must be a positive integer, got {argv[1]!r}")
+    root = tk.Tk()
+    FileManagementApp(root, policy=policy, page_size=page_size,
+                      base_dir=base_dir, fault_label=fault_label)
+    root.geometry("500x650")
+    root.resizable(True, True)
+    root.mainloop()
@@ -0,0 +1,232 @@
+from array import array
+
+from .optional import numpy
+from .pageid import NO_PAGE, split_page_key
+
+
+class StringInterner:
+    """Maps strings to small integer ids and back.
+
+    Ids are reference counted: once release() drops the last reference the
+    name is forgotten and its id is handed to the next new name, so the
+    table only holds names still in use.
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self._refs = []
+        self._free = []
+        self.names = []
+
+    def intern(self, name):
+        index = self._ids.get(name)
+        if index is None:
+            if self._free:
+                index = self._free.pop()
+                self.names[index] = name
+            else:
+                index = len(self.names)
+                self.names.append(name)
+                self._refs.append(0)
+            self._ids[name] = index
+        self._refs[index] += 1
+        return index
+
+    def release(self, index):
+        self._refs[index] -= 1
+        if not self._refs[index]:
+            del self._ids[self.names[index]]
+            self.names[index] = None
+            self._free.append(index)
+
+    def load(self, names, ids):
+        """Reset to `names`, referenced once per entry of `ids`"""
+        self.__init__()
+        self.names = list(names)
+        self._refs = [0] * len(self.names)
+        for index in ids:
+            self._refs[index] += 1
+        for index, name in enumerate(self.names):
+            if self._refs[index]:
+                self._ids[name] = index
+            else:
+                self.names[index] = None
+                self._free.append(index)
+
+    def __len__(self):
+        return len(self._ids)
+
+
+# --- Page History Ring Buffer ---
+class HistoryRing:
+    """Fixed-capacity history of page references stored in typed columns.
+
+    Only the last `capacity` references are kept, so memory stays flat no
+    matter how long the analyzer runs. Filenames and operations are interned
+    to ids; each slot costs 22 bytes across the six arrays, and a filename
+    is dropped once the last slot naming it is overwritten. Entries are
+    read back as (page_id, operation, filename, status) tuples, the same
+    shape the analyzer has always exposed, where page_id is the page key
+    (see pageid.split_page_key).
+    """
+
+    def __init__(self, capacity=1000):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.clear()
+
+    def clear(self):
+        self._timestamps = array('d', bytes(8 * self.capacity))
+        self._page_ids = array('I', bytes(4 * self.capacity))
+        self._page_indexes = array('I', bytes(4 * self.capacity))
+        self._file_ids = array('I', bytes(4 * self.capacity))
+        self._ops = array('B', bytes(self.capacity))
+        self._hits = array('B', bytes(self.capacity))
+        self.files = StringInterner()
+        self.operations = StringInterner()
+        self.total = 0
+
+    def append(self, page_id, operation, filename, hit, timestamp=0.0):
+        slot = self.total % self.capacity
+        self._timestamps[slot] = timestamp
+        self._page_ids[slot], self._page_indexes[slot] = split_page_key(page_id)
+        file_id = self.files.intern(filename)
+        if self.total >= self.capacity:
+            self.files.release(self._file_ids[slot])
+        self._file_ids[slot] = file_id
+        self._ops[slot] = self.operations.intern(operation)
+        self._hits[slot] = 1 if hit else 0
+        self.total += 1
+
+    def state(self):
+        """The ring's columns as bytes plus the names they use, for snapshots"""
+        columns = list(self._columns())
+        files = self.files.names
+        if None in files:
+            # Renumber the live names so freed ids aren't saved
+            renumber = {}
+            for index, name in enumerate(files):
+                if name is not None:
+                    renumber[index] = len(renumber)
+            columns[3] = array('I', (renumber.get(index, 0) for index in self._file_ids))
+            files = [name for name in files if name is not None]
+        return {
+            'capacity': self.capacity,
+            'total': self.total,
+            'columns': [column.tobytes() for column in columns],
+            'files': list(files),
+            'operations': list(self.operations.names),
+        }
+
+    def restore(self, state):
+        if state['capacity'] != self.capacity:
+            # Re-append what the saved ring held; only the newest entries fit if this one is smaller
+            saved = HistoryRing(state['capacity'])
+            saved.restore(state)
+            self.clear()
+            for seq in range(saved.first, saved.total):
+                slot = seq % saved.capacity
+                page_id, operation, filename, status = saved._entry(slot)
+                self.append(page_id, operation, filename, status == "Hit", saved._timestamps[slot])
+            return
+        self.clear()
+        for column, data in zip(self._columns(), state['columns']):
+            column[:] = array(column.typecode, data)
+        self.total = state['total']
+        self.files.load(state['files'], [self._file_ids[slot] for slot in self._slots(None)])
+        for name in state['operations']:
+            self.operations.intern(name)
+
+    def _columns(self):
+        return (self._timestamps, self._page_ids, self._page_indexes, self._file_ids, self._ops, self._hits)
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    @property
+    def first(self):
+        """Sequence number of the oldest reference still held"""
+        return self.total - len(self)
+
+    def _entry(self, slot):
+        page_id = self._page_ids[slot]
+        if self._page_indexes[slot] != NO_PAGE:
+            page_id = (page_id, self._page_indexes[slot])
+        return (page_id, self.operations.names[self._ops[slot]],
+                self.files.names[self._file_ids[slot]], "Hit" if self._hits[slot] else "Page Fault")
+
+    def window(self, start=None, stop=None):
+        """Entries with sequence numbers in [start, stop), clipped to what is held"""
+        start = self.first if start is None else max(start, self.first)
+        stop = self.total if stop is None else min(stop, self.total)
+        return [self._entry(seq % self.capacity) for seq in range(start, stop)]
+
+    def last(self, n):
+        return self.window(self.total - n)
+
+    def since(self, timestamp):
+        """Entries recorded at or after `timestamp`"""
+        seq = self.total
+        while seq > self.first and self._timestamps[(seq - 1) % self.capacity] >= timestamp:
+            seq -= 1
+        return self.window(seq)
+
+    def __iter__(self):
+        return iter(self.window())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("history index out of range")
+        return self._entry((self.first + index) % self.capacity)
+
+    def _slots(self, n):
+        n = len(self) if n is None else min(n, len(self))
+        return (seq % self.capacity for seq in range(self.total - n, self.total))
+
+    def counts(self, n=None):
+        """(hits, faults) over the last n references (default: all held)"""
+        hits = total = 0
+        for slot in self._slots(n):
+            hits += self._hits[slot]
+            total += 1
+        return hits, total - hits
+
+    def by_operation(self, n=None):
+        """{operation: (hits, faults)} over the last n references"""
+        return self._group(self._ops, self.operations.names, n)
+
+    def by_file(self, n=None):
+        """{filename: (hits, faults)} over the last n references"""
+        return self._group(self._file_ids, self.files.names, n)
+
+    def _group(self, column, names, n):
+        groups = {}
+        for slot in self._slots(n):
+            hits, faults = groups.get(column[slot], (0, 0))
+            if self._hits[slot]:
+                hits += 1
+            else:
+                faults += 1
+            groups[column[slot]] = (hits, faults)
+        return {names[key]: value for key, value in groups.items()}
+
+    def as_arrays(self):
+        """Held references as NumPy columns in chronological order"""
+        np = numpy()
+        if np is None:
+            raise RuntimeError("NumPy is required for as_arrays()")
+        order = np.fromiter(self._slots(None), dtype=np.int64, count=len(self))
+        return {
+            'timestamp': np.frombuffer(self._timestamps, dtype=np.float64)[order],
+            'page_id': np.frombuffer(self._page_ids, dtype=np.uint32)[order],
+            'page_index': np.frombuffer(self._page_indexes, dtype=np.uint32)[order],
+            'file_id': np.frombuffer(self._file_ids, dtype=np.uint32)[order],
+            'op': np.frombuffer(self._ops, dtype=np.uint8)[order],
+            'hit': np.frombuffer(self._hits, dtype=np.uint8)[order],
+        }
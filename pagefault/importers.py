@@ -0,0 +1,204 @@
+import re
+
+from .pageid import PageIdGenerator
+
+SECTOR_SIZE = 512
+DEFAULT_PAGE_SIZE = 4096
+
+# --- Trace Importers ---
+# Importers turn other tools' text dumps into (operation, name, offset,
+# length) references, and page_records() maps those onto the analyzer's
+# (page key, operation, filename) records. Everything is a generator, so a
+# dump streams straight into replay() or the batch simulator without an
+# intermediate trace file.
+
+_STRACE_HEAD = re.compile(r"^\s*(?:\[pid\s+(\d+)\]\s*|(\d+)\s+)?(?:\d+(?::\d+:\d+)?(?:\.\d+)?\s+)?")
+_STRACE_CALL = re.compile(r"(\w+)\((.*)\)\s+=\s+(-?\d+|\?)")
+_BLKTRACE = re.compile(r"^\s*(\d+,\d+)\s+\d+\s+\d+\s+[\d.]+\s+\d+\s+(\w+)\s+(\w+)\s+(\d+)\s+\+\s+(\d+)")
+_NOT_FILES = ("pipe:", "socket:", "anon_inode:", "/dev/")
+
+READS = {'read': None, 'readv': None, 'pread64': 3, 'preadv': 3, 'preadv2': 3}
+WRITES = {'write': None, 'writev': None, 'pwrite64': 3, 'pwritev': 3, 'pwritev2': 3}
+
+
+def _split_args(text):
+    """Split a syscall argument list on top-level commas, keeping quoted strings whole"""
+    args, depth, quoted, escaped, start = [], 0, False, False, 0
+    for i, char in enumerate(text):
+        if quoted:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                quoted = False
+        elif char == '"':
+            quoted = True
+        elif char in "([{":
+            depth += 1
+        elif char in ")]}":
+            depth -= 1
+        elif char == "," and depth == 0:
+            args.append(text[start:i].strip())
+            start = i + 1
+    args.append(text[start:].strip())
+    return args
+
+
+def _unquote(arg):
+    if arg.startswith('"'):
+        return arg[1:arg.rfind('"')].encode("latin-1", "backslashreplace").decode("unicode_escape")
+    return None
+
+
+def _fd(arg):
+    """(fd, path from strace -y annotation or None)"""
+    number, _, annotation = arg.partition("<")
+    return int(number), annotation[:-1] if annotation else None
+
+
+def parse_strace(lines):
+    """Yield (operation, path, offset, length) references from `strace -f` output.
+
+    File descriptors are tracked per process from open/openat/creat, dup
+    and close, and file offsets from read, write and lseek; pread/pwrite
+    use their explicit offset. Descriptors the trace never opened are used
+    only when `strace -y` annotated them with a path. Calls split into
+    "<unfinished ...>" and "<... resumed>" halves are rejoined. unlink and
+    unlinkat become DELETE references; failed calls are ignored.
+    """
+    files = {}
+    unfinished = {}
+    for line in lines:
+        line = line.rstrip("\n")
+        head = _STRACE_HEAD.match(line)
+        pid = head.group(1) or head.group(2)
+        rest = line[head.end():]
+        if rest.endswith("<unfinished ...>"):
+            unfinished[pid] = rest[:-len("<unfinished ...>")].rstrip()
+            continue
+        if rest.startswith("<... "):
+            resumed = rest.find("resumed>")
+            if resumed == -1 or pid not in unfinished:
+                continue
+            prefix = unfinished.pop(pid).rstrip(", ")
+            tail = rest[resumed + len("resumed>"):].lstrip(", ")
+            rest = prefix + tail if prefix.endswith("(") or tail.startswith(")") else prefix + ", " + tail
+        call = _STRACE_CALL.match(rest)
+        if call is None or call.group(3) == "?" or int(call.group(3)) < 0:
+            continue
+        name, args, result = call.group(1), _split_args(call.group(2)), int(call.group(3))
+
+        if name in ("open", "openat", "creat"):
+            path = _unquote(args[1] if name == "openat" else args[0])
+            if path is not None and not path.startswith(_NOT_FILES):
+                # A list so dup()ed descriptors share one file offset, as in the kernel
+                files[pid, result] = [path, 0]
+            continue
+        if name in ("unlink", "unlinkat"):
+            path = _unquote(args[1] if name == "unlinkat" else args[0])
+            if path is not None:
+                yield "DELETE", path, 0, 0
+            continue
+        if not args or not args[0][:1].isdigit():
+            continue
+        fd, annotated = _fd(args[0])
+        entry = files.get((pid, fd))
+        if entry is None and annotated and not annotated.startswith(_NOT_FILES):
+            entry = files[pid, fd] = [annotated, 0]
+
+        if name == "close":
+            files.pop((pid, fd), None)
+        elif name in ("dup", "dup2", "dup3"):
+            if entry is not None:
+                files[pid, result] = entry
+        elif name == "lseek":
+            if entry is not None:
+                entry[1] = result
+        elif entry is not None and (name in READS or name in WRITES):
+            operation, position = ("READ", READS[name]) if name in READS else ("WRITE", WRITES[name])
+            if result == 0:
+                continue
+            if position is None:
+                yield operation, entry[0], entry[1], result
+                entry[1] += result
+            else:
+                yield operation, entry[0], int(args[position]), result
+
+
+def parse_blktrace(lines, actions=("Q",)):
+    """Yield (operation, device, byte offset, length) references from blkparse output.
+
+    Only events whose action is in `actions` are kept (queued requests by
+    default; ("D",) counts requests issued to the driver instead), and
+    only reads and writes: discards, flushes and barriers are skipped.
+    """
+    for line in lines:
+        match = _BLKTRACE.match(line)
+        if match is None:
+            continue
+        device, action, rwbs, sector, count = match.groups()
+        if action not in actions or int(count) == 0:
+            continue
+        if "D" in rwbs or ("R" not in rwbs and "W" not in rwbs):
+            continue
+        yield ("WRITE" if "W" in rwbs else "READ"), device, int(sector) * SECTOR_SIZE, int(count) * SECTOR_SIZE
+
+
+def page_records(references, page_size=None, page_id_for=None):
+    """Map references onto (page key, operation, name) records for replay().
+
+    With page_size each page an access overlaps is one record keyed by
+    (page id, page index), as PageFaultAnalyzer.process_range() does;
+    without it every access is a single reference to the file's page id.
+    """
+    if page_id_for is None:
+        page_id_for = PageIdGenerator().page_id
+    for operation, name, offset, length in references:
+        page_id = page_id_for(name)
+        if not page_size:
+            yield page_id, operation, name
+            continue
+        first = offset // page_size
+        last = (offset + max(length, 1) - 1) // page_size
+        for index in range(first, last + 1):
+            yield (page_id, index), operation, name
+
+
+IMPORTERS = {
+    'strace': parse_strace,
+    'blktrace': parse_blktrace,
+}
+
+# Every trace format the replay tools read; "log" is the analyzer's text
+# log or a plain reference string and "binary" the binlog.py format
+TRACE_FORMATS = ("auto", "log", "binary") + tuple(IMPORTERS)
+
+
+def detect_format(lines):
+    """'strace', 'blktrace' or None for the first few meaningful lines of a dump"""
+    for line in lines:
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        if _BLKTRACE.match(line):
+            return "blktrace"
+        head = _STRACE_HEAD.match(line)
+        if _STRACE_CALL.match(line[head.end():]) or line[head.end():].startswith(("<... ", "+++", "---")):
+            return "strace"
+        return None
+    return None
+
+
+def import_records(lines, format, page_size=None, page_id_for=None):
+    """(page key, operation, name) records from a strace or blktrace dump.
+
+    Block traces have no files, so their pages are always modelled with
+    page_size (4096 by default) and keyed by the device.
+    """
+    try:
+        parse = IMPORTERS[format]
+    except KeyError:
+        raise ValueError(f"Unknown trace format: {format!r}") from None
+    if format == "blktrace":
+        page_size = page_size or DEFAULT_PAGE_SIZE
+    return page_records(parse(lines), page_size, page_id_for)
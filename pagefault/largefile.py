@@ -0,0 +1,187 @@
+import mmap
+import os
+import tempfile
+
+COPY_CHUNK = 1 << 20
+MAX_ROW = 4096
+
+
+# --- Memory-Mapped Viewing ---
+class MappedFile:
+    """Read-only memory map of a file, navigated row by row.
+
+    A row is one line, or MAX_ROW bytes of a longer line, so even a file
+    without newlines pages in bounded steps. Only the bytes around the
+    requested rows are touched, so viewing any part of a multi-GB file
+    costs a few pages of memory, not the file's size. Positions are byte
+    offsets; there is no line index to build up front.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._mmap = None
+        self.size = 0
+        self.closed = True
+        self.refresh()
+
+    def refresh(self):
+        """Remap the file, e.g. after it grew or was replaced"""
+        self.close()
+        self.closed = False
+        with open(self.path, "rb") as f:
+            self.size = os.fstat(f.fileno()).st_size
+            if self.size:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        """Unmap the file; row queries need refresh() after this"""
+        self.closed = True
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def row_start(self, offset):
+        """Start of the row holding offset"""
+        offset = max(0, min(offset, self.size))
+        if offset == 0 or self._mmap is None:
+            return 0
+        newline = self._mmap.rfind(b"\n", max(0, offset - MAX_ROW), offset)
+        if newline != -1:
+            return newline + 1
+        return max(0, offset - MAX_ROW)
+
+    def row_end(self, offset):
+        """End of the row starting at offset, including its newline"""
+        if self._mmap is None or offset >= self.size:
+            return self.size
+        newline = self._mmap.find(b"\n", offset, min(self.size, offset + MAX_ROW))
+        return newline + 1 if newline != -1 else min(self.size, offset + MAX_ROW)
+
+    def previous_row(self, offset, count=1):
+        """Start of the row `count` rows above the one starting at offset"""
+        for _ in range(count):
+            if offset <= 0:
+                return 0
+            offset = self.row_start(offset - 1)
+        return offset
+
+    def next_row(self, offset, count=1):
+        """Start of the row `count` rows below the one starting at offset, clipped to the last row"""
+        for _ in range(count):
+            end = self.row_end(offset)
+            if end >= self.size:
+                break
+            offset = end
+        return offset
+
+    def rows(self, offset, count):
+        """[(start, end, text)] for up to `count` rows from offset; end and text exclude the newline"""
+        rows = []
+        while len(rows) < count and offset < self.size:
+            stop = self.row_end(offset)
+            data = self._mmap[offset:stop].rstrip(b"\r\n")
+            rows.append((offset, offset + len(data), data.decode("utf-8", "replace")))
+            offset = stop
+        return rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# --- In-Place and Atomic Writes ---
+def _copy(src, dst, offset, count):
+    """Copy count bytes from src at offset to dst's current position, in the kernel where possible"""
+    src.flush()
+    dst.flush()
+    copy_file_range = getattr(os, "copy_file_range", None)
+    if copy_file_range is not None:
+        try:
+            while count > 0:
+                copied = copy_file_range(src.fileno(), dst.fileno(), count, offset)
+                if copied == 0:
+                    return
+                offset += copied
+                count -= copied
+            return
+        except OSError:
+            pass  # Not supported between these files; fall back to a buffered copy
+    src.seek(offset)
+    while count > 0:
+        chunk = src.read(min(COPY_CHUNK, count))
+        if not chunk:
+            return
+        dst.write(chunk)
+        count -= len(chunk)
+
+
+def _temp_beside(path, mode="w+b"):
+    """An open temporary file in path's folder, so os.replace stays on one filesystem"""
+    fd, tmp = tempfile.mkstemp(prefix="." + os.path.basename(path) + ".", suffix=".tmp",
+                               dir=os.path.dirname(path) or ".")
+    if os.path.exists(path):
+        os.chmod(tmp, os.stat(path).st_mode & 0o7777)
+    return os.fdopen(fd, mode), tmp
+
+
+def _commit(out, tmp, path):
+    try:
+        out.flush()
+        os.fsync(out.fileno())
+        out.close()
+        os.replace(tmp, path)
+    except BaseException:
+        out.close()
+        os.remove(tmp)
+        raise
+
+
+def write_atomic(path, data):
+    """Replace path's contents with data (text or bytes): readers see the old file or the new one"""
+    out, tmp = _temp_beside(path, "w" if isinstance(data, str) else "wb")
+    try:
+        out.write(data)
+    except BaseException:
+        out.close()
+        os.remove(tmp)
+        raise
+    _commit(out, tmp, path)
+
+
+def replace_range(path, offset, length, data):
+    """Replace `length` bytes at offset with data; returns True if it was written in place.
+
+    Same-length replacements overwrite the bytes where they are. Otherwise
+    the head, the new data and the tail are streamed into a temporary file
+    in COPY_CHUNK pieces (copy_file_range where the OS has it), which then
+    replaces the original, so memory use does not grow with the file.
+    """
+    size = os.path.getsize(path)
+    if offset < 0 or length < 0 or offset + length > size:
+        raise ValueError(f"Range {offset}+{length} is outside the file ({size} bytes)")
+    if len(data) == length:
+        with open(path, "r+b") as f:
+            f.seek(offset)
+            f.write(data)
+        return True
+    out, tmp = _temp_beside(path)
+    try:
+        with open(path, "rb") as src:
+            _copy(src, out, 0, offset)
+            out.seek(0, os.SEEK_END)
+            out.write(data)
+            _copy(src, out, offset + length, size - offset - length)
+    except BaseException:
+        out.close()
+        os.remove(tmp)
+        raise
+    _commit(out, tmp, path)
+    return False
+
+
+def read_range(path, offset, length):
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return f.read(length)
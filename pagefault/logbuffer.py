@@ -0,0 +1,173 @@
+import atexit
+import os
+import queue
+import threading
+import time
+
+from .logrotate import LogRotator, parse_stamp
+from .pageid import format_page_key
+
+_FLUSH = object()
+_STOP = object()
+
+
+def format_record(record, _cache={}):
+    """Format (timestamp, operation, filename, page_id, status) as a log line"""
+    timestamp, operation, filename, page_id, status = record
+    second = int(timestamp)
+    stamp = _cache.get(second)
+    if stamp is None:
+        _cache.clear()
+        stamp = _cache[second] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+    return f"{stamp} | Operation: {operation} | File: {filename} | Page ID: {format_page_key(page_id)} | {status}\n"
+
+
+# --- Buffered Log Writer ---
+class BufferedLogWriter:
+    """Appends page fault records to a text log from a background thread.
+
+    Callers append records to an in-memory batch; full batches (or whatever
+    is pending after `flush_interval` seconds) are handed to a writer thread
+    that formats them and writes each batch with one open and one write.
+    At most `max_pending` records wait in memory: past that, write() blocks
+    until the writer catches up.
+
+    Batches are queued while the lock is held, so they reach the file in the
+    order their records were written; logrotate's time index relies on it.
+    Writing to a closed writer raises ValueError.
+
+    With max_bytes or max_age (seconds) the log is rotated by a LogRotator
+    before a batch would take it past either limit, and rotated segments
+    are compressed and indexed in the background for logrotate.query().
+    """
+
+    def __init__(self, path, batch_size=512, flush_interval=0.5, max_pending=16384, max_bytes=None, max_age=None):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(max(1, max_pending // batch_size))
+        self._pending = []
+        self._lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+        self.written = 0
+        self.dropped = 0
+        self.rotator = LogRotator(path, max_bytes, max_age) if max_bytes or max_age else None
+        self._size = 0
+        self._opened = None
+        if self.rotator is not None and os.path.exists(path):
+            self._size = os.path.getsize(path)
+            with open(path, "r", errors="replace") as f:
+                self._opened = parse_stamp(f.readline()) or time.time()
+
+    def _start(self):
+        with self._lock:
+            if self._closed:
+                raise ValueError("Write to a closed log writer")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="page-fault-log", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _take_idle_pending(self):
+        """Pending records for the writer thread to write itself, unless a queued batch is older"""
+        with self._lock:
+            if not self._queue.empty():
+                return []
+            batch, self._pending = self._pending, []
+        return batch
+
+    def write(self, record):
+        """Buffer one record; blocks while max_pending records are waiting"""
+        if self._thread is None:
+            self._start()
+        with self._lock:
+            if self._closed:
+                raise ValueError("Write to a closed log writer")
+            pending = self._pending
+            pending.append(record)
+            if len(pending) >= self.batch_size:
+                # Only the writer thread takes from the queue, and it never needs the lock to
+                # do so, so blocking here while the queue is full cannot deadlock
+                self._pending = []
+                self._queue.put(pending)
+
+    def write_many(self, records):
+        """Buffer a group of records at once; a large group goes to disk as one write"""
+        if self._thread is None:
+            self._start()
+        with self._lock:
+            if self._closed:
+                raise ValueError("Write to a closed log writer")
+            pending = self._pending
+            pending.extend(records)
+            if len(pending) >= self.batch_size:
+                self._pending = []
+                self._queue.put(pending)
+
+    def _write_batch(self, batch):
+        try:
+            text = "".join(map(format_record, batch))
+            if self.rotator is not None:
+                if self.rotator.due(self._size, self._opened, len(text)):
+                    self.rotator.rotate()
+                    self._size = 0
+                if not self._size:
+                    self._opened = batch[0][0]
+                self._size += len(text)
+            with open(self.path, "a") as f:
+                f.write(text)
+            self.written += len(batch)
+        except Exception as e:
+            self.dropped += len(batch)
+            print("Logging failed:", e)
+
+    def _run(self):
+        get, done = self._queue.get, self._queue.task_done
+        while True:
+            try:
+                item = get(timeout=self.flush_interval)
+            except queue.Empty:
+                batch = self._take_idle_pending()
+                if batch:
+                    self._write_batch(batch)
+                continue
+            if item is _STOP:
+                done()
+                return
+            if item is not _FLUSH:
+                self._write_batch(item)
+            done()
+
+    def flush(self):
+        """Block until every buffered record is on disk"""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        with self._lock:
+            batch, self._pending = self._pending, []
+            if batch:
+                self._queue.put(batch)
+        self._queue.put(_FLUSH)
+        self._queue.join()
+
+    def truncate(self):
+        """Flush pending records, then empty the log file and drop its rotated segments"""
+        self.flush()
+        if self.rotator is not None:
+            self.rotator.clear()
+            self._size = 0
+        try:
+            open(self.path, 'w').close()
+        except:
+            pass
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+        if self._thread is not None and self._thread.is_alive():
+            self.flush()
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+        if self.rotator is not None:
+            self.rotator.wait()
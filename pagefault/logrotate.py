@@ -0,0 +1,289 @@
+import glob
+import gzip
+import os
+import queue
+import re
+import threading
+import time
+import zlib
+
+# --- Rotated Log Layout ---
+# page_fault_log.txt           the active log, appended to by BufferedLogWriter
+# page_fault_log.txt.000001    a rotated segment waiting to be compressed
+# page_fault_log.txt.000001.gz a compressed segment: one gzip member per block
+#                              of about block_size bytes of text, so gzip -d
+#                              still reads it whole but one block can be
+#                              decompressed on its own
+# page_fault_log.txt.idx       the sparse index, one line per block:
+#                              "<segment> <first time> <last time> <offset> <length> <lines>"
+# Times are epoch seconds parsed from the log lines, which have one second
+# resolution. Segments are numbered in order and never renamed, so index
+# entries stay valid as more segments are added.
+
+STAMP_LENGTH = len("2025-05-17 13:08:43")
+_SEGMENT = re.compile(r"\.(\d{6})(\.gz)?$")
+
+
+def parse_stamp(line, _cache={}):
+    """Epoch seconds of a log line's timestamp, or None if it has none"""
+    stamp = line[:STAMP_LENGTH]
+    seconds = _cache.get(stamp)
+    if seconds is None:
+        try:
+            seconds = time.mktime(time.strptime(stamp, "%Y-%m-%d %H:%M:%S"))
+        except ValueError:
+            return None
+        if len(_cache) > 4096:
+            _cache.clear()
+        _cache[stamp] = seconds
+    return seconds
+
+
+def index_path(path):
+    return path + ".idx"
+
+
+def segment_path(path, number, compressed=True):
+    return f"{path}.{number:06d}" + (".gz" if compressed else "")
+
+
+def segments(path):
+    """{segment number: file} for every rotated segment, compressed or not yet"""
+    found = {}
+    for name in glob.glob(glob.escape(path) + ".[0-9][0-9][0-9][0-9][0-9][0-9]*"):
+        match = _SEGMENT.search(name)
+        if match and name == segment_path(path, int(match.group(1)), bool(match.group(2))):
+            number = int(match.group(1))
+            # A finished .gz wins over a leftover uncompressed copy
+            if match.group(2) or number not in found:
+                found[number] = name
+    return dict(sorted(found.items()))
+
+
+def read_index(path):
+    """[(segment, first, last, offset, length, lines)] from the sparse index"""
+    blocks = []
+    try:
+        with open(index_path(path), "r") as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) != 6:
+                    continue  # a line cut short by a crash
+                number, first, last, offset, length, lines = fields
+                blocks.append((int(number), float(first), float(last), int(offset), int(length), int(lines)))
+    except FileNotFoundError:
+        pass
+    return blocks
+
+
+# --- Rotation and Compression ---
+class LogRotator:
+    """Rotates a text log by size or age and compresses segments in the background.
+
+    rotate() renames the active log to the next numbered segment at once
+    and queues it for a single compressor thread, so the log writer never
+    waits on gzip. Leftover uncompressed segments and compressed segments
+    missing from the index (after a crash) are finished when the rotator
+    is created.
+    """
+
+    def __init__(self, path, max_bytes=None, max_age=None, block_size=1 << 16, compresslevel=6):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.block_size = block_size
+        self.compresslevel = compresslevel
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        existing = segments(path)
+        self._next = max(existing, default=0) + 1
+        indexed = {block[0] for block in read_index(path)}
+        for number, name in existing.items():
+            if not name.endswith(".gz"):
+                self._submit(self._compress, number)
+                continue
+            if os.path.exists(segment_path(path, number, compressed=False)):
+                # Compressed before a crash but not yet removed
+                os.remove(segment_path(path, number, compressed=False))
+            if number not in indexed:
+                self._submit(self._reindex, number)
+
+    def _submit(self, func, *args):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="page-fault-log-gzip", daemon=True)
+                self._thread.start()
+        self._queue.put((func, args))
+
+    def _run(self):
+        while True:
+            func, args = self._queue.get()
+            try:
+                func(*args)
+            finally:
+                self._queue.task_done()
+
+    def due(self, size, opened, incoming=0):
+        """Whether an active log of `size` bytes, started at time `opened`, should rotate first"""
+        if size <= 0:
+            return False
+        if self.max_bytes and size + incoming > self.max_bytes:
+            return True
+        return bool(self.max_age) and opened is not None and time.time() - opened >= self.max_age
+
+    def rotate(self):
+        """Move the active log aside as the next segment and queue its compression"""
+        with self._lock:
+            if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+                return None
+            number = self._next
+            self._next += 1
+            os.replace(self.path, segment_path(self.path, number, compressed=False))
+        self._submit(self._compress, number)
+        return number
+
+    def _blocks(self, lines):
+        """Group lines into blocks of about block_size bytes"""
+        block, size = [], 0
+        for line in lines:
+            block.append(line)
+            size += len(line)
+            if size >= self.block_size:
+                yield block
+                block, size = [], 0
+        if block:
+            yield block
+
+    def _append_index(self, entries):
+        with open(index_path(self.path), "a") as f:
+            f.write("".join(f"{number} {first:.0f} {last:.0f} {offset} {length} {count}\n"
+                            for number, first, last, offset, length, count in entries))
+
+    def _compress(self, number):
+        try:
+            source = segment_path(self.path, number, compressed=False)
+            target = segment_path(self.path, number)
+            entries = []
+            offset = 0
+            with open(source, "r", errors="replace") as f, open(target + ".tmp", "wb") as out:
+                for block in self._blocks(f):
+                    stamps = [stamp for stamp in map(parse_stamp, block) if stamp is not None]
+                    data = gzip.compress("".join(block).encode(), self.compresslevel, mtime=0)
+                    out.write(data)
+                    entries.append((number, min(stamps, default=0), max(stamps, default=0),
+                                    offset, len(data), len(block)))
+                    offset += len(data)
+            os.replace(target + ".tmp", target)
+            self._append_index(entries)
+            os.remove(source)
+        except Exception as e:
+            print("Log compression failed:", e)
+
+    def _reindex(self, number):
+        """Rebuild index entries of a compressed segment from its gzip members"""
+        try:
+            with open(segment_path(self.path, number), "rb") as f:
+                data = f.read()
+            entries = []
+            offset = 0
+            while offset < len(data):
+                member = zlib.decompressobj(31)
+                text = member.decompress(data[offset:]).decode(errors="replace")
+                length = len(data) - offset - len(member.unused_data)
+                lines = text.splitlines(True)
+                stamps = [stamp for stamp in map(parse_stamp, lines) if stamp is not None]
+                entries.append((number, min(stamps, default=0), max(stamps, default=0),
+                                offset, length, len(lines)))
+                offset += length
+            self._append_index(entries)
+        except Exception as e:
+            print("Log reindex failed:", e)
+
+    def wait(self):
+        """Block until every queued segment is compressed and indexed"""
+        self._queue.join()
+
+    def clear(self):
+        """Delete every rotated segment and the index"""
+        self.wait()
+        with self._lock:
+            for name in segments(self.path).values():
+                os.remove(name)
+            if os.path.exists(index_path(self.path)):
+                os.remove(index_path(self.path))
+            self._next = 1
+
+    close = wait
+
+
+# --- Time Range Queries ---
+def _seek_time(f, size, start):
+    """Byte offset in a time-ordered text log at or before the first line stamped >= start"""
+    lo, hi = 0, size
+    while hi - lo > 4096:
+        mid = (lo + hi) // 2
+        f.seek(mid)
+        f.readline()
+        line = f.readline()
+        stamp = parse_stamp(line.decode(errors="replace")) if line else None
+        if stamp is not None and stamp < start:
+            lo = mid
+        else:
+            hi = mid
+    return lo
+
+
+def _scan(path, start, end):
+    """Lines of an uncompressed log stamped within [start, end], found by binary search"""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        size = os.fstat(f.fileno()).st_size
+        # Writers on different threads may interleave lines a second out of order
+        offset = _seek_time(f, size, start - 1) if start is not None else 0
+        f.seek(offset)
+        if offset:
+            f.readline()
+        for raw in f:
+            line = raw.decode(errors="replace")
+            stamp = parse_stamp(line)
+            if stamp is None or (start is not None and stamp < start):
+                continue
+            if end is not None and stamp > end:
+                if stamp > end + 1:
+                    return
+                continue
+            yield line
+
+
+def query(path, start=None, end=None):
+    """Yield log lines stamped within [start, end] (epoch seconds; None is unbounded).
+
+    Compressed segments are searched through the sparse index and only the
+    blocks overlapping the range are decompressed; segments still waiting
+    for compression and the active log are binary searched by timestamp.
+    Lines come out in log order, oldest segment first.
+    """
+    blocks = {}
+    for block in read_index(path):
+        number, first, last = block[:3]
+        if (start is None or last >= start) and (end is None or first <= end):
+            blocks.setdefault(number, []).append(block)
+    for number, name in segments(path).items():
+        if not name.endswith(".gz"):
+            yield from _scan(name, start, end)
+            continue
+        wanted = sorted(blocks.get(number, ()), key=lambda block: block[3])
+        if not wanted:
+            continue
+        with open(name, "rb") as f:
+            for _number, _first, _last, offset, length, _lines in wanted:
+                f.seek(offset)
+                for line in gzip.decompress(f.read(length)).decode(errors="replace").splitlines(True):
+                    stamp = parse_stamp(line)
+                    if stamp is not None and (start is None or stamp >= start) and (end is None or stamp <= end):
+                        yield line
+    yield from _scan(path, start, end)
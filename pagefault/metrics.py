@@ -0,0 +1,193 @@
+import math
+from collections import Counter, OrderedDict, deque
+
+
+# --- Online Reference Metrics ---
+class ReferenceMetrics:
+    """Working-set, reuse and fault statistics updated online, O(1) per reference.
+
+    - Working set W(t, window): the number of distinct pages among the last
+      `window` references (Denning's working set in virtual time), kept
+      with a sliding deque and per-page counts. Its mean and peak over the
+      whole run are tracked too.
+    - Reuse histogram: for each re-reference, the number of references
+      since the page was last touched, in power-of-two buckets. This is the
+      reuse time, an upper bound on the LRU stack distance that needs no
+      stack walk; stackdist.StackDistanceAnalyzer gives exact distances
+      offline in O(log n). First references are counted as cold.
+    - Faults per file (the top files), and references and faults per
+      operation.
+    - Fault inter-arrival: wall-clock seconds and references between
+      consecutive faults, as running mean, deviation, min and max.
+
+    Memory stays flat however many pages and files a run touches. The
+    last-use table keeps the `max_pages` most recently used pages, so a
+    page pushed out of it (LRU stack distance above max_pages) counts as
+    cold when it comes back. Per-file fault counts keep the `max_files`
+    files with the most faults, so the top files are approximate once
+    more files than that have faulted.
+    """
+
+    def __init__(self, window=1000, max_pages=1 << 16, max_files=1024):
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = window
+        self.max_pages = max(max_pages, 1)
+        self.max_files = max(max_files, 1)
+        self.clear()
+
+    def clear(self):
+        self.references = 0
+        self._recent = deque()
+        self._in_window = Counter()
+        self._working_set_sum = 0
+        self.working_set_peak = 0
+        self._last_use = OrderedDict()
+        self.cold = 0
+        self.reuse_buckets = []
+        self.file_faults = Counter()
+        self.op_references = Counter()
+        self.op_faults = Counter()
+        self._last_fault = None
+        self._gaps = 0
+        self._gap_mean = 0.0
+        self._gap_m2 = 0.0
+        self._gap_min = math.inf
+        self._gap_max = 0.0
+        self._gap_refs = 0
+
+    def record(self, key, operation, filename, hit, timestamp):
+        t = self.references
+        self.references = t + 1
+
+        # Sliding working set
+        recent, in_window = self._recent, self._in_window
+        recent.append(key)
+        in_window[key] += 1
+        if len(recent) > self.window:
+            old = recent.popleft()
+            if in_window[old] == 1:
+                del in_window[old]
+            else:
+                in_window[old] -= 1
+        size = len(in_window)
+        self._working_set_sum += size
+        if size > self.working_set_peak:
+            self.working_set_peak = size
+
+        # Reuse time, over a last-use table kept in recency order
+        last_use = self._last_use
+        last = last_use.get(key)
+        last_use[key] = t
+        if last is None:
+            self.cold += 1
+            if len(last_use) > self.max_pages:
+                last_use.popitem(last=False)
+        else:
+            last_use.move_to_end(key)
+            bucket = (t - last).bit_length() - 1
+            buckets = self.reuse_buckets
+            if bucket >= len(buckets):
+                buckets.extend([0] * (bucket + 1 - len(buckets)))
+            buckets[bucket] += 1
+
+        self.op_references[operation] += 1
+        if hit:
+            return
+        self.op_faults[operation] += 1
+        file_faults = self.file_faults
+        file_faults[filename] += 1
+        if len(file_faults) > 2 * self.max_files:
+            # Keep the files with the most faults; amortised over max_files new files
+            self.file_faults = Counter(dict(file_faults.most_common(self.max_files)))
+
+        # Fault inter-arrival (Welford's running variance)
+        if self._last_fault is not None:
+            last_time, last_t = self._last_fault
+            gap = timestamp - last_time
+            self._gaps += 1
+            delta = gap - self._gap_mean
+            self._gap_mean += delta / self._gaps
+            self._gap_m2 += delta * (gap - self._gap_mean)
+            self._gap_min = min(self._gap_min, gap)
+            self._gap_max = max(self._gap_max, gap)
+            self._gap_refs += t - last_t
+        self._last_fault = (timestamp, t)
+
+    def state(self):
+        """Everything needed to continue the metrics after a restart, as plain values"""
+        return {
+            'window': self.window,
+            'references': self.references,
+            'recent': list(self._recent),
+            'working_set_sum': self._working_set_sum,
+            'working_set_peak': self.working_set_peak,
+            'last_use': list(self._last_use.items()),
+            'cold': self.cold,
+            'reuse_buckets': list(self.reuse_buckets),
+            'file_faults': dict(self.file_faults),
+            'op_references': dict(self.op_references),
+            'op_faults': dict(self.op_faults),
+            'last_fault': self._last_fault,
+            'gaps': (self._gaps, self._gap_mean, self._gap_m2, self._gap_min, self._gap_max, self._gap_refs),
+        }
+
+    def restore(self, state):
+        self.clear()
+        self.references = state['references']
+        # A smaller window keeps only the newest references of the saved one
+        self._recent = deque(state['recent'][-self.window:])
+        self._in_window = Counter(self._recent)
+        self._working_set_sum = state['working_set_sum']
+        self.working_set_peak = state['working_set_peak']
+        last_use = sorted(state['last_use'], key=lambda item: item[1])[-self.max_pages:]
+        self._last_use = OrderedDict(last_use)
+        self.cold = state['cold']
+        self.reuse_buckets = list(state['reuse_buckets'])
+        self.file_faults = Counter(state['file_faults'])
+        if len(self.file_faults) > 2 * self.max_files:
+            self.file_faults = Counter(dict(self.file_faults.most_common(self.max_files)))
+        self.op_references = Counter(state['op_references'])
+        self.op_faults = Counter(state['op_faults'])
+        self._last_fault = tuple(state['last_fault']) if state['last_fault'] is not None else None
+        (self._gaps, self._gap_mean, self._gap_m2, self._gap_min, self._gap_max,
+         self._gap_refs) = state['gaps']
+
+    @property
+    def working_set(self):
+        """W(t, window) after the latest reference"""
+        return len(self._in_window)
+
+    def reuse_histogram(self):
+        """[(low, high, count)] where low <= reuse time <= high, for non-empty buckets"""
+        return [(1 << b, (2 << b) - 1, count) for b, count in enumerate(self.reuse_buckets) if count]
+
+    def get_stats(self, top_files=10):
+        operations = {}
+        for operation, references in self.op_references.items():
+            faults = self.op_faults[operation]
+            operations[operation] = {
+                'references': references,
+                'faults': faults,
+                'fault_rate': faults / references * 100,
+            }
+        gaps = self._gaps
+        return {
+            'window': self.window,
+            'max_pages': self.max_pages,
+            'working_set': self.working_set,
+            'working_set_mean': self._working_set_sum / self.references if self.references else 0,
+            'working_set_peak': self.working_set_peak,
+            'cold': self.cold,
+            'reuse': self.reuse_histogram(),
+            'file_faults': self.file_faults.most_common(top_files),
+            'operations': operations,
+            'inter_arrival': {
+                'count': gaps,
+                'mean': self._gap_mean,
+                'stdev': math.sqrt(self._gap_m2 / (gaps - 1)) if gaps > 1 else 0.0,
+                'min': self._gap_min if gaps else 0.0,
+                'max': self._gap_max,
+                'mean_references': self._gap_refs / gaps if gaps else 0,
+            },
+        }
@@ -0,0 +1,27 @@
+import importlib
+
+# --- Optional Dependencies ---
+# NumPy speeds up whole-trace work but nothing needs it to start, and
+# importing it costs more than the rest of the package together. Modules
+# that can use it call numpy() where they do, so importing the analyzer
+# stays cheap and works where NumPy is not installed.
+
+_modules = {}
+
+
+def optional(name):
+    """The module `name`, imported on first use, or None when it is not installed"""
+    try:
+        return _modules[name]
+    except KeyError:
+        pass
+    try:
+        module = importlib.import_module(name)
+    except ImportError:
+        module = None
+    _modules[name] = module
+    return module
+
+
+def numpy():
+    return optional("numpy")
@@ -0,0 +1,117 @@
+import os
+import threading
+
+from .policies import make_policy
+
+
+# --- File Content Cache ---
+class ContentCache:
+    """In-process cache of file contents, evicted by a replacement policy.
+
+    Entries are whole files keyed by path. The policy decides the victim
+    whenever the cache holds `max_entries` files or more than `byte_budget`
+    bytes; files larger than the budget are never cached. A hit also checks
+    the file's size and mtime, so edits made outside the app are not served
+    stale. OPT needs the future and cannot drive a real cache.
+    """
+
+    def __init__(self, policy="lru", byte_budget=8 << 20, max_entries=4096):
+        if policy == "opt":
+            raise ValueError("OPT cannot drive a real cache; pick an online policy")
+        self.policy = make_policy(policy, max_entries)
+        self.byte_budget = byte_budget
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _drop(self, path):
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self.bytes -= entry[1]
+
+    def _evict(self):
+        victim = self.policy.evict()
+        if victim is not None:
+            self._drop(victim)
+            self.evictions += 1
+        return victim
+
+    def _store(self, path, content, size, mtime):
+        if path in self._entries:
+            self.policy.remove(path)
+            self._drop(path)
+        if len(self.policy) >= self.policy.capacity:
+            self._evict()
+        self.policy.access(path)
+        self._entries[path] = (content, size, mtime)
+        self.bytes += size
+        while self.bytes > self.byte_budget and self._evict() is not None:
+            pass
+
+    def read(self, path, loader=None):
+        """Return the text of `path`, from memory when the cached copy is current.
+
+        On a miss the file is read with loader(path) when given, e.g. one
+        that reports progress, and with a plain read otherwise.
+        """
+        st = os.stat(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[1] == st.st_size and entry[2] == st.st_mtime_ns:
+                self.policy.access(path)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        if loader is not None:
+            content = loader(path)
+        else:
+            with open(path, "r") as f:
+                content = f.read()
+        if st.st_size <= self.byte_budget:
+            with self._lock:
+                self._store(path, content, st.st_size, st.st_mtime_ns)
+        return content
+
+    def peek(self, path):
+        """Return the cached text of `path` if it is current, without loading it on a miss"""
+        st = os.stat(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[1] == st.st_size and entry[2] == st.st_mtime_ns:
+                self.policy.access(path)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        return None
+
+    def invalidate(self, path):
+        with self._lock:
+            if path in self._entries:
+                self.policy.remove(path)
+                self._drop(path)
+
+    def clear(self):
+        with self._lock:
+            self.policy.reset()
+            self._entries = {}
+            self.bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def get_stats(self):
+        total = self.hits + self.misses
+        return {
+            'policy': self.policy.label,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': (self.hits / total * 100) if total > 0 else 0,
+            'entries': len(self._entries),
+            'bytes': self.bytes,
+            'byte_budget': self.byte_budget,
+        }
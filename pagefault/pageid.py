@@ -0,0 +1,122 @@
+import os
+import zlib
+from collections import OrderedDict
+
+# Page index stored for references to a whole file rather than one page of it
+NO_PAGE = 0xFFFFFFFF
+
+
+# --- Hash Functions ---
+# Each maps the encoded basename to an unsigned 32-bit integer. crc32 runs
+# in C and is the fast choice, about ten times quicker than md5; md5 stays
+# the default because existing logs were written with it. hashlib loads
+# OpenSSL, so it is imported when a name is first hashed, not when the
+# analyzer is.
+def md5_hash(data):
+    import hashlib
+    # Same value as int(md5(data).hexdigest()[:8], 16), the original page id hash
+    return int.from_bytes(hashlib.md5(data).digest()[:4], "big")
+
+
+def blake2b_hash(data):
+    import hashlib
+    return int.from_bytes(hashlib.blake2b(data, digest_size=4).digest(), "big")
+
+
+def crc32_hash(data):
+    return zlib.crc32(data)
+
+
+HASH_FUNCTIONS = {
+    'md5': md5_hash,
+    'blake2b': blake2b_hash,
+    'crc32': crc32_hash,
+}
+
+
+# --- Page Keys ---
+# A reference is keyed by the file's page id, or by (page id, page index)
+# when files are modelled page by page. Logs write the latter as "17:3".
+def split_page_key(key):
+    """(page_id, page_index) for a page key; page_index is NO_PAGE for whole files"""
+    if isinstance(key, tuple):
+        return key
+    return key, NO_PAGE
+
+
+def format_page_key(key):
+    if isinstance(key, tuple):
+        return f"{key[0]}:{key[1]}"
+    return str(key)
+
+
+def parse_page_key(text):
+    page_id, sep, page_index = text.partition(":")
+    if sep:
+        return int(page_id), int(page_index)
+    return int(page_id)
+
+
+# --- Page ID Generator ---
+class PageIdGenerator:
+    """Maps filenames to page ids 1..page_space by hashing the basename.
+
+    The defaults (md5, 100 pages) reproduce the original ids. Recently seen
+    filenames are kept in a bounded LRU cache so repeated references skip
+    the basename and hash work. A small page space makes unrelated files
+    collide and inflates hit ratios, so large datasets should raise it.
+    """
+
+    def __init__(self, hash_function="md5", page_space=100, cache_size=4096):
+        if page_space < 1:
+            raise ValueError("page_space must be at least 1")
+        if isinstance(hash_function, str):
+            try:
+                hash_function = HASH_FUNCTIONS[hash_function]
+            except KeyError:
+                raise ValueError(f"Unknown hash function: {hash_function!r}") from None
+        self.hash_function = hash_function
+        self.page_space = page_space
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _compute(self, filename):
+        return self.hash_function(os.path.basename(filename).encode()) % self.page_space + 1
+
+    def page_id(self, filename):
+        cache = self._cache
+        page_id = cache.get(filename)
+        if page_id is not None:
+            self.cache_hits += 1
+            cache.move_to_end(filename)
+            return page_id
+        self.cache_misses += 1
+        page_id = cache[filename] = self._compute(filename)
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return page_id
+
+    __call__ = page_id
+
+    def page_ids(self, filenames):
+        """Bulk path for batch replays: hashes each distinct name once.
+
+        Bypasses the LRU cache so a long trace does not churn it.
+        """
+        memo = {}
+        compute = self._compute
+        ids = []
+        append = ids.append
+        for name in filenames:
+            page_id = memo.get(name)
+            if page_id is None:
+                page_id = memo[name] = compute(name)
+            append(page_id)
+        return ids
+
+    def clear(self):
+        self._cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
@@ -0,0 +1,508 @@
+import heapq
+from collections import OrderedDict, deque
+
+
+# --- Replacement Policy Interface ---
+class ReplacementPolicy:
+    """Base class for page replacement policies.
+
+    A policy owns the set of resident pages. access() records one reference
+    and returns True on a hit; on a miss with every frame in use it evicts a
+    victim first, and last_victim keeps the page evicted by the latest such
+    miss. Subclasses implement _hit, _insert and evict.
+
+    state() returns the policy's bookkeeping as plain lists, bytes and
+    numbers for snapshots, and restore() loads it back into a policy of the
+    same kind and capacity.
+    """
+    name = None
+    label = None
+    last_victim = None
+
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+
+    def access(self, page):
+        if page in self:
+            self._hit(page)
+            return True
+        if len(self) >= self.capacity:
+            self.last_victim = self.evict()
+        self._insert(page)
+        return False
+
+    def _hit(self, page):
+        raise NotImplementedError
+
+    def _insert(self, page):
+        raise NotImplementedError
+
+    def evict(self):
+        """Remove and return the next victim, or None if nothing is resident"""
+        raise NotImplementedError
+
+    def remove(self, page):
+        """Drop a resident page without counting it as an eviction"""
+        raise NotImplementedError
+
+    def pages(self):
+        """Resident pages, next victim first"""
+        raise NotImplementedError
+
+    def reset(self):
+        raise NotImplementedError
+
+    def state(self):
+        raise NotImplementedError(f"{self.label} state cannot be saved")
+
+    def restore(self, state):
+        raise NotImplementedError(f"{self.label} state cannot be restored")
+
+    def __contains__(self, page):
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+
+class _OrderedPolicy(ReplacementPolicy):
+    """Shared storage for policies whose eviction order is a single queue"""
+
+    def __init__(self, capacity):
+        super().__init__(capacity)
+        self._frames = OrderedDict()
+
+    def _insert(self, page):
+        self._frames[page] = None
+
+    def evict(self):
+        if not self._frames:
+            return None
+        return self._frames.popitem(last=False)[0]
+
+    def remove(self, page):
+        if page not in self._frames:
+            return False
+        del self._frames[page]
+        return True
+
+    def pages(self):
+        return list(self._frames)
+
+    def reset(self):
+        self._frames = OrderedDict()
+
+    def state(self):
+        return {'frames': list(self._frames)}
+
+    def restore(self, state):
+        self._frames = OrderedDict.fromkeys(state['frames'])
+
+    def __contains__(self, page):
+        return page in self._frames
+
+    def __len__(self):
+        return len(self._frames)
+
+
+# --- FIFO ---
+class FIFOPolicy(_OrderedPolicy):
+    """First-in first-out, the same queue discipline as code.cpp"""
+    name = "fifo"
+    label = "FIFO"
+
+    def _hit(self, page):
+        pass
+
+
+# --- LRU ---
+class LRUPolicy(_OrderedPolicy):
+    """Least recently used: hits move the page to the back of the queue"""
+    name = "lru"
+    label = "LRU"
+
+    def _hit(self, page):
+        self._frames.move_to_end(page)
+
+
+# --- Belady OPT ---
+class OPTPolicy(ReplacementPolicy):
+    """Belady's optimal policy: evict the page whose next use is furthest away.
+
+    The future reference string is given as an iterable. With lookahead=None
+    it is read in full; otherwise only the next `lookahead` references are
+    buffered and pages not seen inside that window count as never used again.
+    Every access() must match the next reference of the future string.
+    """
+    name = "opt"
+    label = "OPT"
+    NEVER = float("inf")
+
+    def __init__(self, capacity, future=(), lookahead=None):
+        super().__init__(capacity)
+        self.lookahead = lookahead
+        self._source = future
+        self.reset()
+
+    def _fill(self):
+        window = self._window
+        while self._future is not None and (self.lookahead is None or len(window) <= self.lookahead):
+            try:
+                page = next(self._future)
+            except StopIteration:
+                self._future = None
+                break
+            window.append(page)
+            uses = self._positions.setdefault(page, deque())
+            if not uses and self._next.get(page) == self.NEVER:
+                # A resident page's next use has just come into the window
+                self._next[page] = self._fed
+                self._seq += 1
+                heapq.heappush(self._heap, (-self._fed, self._seq, page))
+            uses.append(self._fed)
+            self._fed += 1
+
+    def access(self, page):
+        self._fill()
+        if self._window:
+            expected = self._window.popleft()
+            if expected != page:
+                raise ValueError(f"OPT expected page {expected!r}, got {page!r}")
+            uses = self._positions[page]
+            uses.popleft()
+            if not uses:
+                del self._positions[page]
+        uses = self._positions.get(page)
+        next_use = uses[0] if uses else self.NEVER
+
+        hit = page in self._next
+        if not hit and len(self._next) >= self.capacity:
+            self.last_victim = self.evict()
+        self._next[page] = next_use
+        self._seq += 1
+        heapq.heappush(self._heap, (-next_use, self._seq, page))
+        if len(self._heap) > 2 * self.capacity + 16:
+            self._compact()
+        return hit
+
+    def _compact(self):
+        self._heap = [(-nxt, seq, page) for seq, (page, nxt) in enumerate(self._next.items())]
+        heapq.heapify(self._heap)
+        self._seq = len(self._heap)
+
+    def evict(self):
+        heap = self._heap
+        while heap:
+            neg_next, _, page = heapq.heappop(heap)
+            if self._next.get(page) == -neg_next:
+                del self._next[page]
+                return page
+        return None
+
+    def remove(self, page):
+        # Stale heap entries are skipped lazily by evict()
+        return self._next.pop(page, None) is not None
+
+    def pages(self):
+        return sorted(self._next, key=self._next.get, reverse=True)
+
+    def reset(self):
+        self._future = iter(self._source)
+        self._window = deque()
+        self._positions = {}
+        self._fed = 0
+        self._next = {}
+        self._heap = []
+        self._seq = 0
+
+    def __contains__(self, page):
+        return page in self._next
+
+    def __len__(self):
+        return len(self._next)
+
+
+# --- Second Chance / Clock ---
+class ClockPolicy(ReplacementPolicy):
+    """Second-chance replacement over a circular array of frames"""
+    name = "clock"
+    label = "Clock"
+
+    def __init__(self, capacity):
+        super().__init__(capacity)
+        self.reset()
+
+    def _hit(self, page):
+        self._ref[self._slot[page]] = 1
+
+    def _insert(self, page):
+        if self._free:
+            index = self._free.pop()
+        else:
+            index = len(self._slots)
+            self._slots.append(None)
+        self._slots[index] = page
+        self._ref[index] = 1
+        self._slot[page] = index
+
+    def evict(self):
+        if not self._slot:
+            return None
+        slots, ref = self._slots, self._ref
+        size = len(slots)
+        hand = self._hand
+        while True:
+            if hand >= size:
+                hand = 0
+            page = slots[hand]
+            if page is not None and not ref[hand]:
+                break
+            ref[hand] = 0
+            hand += 1
+        slots[hand] = None
+        del self._slot[page]
+        self._free.append(hand)
+        self._hand = hand + 1
+        return page
+
+    def remove(self, page):
+        index = self._slot.pop(page, None)
+        if index is None:
+            return False
+        self._slots[index] = None
+        self._ref[index] = 0
+        self._free.append(index)
+        return True
+
+    def pages(self):
+        size = len(self._slots)
+        start = self._hand % size if size else 0
+        order = self._slots[start:] + self._slots[:start]
+        return [page for page in order if page is not None]
+
+    def reset(self):
+        self._slots = []
+        self._ref = bytearray(self.capacity)
+        self._slot = {}
+        self._free = []
+        self._hand = 0
+
+    def state(self):
+        return {'slots': list(self._slots), 'ref': bytes(self._ref[:len(self._slots)]), 'hand': self._hand}
+
+    def restore(self, state):
+        self.reset()
+        self._slots = list(state['slots'])
+        self._ref[:len(state['ref'])] = state['ref']
+        self._slot = {page: index for index, page in enumerate(self._slots) if page is not None}
+        self._free = [index for index, page in enumerate(self._slots) if page is None]
+        self._hand = state['hand']
+
+    def __contains__(self, page):
+        return page in self._slot
+
+    def __len__(self):
+        return len(self._slot)
+
+
+# --- LFU ---
+class LFUPolicy(ReplacementPolicy):
+    """Least frequently used with O(1) frequency buckets, LRU within a bucket"""
+    name = "lfu"
+    label = "LFU"
+
+    def __init__(self, capacity):
+        super().__init__(capacity)
+        self.reset()
+
+    def _hit(self, page):
+        count = self._count[page]
+        bucket = self._buckets[count]
+        del bucket[page]
+        if not bucket:
+            del self._buckets[count]
+            if self._min == count:
+                self._min = count + 1
+        self._count[page] = count + 1
+        self._buckets.setdefault(count + 1, OrderedDict())[page] = None
+
+    def _insert(self, page):
+        self._count[page] = 1
+        self._buckets.setdefault(1, OrderedDict())[page] = None
+        self._min = 1
+
+    def evict(self):
+        if not self._count:
+            return None
+        if self._min not in self._buckets:
+            self._min = min(self._buckets)
+        bucket = self._buckets[self._min]
+        page = bucket.popitem(last=False)[0]
+        if not bucket:
+            del self._buckets[self._min]
+        del self._count[page]
+        return page
+
+    def remove(self, page):
+        count = self._count.pop(page, None)
+        if count is None:
+            return False
+        bucket = self._buckets[count]
+        del bucket[page]
+        if not bucket:
+            del self._buckets[count]
+        return True
+
+    def pages(self):
+        return [page for count in sorted(self._buckets) for page in self._buckets[count]]
+
+    def reset(self):
+        self._count = {}
+        self._buckets = {}
+        self._min = 0
+
+    def state(self):
+        return {'pages': [(page, self._count[page]) for page in self.pages()]}
+
+    def restore(self, state):
+        self.reset()
+        for page, count in state['pages']:
+            self._count[page] = count
+            self._buckets.setdefault(count, OrderedDict())[page] = None
+        self._min = min(self._buckets) if self._buckets else 0
+
+    def __contains__(self, page):
+        return page in self._count
+
+    def __len__(self):
+        return len(self._count)
+
+
+# --- ARC ---
+class ARCPolicy(ReplacementPolicy):
+    """Adaptive Replacement Cache (Megiddo & Modha).
+
+    T1 holds pages seen once recently and T2 pages seen at least twice. B1
+    and B2 are ghost lists of pages recently evicted from T1 and T2; hits in
+    them adapt the target size p of T1.
+    """
+    name = "arc"
+    label = "ARC"
+
+    def __init__(self, capacity):
+        super().__init__(capacity)
+        self.reset()
+
+    def access(self, page):
+        c = self.capacity
+        t1, t2, b1, b2 = self._t1, self._t2, self._b1, self._b2
+        if page in t1:
+            del t1[page]
+            t2[page] = None
+            return True
+        if page in t2:
+            t2.move_to_end(page)
+            return True
+
+        if page in b1:
+            self.p = min(c, self.p + max(len(b2) / len(b1), 1))
+            if len(t1) + len(t2) >= c:
+                self._replace(False)
+            del b1[page]
+            t2[page] = None
+            return False
+        if page in b2:
+            self.p = max(0, self.p - max(len(b1) / len(b2), 1))
+            if len(t1) + len(t2) >= c:
+                self._replace(True)
+            del b2[page]
+            t2[page] = None
+            return False
+
+        if len(t1) + len(b1) >= c:
+            if len(t1) < c:
+                b1.popitem(last=False)
+                if len(t1) + len(t2) >= c:
+                    self._replace(False)
+            else:
+                self.last_victim = t1.popitem(last=False)[0]
+        else:
+            total = len(t1) + len(t2) + len(b1) + len(b2)
+            if total >= c:
+                if total >= 2 * c:
+                    b2.popitem(last=False)
+                if len(t1) + len(t2) >= c:
+                    self._replace(False)
+        t1[page] = None
+        return False
+
+    def _replace(self, in_b2):
+        t1 = self._t1
+        if t1 and (len(t1) > self.p or (in_b2 and len(t1) == self.p)):
+            page = t1.popitem(last=False)[0]
+            self._b1[page] = None
+        elif self._t2:
+            page = self._t2.popitem(last=False)[0]
+            self._b2[page] = None
+        else:
+            page = t1.popitem(last=False)[0]
+            self._b1[page] = None
+        self.last_victim = page
+        return page
+
+    def evict(self):
+        if not self._t1 and not self._t2:
+            return None
+        page = self._replace(False)
+        if len(self._b1) + len(self._b2) > self.capacity:
+            ghosts = self._b1 if len(self._b1) > len(self._b2) else self._b2
+            ghosts.popitem(last=False)
+        return page
+
+    def remove(self, page):
+        for resident in (self._t1, self._t2):
+            if page in resident:
+                del resident[page]
+                return True
+        return False
+
+    def pages(self):
+        return list(self._t1) + list(self._t2)
+
+    def reset(self):
+        self._t1 = OrderedDict()
+        self._t2 = OrderedDict()
+        self._b1 = OrderedDict()
+        self._b2 = OrderedDict()
+        self.p = 0
+
+    def state(self):
+        return {'t1': list(self._t1), 't2': list(self._t2), 'b1': list(self._b1), 'b2': list(self._b2),
+                'p': self.p}
+
+    def restore(self, state):
+        self._t1, self._t2, self._b1, self._b2 = (OrderedDict.fromkeys(state[name])
+                                                  for name in ('t1', 't2', 'b1', 'b2'))
+        self.p = state['p']
+
+    def __contains__(self, page):
+        return page in self._t1 or page in self._t2
+
+    def __len__(self):
+        return len(self._t1) + len(self._t2)
+
+
+POLICIES = OrderedDict(
+    (cls.name, cls) for cls in (FIFOPolicy, LRUPolicy, OPTPolicy, ClockPolicy, LFUPolicy, ARCPolicy)
+)
+
+
+def make_policy(name, capacity, **options):
+    """Build a policy by name ('fifo', 'lru', 'opt', 'clock', 'lfu', 'arc')"""
+    try:
+        cls = POLICIES[name.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown replacement policy: {name!r}") from None
+    return cls(capacity, **options)
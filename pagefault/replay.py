@@ -0,0 +1,141 @@
+import os
+import time
+from itertools import islice
+
+from .analyzer import PageFaultAnalyzer
+from .binlog import BinaryTrace, is_binary_trace
+from .importers import IMPORTERS, detect_format, import_records
+from .pageid import PageIdGenerator, parse_page_key
+from .policies import make_policy
+
+READ_BUFFER = 1 << 20
+
+# --- Trace Parsing ---
+# A trace is either the analyzer's own text log
+#   "2025-05-17 13:08:43 | Operation: READ | File: a.txt | Page ID: 42 | Hit"
+# or a plain reference string with one reference per line, written as
+# "<page id>", "<filename>" or "<operation> <page id|filename>". Page ids
+# of page-granular references are written "<page id>:<page index>".
+# Blank lines and lines starting with '#' are skipped. Binary traces
+# (see binlog.py) are detected by their header and memory-mapped, and
+# strace and blktrace dumps are imported on the fly (see importers.py).
+
+
+def iter_lines(path):
+    """Yield the lines of a trace file one at a time"""
+    with open(path, "r", buffering=READ_BUFFER, errors="replace") as f:
+        for line in f:
+            yield line
+
+
+def parse_log_line(line):
+    """Parse one page_fault_log.txt line into (page_id, operation, filename)"""
+    head, page_field, _status = line.rsplit(" | ", 2)
+    head, filename = head.split(" | File: ", 1)
+    operation = head.split(" | Operation: ", 1)[1]
+    return parse_page_key(page_field[len("Page ID: "):]), operation, filename
+
+
+def parse_trace(lines, page_id_for=None):
+    """Turn trace lines into (page_id, operation, filename) tuples.
+
+    Filenames without a logged page id are mapped with `page_id_for`,
+    which defaults to the analyzer's filename hash.
+    """
+    if page_id_for is None:
+        page_id_for = PageIdGenerator().page_id
+    for line in lines:
+        line = line.strip()
+        if not line or line[0] == "#":
+            continue
+        if " | Page ID: " in line:
+            yield parse_log_line(line)
+            continue
+        parts = line.split(None, 1)
+        operation, ref = ("REF", parts[0]) if len(parts) == 1 else parts
+        if ref.replace(":", "", 1).isdigit():
+            yield parse_page_key(ref), operation, None
+        else:
+            yield page_id_for(ref), operation, ref
+
+
+def trace_format(path):
+    """Detect the format of a trace file: binary, strace, blktrace or log"""
+    if is_binary_trace(path):
+        return "binary"
+    with open(path, "r", errors="replace") as f:
+        return detect_format(islice(f, 20)) or "log"
+
+
+def read_trace(path, page_id_for=None, format="auto", page_size=None):
+    """Stream (page_id, operation, filename) tuples from a trace.
+
+    format is one of TRACE_FORMATS; "log" covers the analyzer's text log
+    and plain reference strings. page_size splits imported dumps into
+    page-granular references.
+    """
+    if format == "auto":
+        format = trace_format(path)
+    if format == "binary":
+        return _read_binary(path)
+    if format in IMPORTERS:
+        return import_records(iter_lines(path), format, page_size, page_id_for)
+    return parse_trace(iter_lines(path), page_id_for)
+
+
+def _read_binary(path):
+    with BinaryTrace(path) as trace:
+        yield from trace
+
+
+def page_ids(records):
+    for page_id, _operation, _filename in records:
+        yield page_id
+
+
+# --- Replay ---
+def build_analyzer(path, policy="lru", frames=4, lookahead=None, page_id_for=None, format="auto", page_size=None):
+    """Build a non-logging analyzer for replaying `path`.
+
+    OPT reads the trace a second time as its future reference string, so
+    only `lookahead` references are ever buffered.
+    """
+    options = {}
+    if policy.lower() == "opt":
+        options = {'future': page_ids(read_trace(path, page_id_for, format, page_size)), 'lookahead': lookahead}
+    return PageFaultAnalyzer(frames, log_path=None, policy=make_policy(policy, frames, **options))
+
+
+def replay(records, analyzer):
+    """Feed every record through analyzer.access and return a summary dict"""
+    access = analyzer.access
+    start = time.perf_counter()
+    for page_id, _operation, _filename in records:
+        access(page_id)
+    elapsed = time.perf_counter() - start
+
+    stats = analyzer.get_stats()
+    stats.pop('history')
+    stats['frame_size'] = analyzer.frame_size
+    stats['elapsed'] = elapsed
+    stats['refs_per_sec'] = stats['total'] / elapsed if elapsed > 0 else 0.0
+    return stats
+
+
+def replay_file(path, policy="lru", frames=4, lookahead=None, page_id_for=None, format="auto", page_size=None):
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Trace file not found: {path}")
+    analyzer = build_analyzer(path, policy, frames, lookahead, page_id_for, format, page_size)
+    return replay(read_trace(path, page_id_for, format, page_size), analyzer)
+
+
+def format_summary(path, stats):
+    return (
+        f"Trace: {path}\n"
+        f"Policy: {stats['policy']} ({stats['frame_size']} frames)\n"
+        f"Total Page References: {stats['total']}\n"
+        f"Page Hits: {stats['hits']}\n"
+        f"Page Faults: {stats['faults']}\n"
+        f"Hit Ratio: {stats['hit_ratio']:.2f}%\n"
+        f"Elapsed: {stats['elapsed']:.3f}s ({stats['refs_per_sec']:,.0f} refs/sec)"
+    )
@@ -0,0 +1,327 @@
+import mmap
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+READ_CHUNK = 1 << 20
+MMAP_THRESHOLD = 1 << 20
+MMAP_WINDOW = 8 << 20
+TOKEN = re.compile(r"\w+")
+
+
+# --- Streaming Search ---
+def _scan(text, needle, first_line):
+    """Yield (line number, line, end) for lines of text containing needle; end is
+    the index just past the line.
+
+    The block is lowercased once and searched with str.find, so only lines
+    that match are sliced out and line numbers are counted between matches.
+    """
+    lower = text.lower()
+    if len(lower) != len(text):
+        # Some characters change length when lowercased; fall back to per line
+        end = -1
+        for offset, line in enumerate(text.split("\n")):
+            end += len(line) + 1
+            if needle in line.lower():
+                yield first_line + offset, line, end
+        return
+    lineno, counted = first_line, 0
+    pos = lower.find(needle)
+    while pos != -1:
+        start = text.rfind("\n", 0, pos) + 1
+        end = text.find("\n", pos)
+        if end == -1:
+            end = len(text)
+        lineno += text.count("\n", counted, start)
+        counted = start
+        yield lineno, text[start:end], end
+        pos = lower.find(needle, end + 1)
+
+
+def search_text(text, keyword, limit=None):
+    """(matches, end) for an in-memory text: up to `limit` (line number, line) pairs,
+    and the index where the search stopped (len(text) unless the limit was hit)"""
+    matches = []
+    for lineno, line, end in _scan(text, keyword.lower(), 1):
+        matches.append((lineno, line))
+        if limit is not None and len(matches) >= limit:
+            return matches, end
+    return matches, len(text)
+
+
+def stream_search(path, keyword, limit=None, chunk_size=READ_CHUNK, progress=None):
+    """(matches, bytes read) for a file, read in large chunks.
+
+    Stops reading as soon as `limit` matches are found, so a query that
+    matches early in a large file never touches the rest of it; the bytes
+    read tell the caller how much of the file that was. progress, if
+    given, is called with (characters read, file size) after each chunk.
+    """
+    needle = keyword.lower()
+    matches = []
+    first_line = 1
+    carry = ""
+    done = 0
+    with open(path, "r", errors="replace") as f:
+        size = os.fstat(f.fileno()).st_size
+        while True:
+            chunk = f.read(chunk_size)
+            if progress is not None and chunk:
+                done += len(chunk)
+                progress(min(done, size), size)
+            if chunk:
+                text = carry + chunk
+                cut = text.rfind("\n") + 1
+                if cut == 0:
+                    carry = text
+                    continue
+                text, carry = text[:cut - 1], text[cut:]
+            else:
+                text, carry = carry, ""
+                if not text:
+                    break
+            for lineno, line, _end in _scan(text, needle, first_line):
+                matches.append((lineno, line))
+                if limit is not None and len(matches) >= limit:
+                    return matches, f.buffer.tell()
+            first_line += text.count("\n") + 1
+            if not chunk:
+                break
+    return matches, size
+
+
+def mmap_search(path, keyword, limit=None, window=MMAP_WINDOW, progress=None):
+    """stream_search for large files: scans a read-only mapping window by window.
+
+    Windows are cut at line boundaries and lowercased as bytes, so the page
+    cache is read in place without building str copies of the whole file.
+    When the limit is hit, the bytes read run to the end of that window.
+    Case folding is ASCII-only; other keywords fall back to stream_search.
+    """
+    if not keyword.isascii():
+        return stream_search(path, keyword, limit, progress=progress)
+    needle = keyword.lower().encode()
+    matches = []
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return matches, 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start, lineno = 0, 1
+            while start < size:
+                stop = min(start + window, size)
+                if stop < size:
+                    newline = mm.rfind(b"\n", start, stop)
+                    if newline >= start:
+                        stop = newline + 1
+                    else:
+                        newline = mm.find(b"\n", stop)
+                        stop = size if newline == -1 else newline + 1
+                block = mm[start:stop]
+                lower = block.lower()
+                counted = 0
+                pos = lower.find(needle)
+                while pos != -1:
+                    line_start = block.rfind(b"\n", 0, pos) + 1
+                    line_end = block.find(b"\n", pos)
+                    if line_end == -1:
+                        line_end = len(block)
+                    lineno += block.count(b"\n", counted, line_start)
+                    counted = line_start
+                    matches.append((lineno, block[line_start:line_end].decode(errors="replace").rstrip("\r")))
+                    if limit is not None and len(matches) >= limit:
+                        return matches, stop
+                    pos = lower.find(needle, line_end + 1)
+                lineno += block.count(b"\n", counted)
+                start = stop
+                if progress is not None:
+                    progress(stop, size)
+    return matches, size
+
+
+def search_file(path, keyword, limit=None, progress=None):
+    """(matches, bytes read): mmap scanning for large files, chunked text reads for small ones"""
+    if os.path.getsize(path) >= MMAP_THRESHOLD:
+        return mmap_search(path, keyword, limit, progress=progress)
+    return stream_search(path, keyword, limit, progress=progress)
+
+
+def _search_group(folder, filenames, keyword, limit):
+    """Worker task: search a group of files, returning (filename, bytes read, matches) tuples"""
+    results = []
+    for filename in filenames:
+        path = os.path.join(folder, filename)
+        try:
+            matches, scanned = search_file(path, keyword, limit)
+            results.append((filename, scanned, matches))
+        except OSError:
+            continue
+    return results
+
+
+# --- Parallel Folder Search ---
+class ParallelSearch:
+    """Searches every file in a folder across a process (or thread) pool.
+
+    Files are handed out in groups so thousands of small files do not cost a
+    task each. results() yields (filename, bytes read, matches) as groups finish,
+    so callers can show matches incrementally; cancel() drops queued groups
+    and stops the iteration. Worker processes are spawned, not forked:
+    the GUI runs other threads whose locks a forked child could inherit
+    held. As with any spawned pool, the calling script must guard its
+    entry point with `if __name__ == "__main__"`.
+    """
+
+    def __init__(self, folder, keyword, limit_per_file=None, workers=None, processes=True, group_size=32):
+        self.folder = folder
+        self.keyword = keyword
+        self.limit_per_file = limit_per_file
+        self.workers = workers or os.cpu_count() or 1
+        self.processes = processes
+        self.group_size = group_size
+        self._cancelled = threading.Event()
+        self._executor = None
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def results(self):
+        filenames = sorted(entry.name for entry in os.scandir(self.folder) if entry.is_file())
+        groups = [filenames[i:i + self.group_size] for i in range(0, len(filenames), self.group_size)]
+        if not groups:
+            return
+        workers = min(self.workers, len(groups))
+        if self.processes and len(groups) > 1:
+            self._executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+        else:
+            self._executor = ThreadPoolExecutor(workers)
+        try:
+            futures = [self._executor.submit(_search_group, self.folder, group, self.keyword, self.limit_per_file)
+                       for group in groups]
+            for future in as_completed(futures):
+                if self.cancelled:
+                    return
+                if future.cancelled():
+                    continue
+                for result in future.result():
+                    if self.cancelled:
+                        return
+                    yield result
+        finally:
+            self._executor.shutdown(wait=not self.cancelled, cancel_futures=True)
+
+
+# --- Inverted Index ---
+def tokenize(line):
+    return TOKEN.findall(line.lower())
+
+
+class InvertedIndex:
+    """Token -> {filename: line numbers} postings for one user's folder.
+
+    Built once from disk, then kept current incrementally: appended lines
+    are indexed as they are written, modified files are re-indexed and
+    deleted files dropped. refresh() re-indexes files whose mtime changed
+    outside the app.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        self._postings = {}
+        self._files = {}
+        self._lock = threading.Lock()
+
+    def _add_lines(self, filename, lines, first_line):
+        tokens, _, lines_seen = self._files[filename]
+        postings = self._postings
+        for lineno, line in enumerate(lines, start=first_line):
+            for token in set(tokenize(line)):
+                postings.setdefault(token, {}).setdefault(filename, []).append(lineno)
+                tokens.add(token)
+        self._files[filename] = (tokens, self._mtime(filename), lines_seen + len(lines))
+
+    def _mtime(self, filename):
+        try:
+            return os.stat(os.path.join(self.folder, filename)).st_mtime_ns
+        except OSError:
+            return None
+
+    def _remove(self, filename):
+        entry = self._files.pop(filename, None)
+        if entry is None:
+            return
+        for token in entry[0]:
+            files = self._postings.get(token)
+            if files is not None:
+                files.pop(filename, None)
+                if not files:
+                    del self._postings[token]
+
+    def _index_file(self, filename):
+        self._remove(filename)
+        self._files[filename] = (set(), None, 0)
+        path = os.path.join(self.folder, filename)
+        with open(path, "r", errors="replace") as f:
+            self._add_lines(filename, f.read().splitlines(), 1)
+
+    def build(self):
+        with self._lock:
+            self._postings = {}
+            self._files = {}
+            for entry in os.scandir(self.folder):
+                if entry.is_file():
+                    self._index_file(entry.name)
+        return self
+
+    def refresh(self):
+        """Re-index files created, changed or removed behind the index's back"""
+        with self._lock:
+            on_disk = {entry.name for entry in os.scandir(self.folder) if entry.is_file()}
+            for filename in list(self._files):
+                if filename not in on_disk:
+                    self._remove(filename)
+            for filename in on_disk:
+                entry = self._files.get(filename)
+                if entry is None or entry[1] != self._mtime(filename):
+                    self._index_file(filename)
+
+    def appended(self, filename, text):
+        """Index lines just appended to filename"""
+        with self._lock:
+            if filename not in self._files:
+                self._index_file(filename)
+                return
+            self._add_lines(filename, text.splitlines(), self._files[filename][2] + 1)
+
+    def replaced(self, filename):
+        with self._lock:
+            self._index_file(filename)
+
+    def removed(self, filename):
+        with self._lock:
+            self._remove(filename)
+
+    def lookup(self, keyword):
+        """{filename: line numbers} where every word of keyword appears on the line"""
+        tokens = tokenize(keyword)
+        if not tokens:
+            return {}
+        with self._lock:
+            postings = [self._postings.get(token, {}) for token in tokens]
+            results = {}
+            for filename, lines in min(postings, key=len).items():
+                common = set(lines)
+                for files in postings:
+                    common &= set(files.get(filename, ()))
+                if common:
+                    results[filename] = sorted(common)
+        return results
@@ -0,0 +1,262 @@
+import asyncio
+import base64
+import binascii
+import json
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from .fileops import UserFiles
+
+REASONS = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found",
+           405: "Method Not Allowed", 408: "Request Timeout", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# --- Request Execution ---
+def _filename(request):
+    name = request["file"]
+    if not isinstance(name, str) or os.path.basename(name.strip()) != name.strip() or name.strip() in ("", ".", ".."):
+        raise ValueError(f"Invalid file name: {name!r}")
+    return name
+
+
+class FileServer:
+    """Local HTTP/1.1 JSON API over the same UserFiles and AnalyzerService as the GUI.
+
+    POST / takes one operation object or a JSON list of them (a batch, run
+    in order on one worker thread) and answers with a result object or a
+    list of them. GET /stats returns the caller's statistics and GET
+    /stats/all the merged statistics of every user. Clients authenticate
+    with HTTP Basic credentials from the UserStore; a connection that
+    authenticated once is not asked to rehash the same credentials, so
+    keep-alive clients pay for the password hash only once.
+
+    Operations: {"op": "create" | "read" | "delete", "file": name},
+    {"op": "write" | "modify", "file", "content"}, {"op": "search", "file",
+    "keyword", "limit"?}, {"op": "read_range", "file", "offset", "length"},
+    {"op": "replace_range", "file", "offset", "length", "content"},
+    {"op": "search_all", "keyword"}, {"op": "create_many", "files": [name or
+    [name, content], ...]}, {"op": "delete_glob", "pattern"}, {"op": "stats"}
+    and {"op": "stats_all"}. The two batch operations record all their files
+    with one analyzer call (see UserFiles). Each result is {"ok": true,
+    "result": ...} or {"ok": false, "error": message}; an operation that
+    fails does not stop the ones after it in a batch.
+    """
+
+    def __init__(self, service, users, data_dir, workers=8, max_body=8 << 20, idle_timeout=30):
+        self.service = service
+        self.users = users
+        self.data_dir = data_dir
+        self.max_body = max_body
+        self.idle_timeout = idle_timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fms-api")
+        self._files = {}
+        self._lock = threading.Lock()
+
+    def files(self, username):
+        """UserFiles for username, shared by all of their connections.
+
+        Building one reads and indexes the user's whole folder, so it runs
+        outside the server lock; a user's other requests wait on the same
+        future instead of building it twice.
+        """
+        with self._lock:
+            future = self._files.get(username)
+            building = future is None
+            if building:
+                future = self._files[username] = Future()
+        if building:
+            try:
+                future.set_result(UserFiles(os.path.join(self.data_dir, username),
+                                            self.service.session(username), indexed=True))
+            except BaseException as e:
+                # Let the next request try again rather than failing for good
+                with self._lock:
+                    del self._files[username]
+                future.set_exception(e)
+        return future.result()
+
+    def execute(self, username, request):
+        """Run one operation and return its result object"""
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("Each request must be a JSON object")
+            op = request.get("op")
+            if op == "stats_all":
+                return {'ok': True, 'result': self.service.get_stats()}
+            files = self.files(username)
+            if op == "create":
+                result = files.create(_filename(request))
+            elif op == "write":
+                result = files.write(_filename(request), request["content"])
+            elif op == "modify":
+                result = files.modify(_filename(request), request["content"])
+            elif op == "read":
+                result = files.read(_filename(request))
+            elif op == "read_range":
+                result = files.read_range(_filename(request), int(request["offset"]), int(request["length"]))
+            elif op == "replace_range":
+                result = files.replace_range(_filename(request), int(request["offset"]), int(request["length"]),
+                                             request["content"])
+            elif op == "search":
+                result = files.search(_filename(request), request["keyword"], request.get("limit"))
+            elif op == "search_all":
+                result = files.search_all(request["keyword"])
+            elif op == "create_many":
+                entries = [(entry, None) if isinstance(entry, str) else tuple(entry) for entry in request["files"]]
+                result = files.create_many(entries)
+            elif op == "delete_glob":
+                result = files.delete_glob(request["pattern"])
+            elif op == "delete":
+                result = files.delete(_filename(request))
+            elif op == "stats":
+                result = files.analyzer.get_stats()
+            else:
+                raise ValueError(f"Unknown operation: {op!r}")
+            return {'ok': True, 'result': result}
+        except KeyError as e:
+            return {'ok': False, 'error': f"Missing field {e}"}
+        except (OSError, ValueError, TypeError) as e:
+            return {'ok': False, 'error': str(e)}
+        except Exception as e:
+            # A malformed field can fail deeper down (e.g. a non-string keyword);
+            # report it for this operation and keep running the rest of the batch
+            return {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+
+    def execute_batch(self, username, payload):
+        if isinstance(payload, list):
+            return [self.execute(username, request) for request in payload]
+        return self.execute(username, payload)
+
+    # --- HTTP ---
+    async def _read_request(self, reader):
+        """(method, path, headers, body), or None when the client closed the connection"""
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.idle_timeout)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+            return None
+        except asyncio.LimitOverrunError:
+            raise HTTPError(413, "Request headers too large")
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, path, version = lines[0].split(" ", 2)
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+        headers = {'_version': version}
+        for line in lines[1:]:
+            name, sep, value = line.partition(":")
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length < 0:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length > self.max_body:
+            raise HTTPError(413, "Request body too large")
+        if not length:
+            return method, path, headers, b""
+        # The error response closes the connection, as the rest of the body is unknown
+        try:
+            body = await asyncio.wait_for(reader.readexactly(length), self.idle_timeout)
+        except asyncio.IncompleteReadError:
+            raise HTTPError(400, "Request body shorter than Content-Length")
+        except asyncio.TimeoutError:
+            raise HTTPError(408, "Timed out reading the request body")
+        return method, path, headers, body
+
+    async def _authenticate(self, headers, authenticated):
+        header = headers.get("authorization", "")
+        if header in authenticated:
+            return authenticated[header]
+        scheme, _, encoded = header.partition(" ")
+        if scheme.lower() != "basic":
+            raise HTTPError(401, "Authentication required")
+        try:
+            username, _, password = base64.b64decode(encoded).decode().partition(":")
+        except (binascii.Error, UnicodeDecodeError):
+            raise HTTPError(401, "Malformed credentials")
+        loop = asyncio.get_running_loop()
+        if not await loop.run_in_executor(self._executor, self.users.verify, username, password):
+            raise HTTPError(401, "Invalid credentials.")
+        authenticated[header] = username
+        return username
+
+    async def _dispatch(self, method, path, headers, body, authenticated):
+        username = await self._authenticate(headers, authenticated)
+        if path in ("/stats", "/stats/all"):
+            if method != "GET":
+                raise HTTPError(405, f"{method} not allowed on {path}")
+            payload = {'op': "stats_all" if path == "/stats/all" else "stats"}
+        elif path == "/":
+            if method != "POST":
+                raise HTTPError(405, f"{method} not allowed on {path}")
+            try:
+                payload = json.loads(body)
+            except ValueError as e:
+                raise HTTPError(400, f"Invalid JSON: {e}")
+        else:
+            raise HTTPError(404, f"No such endpoint: {path}")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.execute_batch, username, payload)
+
+    @staticmethod
+    def _response(status, payload, keep_alive):
+        body = json.dumps(payload).encode()
+        head = [f"HTTP/1.1 {status} {REASONS[status]}",
+                "Content-Type: application/json",
+                f"Content-Length: {len(body)}",
+                f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        if status == 401:
+            head.append('WWW-Authenticate: Basic realm="pagefault"')
+        return ("\r\n".join(head) + "\r\n\r\n").encode() + body
+
+    async def handle(self, reader, writer):
+        """Serve requests on one connection until the client or an error closes it"""
+        authenticated = {}
+        try:
+            while True:
+                # Stays False if the request could not be parsed, as its body may be unread
+                keep_alive = False
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    method, path, headers, body = request
+                    connection = headers.get("connection", "").lower()
+                    if headers['_version'] == "HTTP/1.0":
+                        keep_alive = connection == "keep-alive"
+                    else:
+                        keep_alive = connection != "close"
+                    status, payload = 200, await self._dispatch(method, path, headers, body, authenticated)
+                except HTTPError as e:
+                    status, payload = e.status, {'ok': False, 'error': str(e)}
+                except Exception as e:
+                    print("Request failed:", e)
+                    status, payload = 500, {'ok': False, 'error': "Internal server error"}
+                writer.write(self._response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765, ready=None):
+        server = await asyncio.start_server(self.handle, host, port)
+        if ready is not None:
+            ready(server)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.service.close()
@@ -0,0 +1,288 @@
+import os
+import threading
+from collections import Counter
+
+from .analyzer import PageFaultAnalyzer
+from .logbuffer import BufferedLogWriter
+from .pagecache import ContentCache
+from .policies import make_policy
+
+
+# --- Shared Frame Pool ---
+class _Shard:
+    __slots__ = ("policy", "lock", "hits", "faults", "stolen")
+
+    def __init__(self, policy):
+        self.policy = policy
+        self.lock = threading.Lock()
+        self.hits = Counter()
+        self.faults = Counter()
+        self.stolen = Counter()
+
+
+class SharedFramePool:
+    """Physical frames shared by every user, to model contention between them.
+
+    Pages are keyed by (username, page key), so users never share a page but
+    do compete for frames: a fault by one user may evict another user's
+    page, which is counted as a frame stolen from that user. The frames are
+    split into `shards`, each with its own policy and lock, and a page
+    always maps to the same shard. More shards mean less lock contention
+    between sessions, but replacement order is then per shard, as in a
+    sharded cache; shards=1 runs the policy exactly over the whole pool.
+    """
+
+    def __init__(self, capacity, policy="lru", shards=1):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if policy == "opt":
+            raise ValueError("OPT cannot drive a shared pool; pick an online policy")
+        shards = max(1, min(shards, capacity))
+        base, extra = divmod(capacity, shards)
+        self.capacity = capacity
+        self._shards = [_Shard(make_policy(policy, base + (i < extra))) for i in range(shards)]
+        self.label = self._shards[0].policy.label
+
+    def access(self, username, key):
+        """Reference username's page `key`; returns True on a hit"""
+        page = (username, key)
+        shard = self._shards[hash(page) % len(self._shards)]
+        with shard.lock:
+            policy = shard.policy
+            if page in policy:
+                policy.access(page)
+                shard.hits[username] += 1
+                return True
+            full = len(policy) >= policy.capacity
+            policy.access(page)
+            shard.faults[username] += 1
+            if full and policy.last_victim[0] != username:
+                shard.stolen[policy.last_victim[0]] += 1
+            return False
+
+    def get_stats(self, username=None):
+        """Pool counters for one user, or for everyone when username is None"""
+        hits = faults = stolen = resident = 0
+        for shard in self._shards:
+            with shard.lock:
+                if username is None:
+                    hits += sum(shard.hits.values())
+                    faults += sum(shard.faults.values())
+                    stolen += sum(shard.stolen.values())
+                    resident += len(shard.policy)
+                else:
+                    hits += shard.hits[username]
+                    faults += shard.faults[username]
+                    stolen += shard.stolen[username]
+                    resident += sum(1 for page in shard.policy.pages() if page[0] == username)
+        total = hits + faults
+        return {
+            'policy': self.label,
+            'frames': self.capacity,
+            'shards': len(self._shards),
+            'hits': hits,
+            'faults': faults,
+            'total': total,
+            'hit_ratio': (hits / total * 100) if total > 0 else 0,
+            'stolen': stolen,
+            'resident': resident,
+        }
+
+    def remove_user(self, username):
+        """Free every frame held by username and forget their counters"""
+        for shard in self._shards:
+            with shard.lock:
+                for page in [page for page in shard.policy.pages() if page[0] == username]:
+                    shard.policy.remove(page)
+                for counter in (shard.hits, shard.faults, shard.stolen):
+                    counter.pop(username, None)
+
+    def reset(self):
+        for shard in self._shards:
+            with shard.lock:
+                shard.policy.reset()
+                shard.hits.clear()
+                shard.faults.clear()
+                shard.stolen.clear()
+
+
+# --- User Sessions ---
+class UserSession:
+    """One user's view of an AnalyzerService.
+
+    Quacks like a PageFaultAnalyzer for UserFiles and the GUI: every
+    reference goes to the user's own frames and to the shared pool.
+    """
+
+    def __init__(self, service, username):
+        self.service = service
+        self.username = username
+        self.analyzer = service.analyzer(username)
+
+    @property
+    def policy(self):
+        return self.analyzer.policy
+
+    @property
+    def content_cache(self):
+        return self.service.content_cache
+
+    def process_page(self, filename, operation):
+        self.analyzer.process_page(filename, operation)
+        # A whole-file reference is keyed by the page id alone, even with a page size
+        self.service.pool.access(self.username, self.analyzer.generate_page_id(filename))
+
+    def process_range(self, filename, operation, offset, length):
+        self.analyzer.process_range(filename, operation, offset, length)
+        access = self.service.pool.access
+        for key in self.analyzer.page_keys(filename, offset, length):
+            access(self.username, key)
+
+    def process_batch(self, references):
+        keys = self.analyzer.process_batch(references)
+        access = self.service.pool.access
+        for key in keys:
+            access(self.username, key)
+        return keys
+
+    def get_stats(self):
+        stats = self.analyzer.get_stats()
+        stats['cache'] = self.service.content_cache.get_stats() if self.service.content_cache is not None else None
+        stats['pool'] = self.service.pool.get_stats(self.username)
+        return stats
+
+    def reset(self):
+        self.service.reset_user(self.username)
+
+    def flush(self):
+        self.service.flush()
+
+
+# --- Analyzer Service ---
+class AnalyzerService:
+    """Thread-safe page fault analysis for many concurrent users.
+
+    Each user gets a PageFaultAnalyzer with `frame_size` private frames,
+    created on first use and kept across logouts; all of them also
+    reference one SharedFramePool of `pool_frames` frames. Locking is
+    fine-grained: each analyzer has its own lock, pool shards have theirs,
+    and the service lock only guards the user table, so sessions of
+    different users proceed in parallel. All users append to one text log
+    and share one content cache; log_max_bytes and log_max_age rotate
+    that log. OPT has no future reference string here,
+    so the pool and cache fall back to LRU for it.
+
+    With state_dir, each user's analyzer keeps a binary trace and periodic
+    snapshots there (<user>.bin and <user>.snap) and resumes from them, so
+    frames and counters survive a restart; close() checkpoints every user.
+    The shared pool is not persisted.
+    """
+
+    def __init__(self, frame_size=4, pool_frames=16, policy="lru", log_path="page_fault_log.txt",
+                 page_size=None, cache_bytes=None, shards=4, state_dir=None,
+                 log_max_bytes=None, log_max_age=None, **options):
+        self.frame_size = frame_size
+        self.policy_name = policy
+        self.page_size = page_size
+        self.options = options
+        self.state_dir = state_dir
+        if state_dir is not None:
+            if policy == "opt":
+                raise ValueError("OPT cannot be snapshotted; pick an online policy to keep state")
+            os.makedirs(state_dir, exist_ok=True)
+        online = "lru" if policy == "opt" else policy
+        self.pool = SharedFramePool(pool_frames, online, shards)
+        self.content_cache = ContentCache(online, cache_bytes) if cache_bytes else None
+        self.log_writer = None
+        if log_path is not None:
+            self.log_writer = BufferedLogWriter(log_path, max_bytes=log_max_bytes, max_age=log_max_age)
+        self.policy_label = make_policy(policy, frame_size).label
+        self._analyzers = {}
+        self._lock = threading.Lock()
+
+    def analyzer(self, username):
+        """The PageFaultAnalyzer for username, created on first use"""
+        analyzer = self._analyzers.get(username)
+        if analyzer is not None:
+            return analyzer
+        with self._lock:
+            analyzer = self._analyzers.get(username)
+            if analyzer is None:
+                options = dict(self.options)
+                if self.state_dir is not None:
+                    base = os.path.join(self.state_dir, username)
+                    options.update(binary_log_path=base + ".bin", snapshot_path=base + ".snap")
+                analyzer = self._analyzers[username] = PageFaultAnalyzer(
+                    self.frame_size, None, self.policy_name, log_writer=self.log_writer,
+                    page_size=self.page_size, **options)
+        return analyzer
+
+    def session(self, username):
+        return UserSession(self, username)
+
+    @property
+    def users(self):
+        with self._lock:
+            return sorted(self._analyzers)
+
+    def get_stats(self):
+        """Merged statistics: per-user summaries, their totals and the shared pool"""
+        with self._lock:
+            analyzers = list(self._analyzers.items())
+        users = {}
+        hits = faults = 0
+        for username, analyzer in sorted(analyzers):
+            stats = analyzer.get_stats()
+            hits += stats['hits']
+            faults += stats['faults']
+            users[username] = {key: stats[key] for key in ('total', 'hits', 'faults', 'hit_ratio')}
+        total = hits + faults
+        return {
+            'policy': self.policy_label,
+            'users': users,
+            'total': total,
+            'hits': hits,
+            'faults': faults,
+            'hit_ratio': (hits / total * 100) if total > 0 else 0,
+            'pool': self.pool.get_stats(),
+            'cache': self.content_cache.get_stats() if self.content_cache is not None else None,
+        }
+
+    def reset_user(self, username):
+        """Clear one user's frames, counters and history, and their pool frames"""
+        with self._lock:
+            analyzer = self._analyzers.get(username)
+        if analyzer is not None:
+            analyzer.reset()
+        self.pool.remove_user(username)
+
+    def reset(self):
+        """Clear every user, the pool, the cache and the log"""
+        with self._lock:
+            analyzers = list(self._analyzers.values())
+        for analyzer in analyzers:
+            analyzer.reset()
+        self.pool.reset()
+        if self.content_cache is not None:
+            self.content_cache.clear()
+        if self.log_writer is not None:
+            self.log_writer.truncate()
+
+    def flush(self):
+        if self.log_writer is not None:
+            self.log_writer.flush()
+
+    def checkpoint(self):
+        """Snapshot every user's analyzer now (a no-op without state_dir)"""
+        with self._lock:
+            analyzers = list(self._analyzers.values())
+        for analyzer in analyzers:
+            analyzer.checkpoint()
+
+    def close(self):
+        with self._lock:
+            analyzers = list(self._analyzers.values())
+        for analyzer in analyzers:
+            analyzer.close()
+        if self.log_writer is not None:
+            self.log_writer.close()
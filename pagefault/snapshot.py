@@ -0,0 +1,228 @@
+import os
+import struct
+import zlib
+
+from .binlog import OPERATIONS, BinaryTrace
+from .pageid import NO_PAGE
+
+# --- Snapshot Format ---
+# A 24 byte header (magic, version, reserved, CRC-32 and length of the
+# payload) followed by the payload: one value in a small tagged encoding,
+# little-endian throughout:
+#   N None   T True   F False   i int64   f float64
+#   s str    b bytes            (uint32 length, then UTF-8 / raw bytes)
+#   l list   t tuple            (uint32 count, then the items)
+#   d dict                      (uint32 count, then key and value pairs)
+# Page keys are ints or (page id, page index) tuples, so they round-trip as
+# themselves. The payload is a dict; readers of a newer version refuse it
+# rather than guess, and new fields are added under new keys.
+
+MAGIC = b"PFSNAP\0\0"
+VERSION = 1
+HEADER = struct.Struct("<8sHHIQ")
+_INT = struct.Struct("<q")
+_FLOAT = struct.Struct("<d")
+_COUNT = struct.Struct("<I")
+
+
+def _encode(value, out):
+    if value is None:
+        out += b"N"
+    elif value is True:
+        out += b"T"
+    elif value is False:
+        out += b"F"
+    elif isinstance(value, int):
+        out += b"i"
+        out += _INT.pack(value)
+    elif isinstance(value, float):
+        out += b"f"
+        out += _FLOAT.pack(value)
+    elif isinstance(value, str):
+        data = value.encode("utf-8", "surrogatepass")
+        out += b"s"
+        out += _COUNT.pack(len(data))
+        out += data
+    elif isinstance(value, (bytes, bytearray)):
+        out += b"b"
+        out += _COUNT.pack(len(value))
+        out += value
+    elif isinstance(value, (list, tuple)):
+        out += b"t" if isinstance(value, tuple) else b"l"
+        out += _COUNT.pack(len(value))
+        for item in value:
+            _encode(item, out)
+    elif isinstance(value, dict):
+        out += b"d"
+        out += _COUNT.pack(len(value))
+        for key, item in value.items():
+            _encode(key, out)
+            _encode(item, out)
+    else:
+        raise TypeError(f"Cannot snapshot a {type(value).__name__}")
+
+
+def _decode(data, pos):
+    """(value, position after it)"""
+    tag = data[pos:pos + 1]
+    pos += 1
+    if tag == b"N":
+        return None, pos
+    if tag == b"T":
+        return True, pos
+    if tag == b"F":
+        return False, pos
+    if tag == b"i":
+        return _INT.unpack_from(data, pos)[0], pos + _INT.size
+    if tag == b"f":
+        return _FLOAT.unpack_from(data, pos)[0], pos + _FLOAT.size
+    count = _COUNT.unpack_from(data, pos)[0]
+    pos += _COUNT.size
+    if tag == b"s":
+        return data[pos:pos + count].decode("utf-8", "surrogatepass"), pos + count
+    if tag == b"b":
+        return bytes(data[pos:pos + count]), pos + count
+    if tag in (b"l", b"t"):
+        items = []
+        for _ in range(count):
+            item, pos = _decode(data, pos)
+            items.append(item)
+        return (tuple(items) if tag == b"t" else items), pos
+    if tag == b"d":
+        result = {}
+        for _ in range(count):
+            key, pos = _decode(data, pos)
+            result[key], pos = _decode(data, pos)
+        return result, pos
+    raise ValueError(f"Corrupt snapshot: unknown tag {tag!r} at {pos - 1}")
+
+
+def dumps(state):
+    payload = bytearray()
+    _encode(state, payload)
+    return HEADER.pack(MAGIC, VERSION, 0, zlib.crc32(payload), len(payload)) + payload
+
+
+def loads(data):
+    if len(data) < HEADER.size:
+        raise ValueError("Corrupt snapshot: truncated header")
+    magic, version, _, crc, length = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a page fault analyzer snapshot")
+    if version > VERSION:
+        raise ValueError(f"Snapshot version {version} is newer than this reader ({VERSION})")
+    payload = bytes(data[HEADER.size:HEADER.size + length])
+    if len(payload) != length or zlib.crc32(payload) != crc:
+        raise ValueError("Corrupt snapshot: checksum mismatch")
+    return _decode(payload, 0)[0]
+
+
+# --- Analyzer Snapshots ---
+def analyzer_state(analyzer):
+    """The analyzer's frames, counters, history and metrics as a snapshot dict.
+
+    Call with the analyzer's lock held. When the analyzer keeps a binary
+    trace, the snapshot records how far into it the state reaches, so
+    resume() replays only the records after that.
+    """
+    journal = analyzer.binary_log.position() if analyzer.binary_log is not None else (0, None)
+    return {
+        'policy': analyzer.policy.name,
+        'frame_size': analyzer.frame_size,
+        'page_size': analyzer.page_size,
+        'hits': analyzer.page_hits,
+        'faults': analyzer.page_faults,
+        'frames': analyzer.policy.state(),
+        'history': analyzer.page_history.state(),
+        'metrics': analyzer.metrics.state() if analyzer.metrics is not None else None,
+        'journal': {'records': journal[0], 'first': journal[1]},
+    }
+
+
+def save(analyzer, path):
+    """Write the analyzer's snapshot to path atomically (temporary file, then rename)"""
+    data = dumps(analyzer_state(analyzer))
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return len(data)
+
+
+def load(path):
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def compatible(analyzer, state):
+    """True when state was saved by an analyzer with the same policy, frames and page size"""
+    return (state['policy'] == analyzer.policy.name and state['frame_size'] == analyzer.frame_size
+            and state['page_size'] == analyzer.page_size)
+
+
+def restore(analyzer, state):
+    analyzer.page_hits = state['hits']
+    analyzer.page_faults = state['faults']
+    analyzer.policy.restore(state['frames'])
+    analyzer.page_history.restore(state['history'])
+    if analyzer.metrics is not None and state['metrics'] is not None:
+        analyzer.metrics.restore(state['metrics'])
+
+
+def replay_journal(analyzer, path, start=0):
+    """Re-apply binary trace records from `start` on to the frames, counters, history and metrics.
+
+    The logs are not written again: the records are already in them.
+    Returns the number of records applied.
+    """
+    if not os.path.exists(path):
+        return 0
+    access, append = analyzer.access, analyzer.page_history.append
+    record = analyzer.metrics.record if analyzer.metrics is not None else None
+    count = 0
+    with BinaryTrace(path) as trace:
+        names = trace.names
+        for fields in trace.iter_records(start):
+            timestamp, page_id, file_id, op = fields[:4]
+            key = (page_id, fields[5]) if len(fields) > 5 and fields[5] != NO_PAGE else page_id
+            filename = names[file_id] if file_id < len(names) else None
+            hit = access(key)
+            append(key, OPERATIONS[op], filename, hit, timestamp)
+            if record is not None:
+                record(key, OPERATIONS[op], filename, hit, timestamp)
+            count += 1
+    return count
+
+
+def resume(analyzer, path):
+    """Bring a fresh analyzer back to where the last run left off.
+
+    Loads the snapshot at path, then replays the tail of the analyzer's
+    binary trace written after it. If the snapshot is missing, corrupt or
+    was saved under another policy or frame count, or the trace was reset
+    since, the whole trace is replayed instead. Returns (snapshot loaded,
+    trace records replayed).
+    """
+    journal = analyzer.binary_log.path if analyzer.binary_log is not None else None
+    state = None
+    if os.path.exists(path):
+        try:
+            state = load(path)
+        except (OSError, ValueError) as e:
+            print("Snapshot ignored:", e)
+    start = 0
+    if state is not None and compatible(analyzer, state):
+        marker = state['journal']
+        current = analyzer.binary_log.position() if journal is not None else (0, None)
+        if marker['records'] and (current[1] != marker['first'] or current[0] < marker['records']):
+            # The trace was truncated after the snapshot: everything in it is newer
+            state = None
+        else:
+            restore(analyzer, state)
+            start = marker['records']
+    else:
+        state = None
+    replayed = replay_journal(analyzer, journal, start) if journal is not None else 0
+    return state is not None, replayed
@@ -0,0 +1,136 @@
+from .policies import FIFOPolicy
+
+
+# --- Fenwick Tree ---
+class FenwickTree:
+    """Binary indexed tree over positions 1..size with point updates and prefix sums"""
+
+    def __init__(self, size):
+        self.size = size
+        self._tree = [0] * (size + 1)
+
+    def add(self, index, delta):
+        tree, size = self._tree, self.size
+        while index <= size:
+            tree[index] += delta
+            index += index & -index
+
+    def prefix_sum(self, index):
+        tree = self._tree
+        total = 0
+        while index > 0:
+            total += tree[index]
+            index -= index & -index
+        return total
+
+
+# --- Mattson Stack Distance ---
+class StackDistanceAnalyzer:
+    """LRU stack distances for every reference in a single pass (Mattson et al.).
+
+    Each page's most recent reference time carries a 1 in a Fenwick tree, so
+    the number of distinct pages touched since a page's previous reference is
+    a range sum: O(log n) per reference. When the time axis fills up the live
+    marks are renumbered, which keeps the tree at O(distinct pages) entries.
+
+    A reference with stack distance d hits in every LRU cache of at least d
+    frames, so the histogram gives the fault count for all frame sizes at once.
+    """
+
+    def __init__(self, initial_size=1024):
+        self._last = {}
+        self._tree = FenwickTree(initial_size)
+        self._clock = 0
+        self.histogram = {}
+        self.cold_misses = 0
+        self.total = 0
+
+    def _compact(self):
+        live = sorted(self._last.items(), key=lambda item: item[1])
+        self._tree = FenwickTree(max(1024, 2 * len(live) + 1))
+        for position, (page, _) in enumerate(live, start=1):
+            self._last[page] = position
+            self._tree.add(position, 1)
+        self._clock = len(live)
+
+    def access(self, page):
+        """Record a reference and return its stack distance (None when cold)"""
+        if self._clock >= self._tree.size:
+            self._compact()
+        self._clock += 1
+        now = self._clock
+        tree = self._tree
+        self.total += 1
+
+        previous = self._last.get(page)
+        if previous is None:
+            distance = None
+            self.cold_misses += 1
+        else:
+            distance = tree.prefix_sum(now - 1) - tree.prefix_sum(previous) + 1
+            self.histogram[distance] = self.histogram.get(distance, 0) + 1
+            tree.add(previous, -1)
+        tree.add(now, 1)
+        self._last[page] = now
+        return distance
+
+    def feed(self, page_ids):
+        access = self.access
+        for page_id in page_ids:
+            access(page_id)
+        return self
+
+    def miss_ratio_curve(self, max_frames=None):
+        """Hits, faults and ratios for LRU with 1..max_frames frames"""
+        if max_frames is None:
+            max_frames = max(self.histogram, default=1)
+        curve = []
+        hits = 0
+        for frames in range(1, max_frames + 1):
+            hits += self.histogram.get(frames, 0)
+            faults = self.total - hits
+            curve.append({
+                'frames': frames,
+                'hits': hits,
+                'faults': faults,
+                'hit_ratio': (hits / self.total * 100) if self.total else 0,
+                'miss_ratio': (faults / self.total * 100) if self.total else 0,
+            })
+        return curve
+
+
+# --- FIFO Sweep ---
+def fifo_sweep(page_ids, frame_sizes):
+    """Run FIFO for several frame sizes in one pass over the reference string.
+
+    FIFO is not a stack algorithm, so each size keeps its own queue; the
+    trace is still only read once.
+    """
+    frame_sizes = sorted(set(frame_sizes))
+    accessors = [FIFOPolicy(size).access for size in frame_sizes]
+    hits = [0] * len(frame_sizes)
+    total = 0
+    for page_id in page_ids:
+        total += 1
+        for i, access in enumerate(accessors):
+            if access(page_id):
+                hits[i] += 1
+    return [
+        {
+            'frames': size,
+            'hits': hits[i],
+            'faults': total - hits[i],
+            'hit_ratio': (hits[i] / total * 100) if total else 0,
+            'miss_ratio': ((total - hits[i]) / total * 100) if total else 0,
+        }
+        for i, size in enumerate(frame_sizes)
+    ]
+
+
+def belady_anomalies(curve):
+    """Pairs (smaller, larger) of frame counts where more frames gave more faults"""
+    return [
+        (smaller['frames'], larger['frames'])
+        for smaller, larger in zip(curve, curve[1:])
+        if larger['faults'] > smaller['faults']
+    ]
@@ -0,0 +1,171 @@
+import base64
+import hashlib
+import hmac
+import os
+import threading
+
+KDFS = ("pbkdf2_sha256", "scrypt")
+
+
+# --- Password Hashing ---
+# Hashes are stored as "pbkdf2_sha256$iterations$salt$hash" or
+# "scrypt$n$r$p$salt$hash" with base64 salt and hash, so an entry never
+# contains a space and users.txt keeps its "username secret" layout.
+def _b64(data):
+    return base64.b64encode(data).decode("ascii")
+
+
+def hash_password(password, kdf="pbkdf2_sha256", iterations=200_000, n=1 << 14, r=8, p=1, salt=None):
+    salt = salt if salt is not None else os.urandom(16)
+    if kdf == "pbkdf2_sha256":
+        digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+        return f"pbkdf2_sha256${iterations}${_b64(salt)}${_b64(digest)}"
+    if kdf == "scrypt":
+        digest = hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=256 * n * r + (1 << 20))
+        return f"scrypt${n}${r}${p}${_b64(salt)}${_b64(digest)}"
+    raise ValueError(f"Unknown KDF: {kdf!r}")
+
+
+def _parse(encoded):
+    """(kdf, params tuple, salt, digest), or None when `encoded` is not a stored hash"""
+    parts = encoded.split("$")
+    try:
+        if parts[0] == "pbkdf2_sha256" and len(parts) == 4:
+            return parts[0], (int(parts[1]),), base64.b64decode(parts[2]), base64.b64decode(parts[3])
+        if parts[0] == "scrypt" and len(parts) == 6:
+            params = (int(parts[1]), int(parts[2]), int(parts[3]))
+            return parts[0], params, base64.b64decode(parts[4]), base64.b64decode(parts[5])
+    except ValueError:
+        pass
+    return None
+
+
+def is_hashed(secret):
+    return _parse(secret) is not None
+
+
+def check_password(password, encoded):
+    parsed = _parse(encoded)
+    if parsed is None:
+        return False
+    kdf, params, salt, digest = parsed
+    if kdf == "pbkdf2_sha256":
+        candidate = hash_password(password, kdf, iterations=params[0], salt=salt)
+    else:
+        candidate = hash_password(password, kdf, n=params[0], r=params[1], p=params[2], salt=salt)
+    return hmac.compare_digest(candidate, encoded)
+
+
+# --- User Store ---
+class UserStore:
+    """users.txt loaded once into a {username: password hash} index.
+
+    Every lookup stats the file and reloads it only when its mtime or size
+    changed, so logins cost one dict lookup plus one KDF evaluation rather
+    than a scan of the file. Plaintext "username password" lines from the
+    original format are hashed on load and the file is rewritten in place
+    (atomically) when migrate=True. A successful login whose stored hash
+    uses other KDF settings than the store's is rehashed with the current
+    ones, so raising `iterations` upgrades users as they log in.
+    """
+
+    def __init__(self, path, kdf="pbkdf2_sha256", iterations=200_000, n=1 << 14, r=8, p=1, migrate=True):
+        if kdf not in KDFS:
+            raise ValueError(f"Unknown KDF: {kdf!r}")
+        self.path = path
+        self.kdf = kdf
+        self.params = {'iterations': iterations} if kdf == "pbkdf2_sha256" else {'n': n, 'r': r, 'p': p}
+        self.migrate = migrate
+        self._users = {}
+        self._stamp = None
+        self._lock = threading.Lock()
+        # Verified against unknown usernames so they take as long as wrong passwords
+        self._dummy = hash_password("", kdf, **self.params)
+
+    def _hash(self, password):
+        return hash_password(password, self.kdf, **self.params)
+
+    def _current(self, encoded):
+        kdf, params, _, _ = _parse(encoded)
+        return kdf == self.kdf and params == tuple(self.params.values())
+
+    def _load(self):
+        """Reload the index if the file changed since it was last read"""
+        st = os.stat(self.path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp == self._stamp:
+            return
+        users = {}
+        migrated = False
+        with open(self.path, "r") as f:
+            for line in f:
+                if ' ' not in line:
+                    continue
+                username, secret = line.strip().split(' ', 1)
+                if not is_hashed(secret):
+                    secret = self._hash(secret)
+                    migrated = True
+                users[username] = secret
+        self._users = users
+        self._stamp = stamp
+        if migrated and self.migrate:
+            self._save()
+
+    def _save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            for username, secret in self._users.items():
+                f.write(f"{username} {secret}\n")
+        os.replace(tmp, self.path)
+        st = os.stat(self.path)
+        self._stamp = (st.st_mtime_ns, st.st_size)
+
+    def reload(self):
+        with self._lock:
+            self._stamp = None
+            self._load()
+
+    def verify(self, username, password):
+        """True if password is correct for username"""
+        with self._lock:
+            self._load()
+            encoded = self._users.get(username)
+        if encoded is None:
+            check_password(password, self._dummy)
+            return False
+        if not check_password(password, encoded):
+            return False
+        if not self._current(encoded):
+            with self._lock:
+                if self._users.get(username) == encoded:
+                    self._users[username] = self._hash(password)
+                    self._save()
+        return True
+
+    def set_password(self, username, password):
+        """Add username or change their password"""
+        if not username or ' ' in username:
+            raise ValueError("Username must be non-empty and contain no spaces")
+        with self._lock:
+            if os.path.exists(self.path):
+                self._load()
+            self._users[username] = self._hash(password)
+            self._save()
+
+    def remove(self, username):
+        with self._lock:
+            self._load()
+            if self._users.pop(username, None) is None:
+                return False
+            self._save()
+            return True
+
+    def __contains__(self, username):
+        with self._lock:
+            self._load()
+            return username in self._users
+
+    def __len__(self):
+        with self._lock:
+            self._load()
+            return len(self._users)
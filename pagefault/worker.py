@@ -0,0 +1,104 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Cancelled(Exception):
+    """Raised inside a task when the user cancels it"""
+
+
+class Task:
+    """Handle shared between a background call and the Tk thread"""
+
+    def __init__(self, on_done=None, on_error=None, on_progress=None):
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self._cancel = threading.Event()
+        self._results = None
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def report(self, done, total=None):
+        """Post progress from the worker; raises Cancelled once cancel() was called"""
+        if self._cancel.is_set():
+            raise Cancelled()
+        if self.on_progress is not None:
+            self._results.put((self, 'progress', (done, total)))
+
+
+# --- Background Worker ---
+class BackgroundWorker:
+    """Runs blocking calls on a thread pool and hands results back to Tk.
+
+    Workers never touch widgets: outcomes go on a queue that the Tk thread
+    drains every `poll_ms` through root.after, and the on_done / on_error /
+    on_progress callbacks run there. Once a task is cancelled none of its
+    callbacks run, even if the call finishes anyway.
+    """
+
+    def __init__(self, root, max_workers=2, poll_ms=50):
+        self.root = root
+        self.poll_ms = poll_ms
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fms-worker")
+        self._results = queue.Queue()
+        self._pending = 0
+        self._polling = False
+
+    def run(self, func, *args, on_done=None, on_error=None, on_progress=None, pass_task=False):
+        """Call func(*args) on a worker; with pass_task=True the Task is passed first"""
+        task = Task(on_done, on_error, on_progress)
+        task._results = self._results
+        self._pending += 1
+        self._executor.submit(self._call, task, func, (task,) + args if pass_task else args)
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_ms, self._poll)
+        return task
+
+    def _call(self, task, func, args):
+        try:
+            self._results.put((task, 'done', func(*args)))
+        except BaseException as e:
+            self._results.put((task, 'error', e))
+
+    def _poll(self):
+        try:
+            self._drain()
+        finally:
+            # Reschedule even if a callback raised, so later results still arrive
+            if self._pending:
+                self.root.after(self.poll_ms, self._poll)
+            else:
+                self._polling = False
+
+    def _drain(self):
+        while True:
+            try:
+                task, kind, value = self._results.get_nowait()
+            except queue.Empty:
+                return
+            if kind == 'progress':
+                if not task.cancelled:
+                    task.on_progress(*value)
+                continue
+            self._pending -= 1
+            if task.cancelled:
+                continue
+            if kind == 'done':
+                if task.on_done is not None:
+                    task.on_done(value)
+            elif task.on_error is not None:
+                task.on_error(value)
+
+    @property
+    def busy(self):
+        return self._pending > 0
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,167 @@
+import random
+from itertools import accumulate
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# --- Synthetic Workloads ---
+# Each generator returns a list of n page ids in 1..pages drawn from an RNG
+# seeded with `seed`, so runs are reproducible. With NumPy installed the
+# draws are vectorized; the pure Python fallback draws from the same
+# distribution but not the same stream, so keep the backend in mind when
+# comparing runs (the benchmarks record the NumPy version).
+def _zipf_ranks(rng, n, size, alpha):
+    """n ranks in 0..size-1 where rank k has probability proportional to 1 / (k + 1)**alpha"""
+    if np is not None:
+        cdf = np.cumsum(1.0 / np.arange(1, size + 1) ** alpha)
+        ranks = np.searchsorted(cdf / cdf[-1], rng.random(n), side="right")
+        return np.minimum(ranks, size - 1)
+    weights = list(accumulate(1 / k ** alpha for k in range(1, size + 1)))
+    return rng.choices(range(size), cum_weights=weights, k=n)
+
+
+def _rng(seed):
+    return np.random.default_rng(seed) if np is not None else random.Random(seed)
+
+
+def uniform(n, pages, seed=0):
+    """Every page equally likely"""
+    rng = _rng(seed)
+    if np is not None:
+        return rng.integers(1, pages + 1, size=n).tolist()
+    return [rng.randint(1, pages) for _ in range(n)]
+
+
+def zipf(n, pages, alpha=1.0, seed=0):
+    """Page k is referenced with probability proportional to 1 / k**alpha"""
+    ranks = _zipf_ranks(_rng(seed), n, pages, alpha)
+    if np is not None:
+        return (ranks + 1).tolist()
+    return [rank + 1 for rank in ranks]
+
+
+def looping(n, pages, loop=None):
+    """Cycle over the first `loop` pages (default: an eighth of them).
+
+    LRU and FIFO fault on every reference once the loop is longer than the
+    frame count, while OPT keeps most of it resident.
+    """
+    loop = min(loop or max(1, pages // 8), pages)
+    return [i % loop + 1 for i in range(n)]
+
+
+def scan(n, pages):
+    """One sequential pass over every page after another"""
+    return [i % pages + 1 for i in range(n)]
+
+
+def working_set_shift(n, pages, working_set=16, phase=1000, seed=0):
+    """Uniform references within a working set that moves to new pages every `phase` references"""
+    rng = _rng(seed)
+    working_set = min(working_set, pages)
+    if np is not None:
+        bases = rng.integers(0, pages - working_set + 1, size=-(-n // phase))
+        return (np.repeat(bases, phase)[:n] + rng.integers(1, working_set + 1, size=n)).tolist()
+    ids = []
+    while len(ids) < n:
+        base = rng.randrange(pages - working_set + 1)
+        ids.extend(base + rng.randint(1, working_set) for _ in range(min(phase, n - len(ids))))
+    return ids
+
+
+def locality(n, pages, spread=8.0, jump=0.01, seed=0):
+    """Spatial locality: references scatter around a centre page with standard deviation
+    `spread`, and the centre jumps to a random page with probability `jump` per reference.
+    """
+    rng = _rng(seed)
+    if np is not None:
+        segments = np.cumsum(rng.random(n) < jump)
+        centres = rng.integers(0, pages, size=int(segments[-1]) + 1 if n else 1)
+        offsets = np.rint(rng.normal(0.0, spread, size=n)).astype(np.int64)
+        return ((centres[segments] + offsets) % pages + 1).tolist()
+    ids = []
+    centre = rng.randrange(pages)
+    for _ in range(n):
+        if rng.random() < jump:
+            centre = rng.randrange(pages)
+        ids.append((centre + round(rng.gauss(0.0, spread))) % pages + 1)
+    return ids
+
+
+def phase_change(n, pages, phases=8, working_set=64, alpha=1.0, seed=0):
+    """Program phases: each draws Zipf references from its own random working set.
+
+    Phase lengths are exponentially distributed around n / phases, so
+    transitions come at irregular points as they do in real programs.
+    """
+    rng = _rng(seed)
+    working_set = min(working_set, pages)
+    ranks = _zipf_ranks(rng, n, working_set, alpha)
+    if np is not None:
+        lengths = rng.exponential(1.0, size=phases)
+        ends = np.rint(np.cumsum(lengths) / lengths.sum() * n)
+        phase_of = np.minimum(np.searchsorted(ends, np.arange(n), side="right"), phases - 1)
+        sets = np.stack([rng.choice(pages, working_set, replace=False) for _ in range(phases)])
+        return (sets[phase_of, ranks] + 1).tolist()
+    lengths = [rng.expovariate(1.0) for _ in range(phases)]
+    total = sum(lengths)
+    ends = [round(edge / total * n) for edge in accumulate(lengths)]
+    ids, start = [], 0
+    for end in ends:
+        pages_in_phase = rng.sample(range(1, pages + 1), working_set)
+        ids.extend(pages_in_phase[rank] for rank in ranks[start:end])
+        start = end
+    return ids
+
+
+def scan_pollution(n, pages, hot=64, alpha=1.0, scan_every=1000, scan_length=256, seed=0):
+    """Zipf references to `hot` pages, interrupted every `scan_every` references by a
+    sequential scan of `scan_length` cold pages. Scans flush LRU and FIFO; LFU and
+    ARC are meant to keep the hot set.
+    """
+    if hot >= pages:
+        raise ValueError("scan_pollution needs more pages than the hot set")
+    cold = pages - hot
+    period = scan_every + scan_length
+    ranks = _zipf_ranks(_rng(seed), n, hot, alpha)
+    if np is not None:
+        index = np.arange(n)
+        within = index % period
+        scanned = (index // period) * scan_length + within - scan_every
+        return np.where(within >= scan_every, hot + 1 + scanned % cold, ranks + 1).tolist()
+    ids = []
+    for i, rank in enumerate(ranks):
+        within = i % period
+        if within >= scan_every:
+            ids.append(hot + 1 + ((i // period) * scan_length + within - scan_every) % cold)
+        else:
+            ids.append(rank + 1)
+    return ids
+
+
+WORKLOADS = {
+    'uniform': uniform,
+    'zipf': zipf,
+    'looping': looping,
+    'scan': scan,
+    'working_set_shift': working_set_shift,
+    'locality': locality,
+    'phase_change': phase_change,
+    'scan_pollution': scan_pollution,
+}
+
+
+def generate(name, n, pages, **options):
+    try:
+        workload = WORKLOADS[name]
+    except KeyError:
+        raise ValueError(f"Unknown workload: {name!r}") from None
+    return workload(n, pages, **options)
+
+
+def filenames(page_ids, pattern="file{}.txt"):
+    """Turn page ids into file names, for driving the analyzer through process_page"""
+    return [pattern.format(page_id) for page_id in page_ids]
@@ -0,0 +1,44 @@
+import random
+
+import pytest
+
+from pagefault.analyzer import PageFaultAnalyzer
+from pagefault.batch import cross_check, simulate
+from pagefault.policies import POLICIES, make_policy
+
+
+def references(n=2000, pages=25, seed=11):
+    rng = random.Random(seed)
+    return [rng.randint(1, pages) for _ in range(n)]
+
+
+@pytest.mark.parametrize("name", list(POLICIES))
+def test_batch_matches_scalar_analyzer(name):
+    # Runs of repeats exercise the vectorised run detection
+    ids = [page for page in references() for _ in range(1 + page % 3)]
+    assert cross_check(ids, name, 6) is None
+    if name != "opt":
+        policy = make_policy(name, 6)
+        assert simulate(ids, name, 6).get_stats()['faults'] == sum(not policy.access(page) for page in ids)
+
+
+@pytest.mark.parametrize("frames", [1, 2, 5, 30])
+def test_clock_loop_matches_policy(frames):
+    ids = references(3000, 40, seed=frames)
+    assert cross_check(ids, "clock", frames) is None
+    assert cross_check(tuple(ids), "clock", frames) is None
+
+
+def test_result_vectors():
+    result = simulate([1, 2, 1, 3, 1], "lru", 2)
+    assert [bool(hit) for hit in result.hits] == [False, False, True, False, True]
+    assert [bool(fault) for fault in result.faults] == [True, True, False, True, False]
+    assert result.get_stats()['frames'] == [3, 1]
+
+
+def test_analyzer_simulate_leaves_live_state_alone():
+    analyzer = PageFaultAnalyzer(3, log_path=None, policy="clock")
+    analyzer.process_page("a.txt", "READ")
+    result = analyzer.simulate(["a.txt", "b.txt", "a.txt"])
+    assert result.get_stats()['hits'] == 1
+    assert analyzer.get_stats()['total'] == 1
@@ -0,0 +1,69 @@
+import pytest
+
+from pagefault.analyzer import PageFaultAnalyzer
+from pagefault.fileops import UserFiles, read_manifest
+
+
+@pytest.fixture
+def files(tmp_path):
+    return UserFiles(str(tmp_path / "alice"), PageFaultAnalyzer(8, log_path=None), indexed=True)
+
+
+def test_read_manifest(tmp_path):
+    path = tmp_path / "manifest.txt"
+    path.write_text("# files to make\na.txt\n\n  b.txt\tfirst line\r\nc.txt\t\n")
+    assert read_manifest(str(path)) == [("a.txt", None), ("b.txt", "first line"), ("c.txt", "")]
+
+
+def test_create_many(files):
+    files.create("taken.txt")
+    result = files.create_many([("a.txt", None), ("b.txt", "hello world"), ("taken.txt", None),
+                                ("../up.txt", None)], workers=3)
+    assert result['done'] == ["a.txt", "b.txt"]
+    assert set(result['failed']) == {"taken.txt", "../up.txt"}
+    assert files.read("b.txt") == "hello world\n"
+    assert files.search_all("world") == {'b.txt': [1]}
+    ops = [entry[1] for entry in files.analyzer.page_history]
+    assert ops.count("CREATE") == 3 and ops.count("WRITE") == 1
+
+
+def test_import_directory(files, tmp_path):
+    source = tmp_path / "source"
+    source.mkdir()
+    for i in range(20):
+        (source / f"f{i}.txt").write_text(f"note {i}\n")
+    (source / "skip.log").write_text("no\n")
+    files.create("f0.txt")
+    result = files.import_directory(str(source), "*.txt")
+    assert len(result['done']) == 19 and list(result['failed']) == ["f0.txt"]
+    assert files.search_all("note") == {f"f{i}.txt": [1] for i in range(1, 20)}
+    result = files.import_directory(str(source), "f0.txt", overwrite=True)
+    assert result['done'] == ["f0.txt"] and files.read("f0.txt") == "note 0\n"
+
+
+def test_delete_glob(files):
+    files.create_many([(f"tmp{i}.txt", "x") for i in range(5)] + [("keep.txt", "x")])
+    assert files.match("tmp*") == [f"tmp{i}.txt" for i in range(5)]
+    assert files.delete_glob("tmp*")['done'] == [f"tmp{i}.txt" for i in range(5)]
+    assert files.match("*") == ["keep.txt"]
+    assert files.search_all("x") == {'keep.txt': [1]}
+
+
+def test_batch_is_one_analyzer_call(files, monkeypatch):
+    calls = []
+    process_batch = files.analyzer.process_batch
+    monkeypatch.setattr(files.analyzer, "process_batch", lambda refs: calls.append(len(refs)) or process_batch(refs))
+    files.create_many([(f"f{i}.txt", "x") for i in range(50)])
+    assert calls == [100]
+
+
+def test_cancel_records_what_finished(files):
+    def progress(done, total):
+        if done == 3:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        files.create_many([(f"f{i}.txt", None) for i in range(200)], workers=1, progress=progress)
+    created = files.match("*")
+    assert 3 <= len(created) < 200
+    assert [entry[1] for entry in files.analyzer.page_history].count("CREATE") == len(created)
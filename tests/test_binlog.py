@@ -0,0 +1,70 @@
+import struct
+
+import pytest
+
+from pagefault.binlog import (HEADER, MAGIC, NO_PAGE, RECORD, RECORDS, BinaryTrace, BinaryTraceWriter,
+                              is_binary_trace, names_path)
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "trace.bin")
+    writer = BinaryTraceWriter(path, buffer_size=64)
+    writer.write(1.0, "READ", "a.txt", 5, True)
+    writer.write(2.0, "WRITE", "b.txt", (6, 2), False)
+    writer.write(3.0, "BOGUS", None, 5, True)
+    writer.close()
+    assert is_binary_trace(path)
+    assert writer.position() == (3, 1.0)
+    with BinaryTrace(path) as trace:
+        assert len(trace) == 3
+        assert list(trace) == [(5, "READ", "a.txt"), ((6, 2), "WRITE", "b.txt"), (5, "REF", None)]
+        assert list(trace.page_ids()) == [5, 6, 5]
+        assert [record[0] for record in trace.iter_records(1)] == [2.0, 3.0]
+
+
+def test_reopening_appends(tmp_path):
+    path = str(tmp_path / "trace.bin")
+    first = BinaryTraceWriter(path)
+    first.write(1.0, "READ", "a.txt", 1, False)
+    first.close()
+    second = BinaryTraceWriter(path)
+    second.write(2.0, "READ", "a.txt", 1, True)
+    second.write(3.0, "READ", "c.txt", 2, False)
+    second.close()
+    with BinaryTrace(path) as trace:
+        assert [filename for _, _, filename in trace] == ["a.txt", "a.txt", "c.txt"]
+    assert open(names_path(path)).read() == "a.txt\nc.txt\n"
+
+
+def write_v1(path, records, torn=False):
+    old = RECORDS[1]
+    data = HEADER.pack(MAGIC, 1, old.size, 0) + b"".join(old.pack(*record) for record in records)
+    with open(path, "wb") as f:
+        f.write(data + (b"\0" * 5 if torn else b""))
+    with open(names_path(path), "w") as f:
+        f.write("a.txt\n")
+
+
+def test_version_1_trace_is_upgraded_when_opened_for_writing(tmp_path):
+    path = str(tmp_path / "trace.bin")
+    records = [(float(i), i + 1, 0, 4, i % 2) for i in range(10000)]
+    write_v1(path, records, torn=True)
+    with BinaryTrace(path) as trace:
+        assert trace.version == 1 and len(trace) == 10000
+    writer = BinaryTraceWriter(path)
+    writer.write(99.0, "READ", "a.txt", (3, 1), True)
+    writer.close()
+    with open(path, "rb") as f:
+        assert HEADER.unpack(f.read(HEADER.size))[1:3] == (2, RECORD.size)
+    with BinaryTrace(path) as trace:
+        assert len(trace) == 10001
+        assert list(trace.iter_records(9999)) == [(9999.0, 10000, 0, 4, 1, NO_PAGE), (99.0, 3, 0, 4, 1, 1)]
+
+
+def test_foreign_file_is_refused(tmp_path):
+    path = tmp_path / "trace.bin"
+    path.write_bytes(struct.pack("<8sHHI", b"NOTTRACE", 2, RECORD.size, 0))
+    with pytest.raises(ValueError):
+        BinaryTraceWriter(str(path))
+    with pytest.raises(ValueError):
+        BinaryTrace(str(path))
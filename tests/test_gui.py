@@ -0,0 +1,11 @@
+import pytest
+
+gui = pytest.importorskip("pagefault.gui")
+
+
+@pytest.mark.parametrize("argv", [["bogus"], ["lru", "4k"], ["lru", "0"]])
+def test_bad_arguments_are_usage_errors(argv):
+    # Rejected before Tk starts, so no display is needed
+    with pytest.raises(SystemExit) as exit_info:
+        gui.main(argv)
+    assert str(exit_info.value).startswith("usage:")
@@ -0,0 +1,67 @@
+import pytest
+
+from pagefault.history import HistoryRing, StringInterner
+
+
+def filled(capacity, count, files=None):
+    ring = HistoryRing(capacity)
+    for i in range(count):
+        ring.append(i, "READ" if i % 3 else "WRITE", f"f{i % files if files else i}.txt", i % 2, float(i))
+    return ring
+
+
+def test_keeps_only_the_newest_entries():
+    ring = filled(4, 10)
+    assert len(ring) == 4
+    assert ring.first == 6
+    assert [entry[0] for entry in ring] == [6, 7, 8, 9]
+    assert ring[-1] == (9, "WRITE", "f9.txt", "Hit")
+    assert ring.last(2) == list(ring)[-2:]
+    assert ring.window(0, 8) == list(ring)[:2]
+    assert [entry[0] for entry in ring.since(8.0)] == [8, 9]
+    with pytest.raises(IndexError):
+        ring[4]
+
+
+def test_counts_and_groups():
+    ring = filled(6, 20, files=2)
+    assert ring.counts() == (3, 3)
+    assert ring.counts(2) == (1, 1)
+    assert ring.by_file() == {'f0.txt': (0, 3), 'f1.txt': (3, 0)}
+    assert sum(sum(pair) for pair in ring.by_operation().values()) == 6
+
+
+def test_page_keys_round_trip():
+    ring = HistoryRing(2)
+    ring.append((5, 3), "READ", "a.txt", True)
+    assert ring[0][0] == (5, 3)
+
+
+def test_filenames_of_overwritten_slots_are_dropped():
+    ring = filled(10, 5000)
+    assert len(ring.files) == 10
+    assert len(ring.files.names) <= 11
+    assert len(ring.state()['files']) == 10
+
+
+def test_interner_reuses_released_ids():
+    names = StringInterner()
+    a = names.intern("a")
+    assert names.intern("a") == a
+    names.release(a)
+    assert len(names) == 1
+    names.release(a)
+    assert len(names) == 0
+    assert names.intern("b") == a
+
+
+@pytest.mark.parametrize("capacity", [3, 10, 20])
+def test_state_round_trip(capacity):
+    ring = filled(10, 57, files=13)
+    copy = HistoryRing(capacity)
+    copy.restore(ring.state())
+    assert list(copy) == list(ring)[-capacity:]
+    ring.append(99, "READ", "new.txt", True)
+    copy.append(99, "READ", "new.txt", True)
+    assert list(copy)[-1] == list(ring)[-1]
+    assert len(copy.files) == len(set(entry[2] for entry in copy))
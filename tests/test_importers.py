@@ -0,0 +1,93 @@
+from collections import Counter
+
+import pytest
+
+from pagefault.importers import detect_format, import_records, page_records, parse_blktrace, parse_strace
+from pagefault.workloads import WORKLOADS, filenames, generate
+
+STRACE = """\
+1200  openat(AT_FDCWD, "/data/a.txt", O_RDONLY) = 3
+1200  read(3, "hello"..., 4096) = 4096
+1200  read(3, "", 4096) = 100
+1200  lseek(3, 0, SEEK_SET) = 0
+1200  dup(3) = 4
+1200  read(4, "x", 10) = 10
+1201  openat(AT_FDCWD, "/data/b.txt", O_WRONLY|O_CREAT, 0644 <unfinished ...>
+1200  close(3) = 0
+1201  <... openat resumed>) = 3
+1201  pwrite64(3, "a, b", 4, 8192) = 4
+1201  write(7</data/c.txt>, "z", 1) = 1
+1201  openat(AT_FDCWD, "/missing", O_RDONLY) = -1 ENOENT (No such file or directory)
+1201  read(5<pipe:[123]>, "", 10) = 10
+1201  unlink("/data/b.txt") = 0
++++ exited with 0 +++
+"""
+
+BLKTRACE = """\
+  8,0    3        1     0.000000000   697  Q   R 2048 + 16 [cat]
+  8,0    3        2     0.000001000   697  D   R 2048 + 16 [cat]
+  8,0    3        3     0.000002000   697  Q  WS 4096 + 8 [sync]
+  8,0    3        4     0.000003000   697  Q  FN 0 + 0 [sync]
+  8,0    3        5     0.000004000   697  Q   D 100 + 8 [fstrim]
+"""
+
+
+def test_parse_strace():
+    assert list(parse_strace(STRACE.splitlines(True))) == [
+        ("READ", "/data/a.txt", 0, 4096),
+        ("READ", "/data/a.txt", 4096, 100),
+        ("READ", "/data/a.txt", 0, 10),
+        ("WRITE", "/data/b.txt", 8192, 4),
+        ("WRITE", "/data/c.txt", 0, 1),
+        ("DELETE", "/data/b.txt", 0, 0),
+    ]
+
+
+def test_parse_blktrace():
+    assert list(parse_blktrace(BLKTRACE.splitlines())) == [
+        ("READ", "8,0", 2048 * 512, 16 * 512),
+        ("WRITE", "8,0", 4096 * 512, 8 * 512),
+    ]
+    assert [ref[0] for ref in parse_blktrace(BLKTRACE.splitlines(), actions=("D",))] == ["READ"]
+
+
+def test_detect_format():
+    assert detect_format(STRACE.splitlines()) == "strace"
+    assert detect_format(["# comment", BLKTRACE.splitlines()[0]]) == "blktrace"
+    assert detect_format(["2025-05-17 12:00:00 | Operation: READ | File: a | Page ID: 3 | Hit"]) is None
+
+
+def test_page_records():
+    ids = {'a': 1, 'b': 2}.get
+    references = [("READ", "a", 4000, 200), ("WRITE", "b", 0, 0)]
+    assert list(page_records(references, None, ids)) == [(1, "READ", "a"), (2, "WRITE", "b")]
+    assert list(page_records(references, 4096, ids)) == [((1, 0), "READ", "a"), ((1, 1), "READ", "a"),
+                                                         ((2, 0), "WRITE", "b")]
+
+
+def test_block_traces_are_always_paged():
+    records = list(import_records(BLKTRACE.splitlines(), "blktrace", page_id_for=lambda name: 9))
+    assert records[0] == ((9, 256), "READ", "8,0")
+    assert len(records) == 3
+    with pytest.raises(ValueError):
+        import_records([], "dtrace")
+
+
+@pytest.mark.parametrize("name", list(WORKLOADS))
+def test_workloads_are_reproducible_and_in_range(name):
+    options = {} if name in ("looping", "scan") else {'seed': 3}
+    trace = generate(name, 5000, 200, **options)
+    assert len(trace) == 5000
+    assert min(trace) >= 1 and max(trace) <= 200
+    assert trace == generate(name, 5000, 200, **options)
+
+
+def test_zipf_favours_low_pages():
+    counts = Counter(generate("zipf", 20000, 100, alpha=1.2))
+    assert counts[1] > counts[2] > counts[50]
+    assert filenames([1, 2]) == ["file1.txt", "file2.txt"]
+
+
+def test_unknown_workload():
+    with pytest.raises(ValueError):
+        generate("bursty", 10, 10)
@@ -0,0 +1,79 @@
+import os
+
+import pytest
+
+from pagefault import largefile
+from pagefault.largefile import MAX_ROW, MappedFile, read_range, replace_range, write_atomic
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "data.txt"
+    path.write_bytes(bytes(range(256)) * 40)
+    os.chmod(path, 0o640)
+    return path
+
+
+@pytest.mark.parametrize("offset, length, data", [
+    (0, 5, b"HELLO"), (100, 10, b""), (5000, 0, b"inserted" * 300), (10000, 240, b"tail"), (0, 10240, b"all"),
+])
+def test_replace_range_matches_slicing(data_file, monkeypatch, offset, length, data):
+    monkeypatch.setattr(largefile, "COPY_CHUNK", 1000)
+    original = data_file.read_bytes()
+    in_place = replace_range(str(data_file), offset, length, data)
+    assert in_place == (len(data) == length)
+    assert data_file.read_bytes() == original[:offset] + data + original[offset + length:]
+    assert os.stat(data_file).st_mode & 0o777 == 0o640
+    assert os.listdir(data_file.parent) == ["data.txt"]
+    assert read_range(str(data_file), offset, len(data)) == data
+
+
+def test_replace_range_outside_file(data_file):
+    with pytest.raises(ValueError):
+        replace_range(str(data_file), 10230, 20, b"x")
+    with pytest.raises(ValueError):
+        replace_range(str(data_file), -1, 1, b"x")
+
+
+def test_write_atomic(tmp_path):
+    path = tmp_path / "a.txt"
+    write_atomic(str(path), "text\n")
+    write_atomic(str(path), b"bytes")
+    assert path.read_bytes() == b"bytes"
+    assert os.listdir(tmp_path) == ["a.txt"]
+
+
+def test_mapped_rows(tmp_path):
+    path = tmp_path / "rows.txt"
+    long_line = "x" * (MAX_ROW + 10)
+    path.write_text(f"one\r\ntwo\n{long_line}\nlast")
+    with MappedFile(str(path)) as mapped:
+        rows = mapped.rows(0, 10)
+        assert [text for _, _, text in rows] == ["one", "two", "x" * MAX_ROW, "x" * 10, "last"]
+        starts = [start for start, _, _ in rows]
+        assert mapped.next_row(0, 2) == starts[2]
+        assert mapped.next_row(0, 99) == starts[-1]
+        assert mapped.previous_row(starts[2], 2) == starts[0]
+        assert mapped.previous_row(starts[1], 5) == 0
+        assert mapped.row_start(starts[1] + 2) == starts[1]
+
+
+def test_mapped_file_closed_flag(tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_text("first\n")
+    mapped = MappedFile(str(path))
+    assert not mapped.closed
+    mapped.close()
+    assert mapped.closed
+    path.write_text("first\nsecond\n")
+    mapped.refresh()
+    assert not mapped.closed
+    assert [text for _, _, text in mapped.rows(0, 5)] == ["first", "second"]
+    mapped.close()
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_text("")
+    with MappedFile(str(path)) as mapped:
+        assert mapped.rows(0, 5) == [] and mapped.next_row(0) == 0 and mapped.previous_row(0) == 0
@@ -0,0 +1,69 @@
+import threading
+
+import pytest
+
+from pagefault.logbuffer import BufferedLogWriter, format_record
+
+
+def record(i, thread=0):
+    return (1747483200.0 + i, "READ", f"t{thread}.txt", i, "Hit" if i % 2 else "Page Fault")
+
+
+def test_format_record():
+    line = format_record((1747483200.0, "WRITE", "a.txt", (7, 2), "Page Fault"))
+    assert line.endswith(" | Operation: WRITE | File: a.txt | Page ID: 7:2 | Page Fault\n")
+
+
+def test_flush_and_close_write_everything(tmp_path):
+    path = tmp_path / "log.txt"
+    writer = BufferedLogWriter(str(path), batch_size=8)
+    for i in range(20):
+        writer.write(record(i))
+    writer.flush()
+    assert path.read_text() == "".join(format_record(record(i)) for i in range(20))
+    writer.write_many([record(i) for i in range(20, 25)])
+    writer.close()
+    assert path.read_text().count("\n") == 25
+    assert writer.written == 25
+
+
+def test_write_after_close_is_refused(tmp_path):
+    writer = BufferedLogWriter(str(tmp_path / "log.txt"))
+    writer.write(record(0))
+    writer.close()
+    with pytest.raises(ValueError):
+        writer.write(record(1))
+    with pytest.raises(ValueError):
+        writer.write_many([record(2)])
+    assert writer._thread is None
+
+
+def test_idle_flush_waits_for_queued_batches(tmp_path):
+    # The writer thread must not write pending records ahead of an older queued batch
+    writer = BufferedLogWriter(str(tmp_path / "log.txt"))
+    writer._queue.put([record(0)])
+    writer._pending = [record(1)]
+    assert writer._take_idle_pending() == []
+    writer._queue.get()
+    assert writer._take_idle_pending() == [record(1)]
+
+
+def test_concurrent_writers_keep_their_order(tmp_path):
+    path = tmp_path / "log.txt"
+    writer = BufferedLogWriter(str(path), batch_size=16, max_pending=64, flush_interval=0.01)
+
+    def produce(thread):
+        for i in range(2000):
+            writer.write(record(i, thread))
+
+    threads = [threading.Thread(target=produce, args=(thread,)) for thread in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    writer.close()
+    lines = path.read_text().splitlines()
+    assert len(lines) == 8000
+    for thread in range(4):
+        ids = [int(line.split("Page ID: ")[1].split()[0]) for line in lines if f"t{thread}.txt" in line]
+        assert ids == list(range(2000))
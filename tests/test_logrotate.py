@@ -0,0 +1,97 @@
+import gzip
+import time
+
+from pagefault import cli, logrotate
+from pagefault.logbuffer import BufferedLogWriter, format_record
+
+START = time.mktime((2025, 5, 17, 12, 0, 0, 0, 0, -1))
+
+
+def write_log(path, count, step=1.0, max_bytes=20000):
+    writer = BufferedLogWriter(str(path), batch_size=64, max_bytes=max_bytes)
+    records = [(START + i * step, "READ", f"file{i % 9}.txt", i % 50 + 1, "Hit" if i % 3 else "Page Fault")
+               for i in range(count)]
+    for record in records:
+        writer.write(record)
+    writer.close()
+    return [format_record(record) for record in records]
+
+
+def expected(lines, start, end):
+    return [line for line in lines
+            if (start is None or logrotate.parse_stamp(line) >= start)
+            and (end is None or logrotate.parse_stamp(line) <= end)]
+
+
+def test_rotates_and_compresses(tmp_path):
+    path = tmp_path / "log.txt"
+    lines = write_log(path, 3000)
+    segments = logrotate.segments(str(path))
+    assert len(segments) > 1
+    assert all(name.endswith(".gz") for name in segments.values())
+    assert logrotate.read_index(str(path))
+    # Segments stay readable as ordinary gzip files
+    text = "".join(gzip.open(name, "rt").read() for name in segments.values())
+    assert text + path.read_text() == "".join(lines)
+
+
+def test_query_matches_brute_force(tmp_path):
+    path = tmp_path / "log.txt"
+    lines = write_log(path, 3000)
+    for start, end in [(None, None), (START + 100, START + 200), (START + 1500, None),
+                       (None, START + 10), (START + 2990, START + 5000), (START - 50, START - 1)]:
+        assert list(logrotate.query(str(path), start, end)) == expected(lines, start, end)
+
+
+def test_query_without_rotation(tmp_path):
+    path = tmp_path / "log.txt"
+    lines = write_log(path, 2000, step=0.25, max_bytes=None)
+    assert not logrotate.segments(str(path))
+    assert list(logrotate.query(str(path), START + 100, START + 120)) == expected(lines, START + 100, START + 120)
+
+
+def test_missing_index_is_rebuilt(tmp_path):
+    path = tmp_path / "log.txt"
+    lines = write_log(path, 3000)
+    (tmp_path / "log.txt.idx").unlink()
+    logrotate.LogRotator(str(path), max_bytes=20000).wait()
+    assert list(logrotate.query(str(path), START + 500, START + 700)) == expected(lines, START + 500, START + 700)
+
+
+def test_rotation_by_age():
+    rotator = logrotate.LogRotator("unused.txt", max_age=60)
+    now = time.time()
+    assert not rotator.due(0, now - 120)
+    assert not rotator.due(100, now - 30)
+    assert rotator.due(100, now - 120)
+    assert logrotate.LogRotator("unused.txt", max_bytes=150).due(100, now, 60)
+
+
+def test_interrupted_compression_is_finished(tmp_path):
+    path = tmp_path / "log.txt"
+    lines = write_log(path, 3000)
+    # A segment rotated just before a crash, never compressed
+    number = max(logrotate.segments(str(path))) + 1
+    path.rename(logrotate.segment_path(str(path), number, compressed=False))
+    logrotate.LogRotator(str(path), max_bytes=20000).wait()
+    assert logrotate.segments(str(path))[number].endswith(".gz")
+    assert list(logrotate.query(str(path))) == lines
+
+
+def test_truncate_drops_segments(tmp_path):
+    path = tmp_path / "log.txt"
+    write_log(path, 3000)
+    writer = BufferedLogWriter(str(path), max_bytes=20000)
+    writer.truncate()
+    writer.close()
+    assert not logrotate.segments(str(path))
+    assert list(logrotate.query(str(path))) == []
+
+
+def test_query_command(tmp_path, capsys):
+    path = tmp_path / "log.txt"
+    lines = write_log(path, 3000)
+    since = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(START + 100))
+    cli.main(["query", str(path), "--since", since, "--until", str(START + 199), "--faults", "--count"])
+    faults = [line for line in expected(lines, START + 100, START + 199) if line.rstrip().endswith("| Page Fault")]
+    assert capsys.readouterr().out == f"{len(faults)}\n"
@@ -0,0 +1,77 @@
+import random
+
+from pagefault.analyzer import PageFaultAnalyzer
+from pagefault.metrics import ReferenceMetrics
+
+
+def feed(metrics, keys, start=0):
+    for t, key in enumerate(keys, start):
+        metrics.record(key, "READ" if t % 4 else "WRITE", f"f{key % 5}.txt", t % 3 == 0, float(t))
+
+
+def keys(n=3000, pages=60, seed=2):
+    rng = random.Random(seed)
+    return [rng.randint(1, pages) for _ in range(n)]
+
+
+def test_working_set_and_reuse_match_brute_force():
+    trace = keys()
+    metrics = ReferenceMetrics(window=50)
+    sizes = []
+    for t, key in enumerate(trace):
+        metrics.record(key, "READ", "a.txt", False, float(t))
+        sizes.append(metrics.working_set)
+        assert metrics.working_set == len(set(trace[max(0, t - 49):t + 1]))
+    buckets, last = {}, {}
+    for t, key in enumerate(trace):
+        if key in last:
+            bucket = (t - last[key]).bit_length() - 1
+            buckets[bucket] = buckets.get(bucket, 0) + 1
+        last[key] = t
+    assert {(1 << b, (2 << b) - 1, count) for b, count in buckets.items()} == set(metrics.reuse_histogram())
+    stats = metrics.get_stats()
+    assert stats['cold'] == len(set(trace))
+    assert stats['working_set_peak'] == max(sizes)
+    assert abs(stats['working_set_mean'] - sum(sizes) / len(sizes)) < 1e-9
+
+
+def test_fault_counters():
+    metrics = ReferenceMetrics()
+    feed(metrics, [1, 2, 3, 4, 5, 6])
+    stats = metrics.get_stats()
+    assert stats['operations']['WRITE'] == {'references': 2, 'faults': 1, 'fault_rate': 50.0}
+    assert stats['operations']['READ']['faults'] == 3
+    assert stats['inter_arrival']['count'] == 3
+    assert stats['inter_arrival']['mean_references'] == 4 / 3
+
+
+def test_tables_stay_bounded():
+    metrics = ReferenceMetrics(window=10, max_pages=100, max_files=8)
+    for t in range(50000):
+        metrics.record(t, "READ", f"f{t}.txt", False, float(t))
+    assert len(metrics._last_use) == 100
+    assert len(metrics.file_faults) <= 16
+    metrics.record(49950, "READ", "x", True, 0.0)
+    assert metrics.cold == 50000
+    metrics.record(0, "READ", "x", True, 0.0)
+    assert metrics.cold == 50001
+
+
+def test_state_round_trip():
+    trace = keys()
+    original = ReferenceMetrics(window=40, max_pages=30, max_files=3)
+    feed(original, trace[:2000])
+    copy = ReferenceMetrics(window=40, max_pages=30, max_files=3)
+    copy.restore(original.state())
+    feed(original, trace[2000:], 2000)
+    feed(copy, trace[2000:], 2000)
+    assert copy.get_stats() == original.get_stats()
+
+
+def test_analyzer_metrics_are_opt_in():
+    analyzer = PageFaultAnalyzer(4, log_path=None)
+    analyzer.process_page("a.txt", "READ")
+    assert analyzer.metrics is None and analyzer.get_stats()['metrics'] is None
+    analyzer = PageFaultAnalyzer(4, log_path=None, working_set_window=10)
+    analyzer.process_page("a.txt", "READ")
+    assert analyzer.get_stats()['metrics']['cold'] == 1
@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+from pagefault.analyzer import PageFaultAnalyzer
+from pagefault.fileops import UserFiles
+from pagefault.pagecache import ContentCache
+
+
+def make_file(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+def test_hits_and_misses(tmp_path):
+    cache = ContentCache(byte_budget=1000)
+    path = make_file(tmp_path, "a.txt", "hello")
+    assert cache.read(path) == "hello"
+    assert cache.read(path) == "hello"
+    assert cache.peek(path) == "hello"
+    stats = cache.get_stats()
+    assert (stats['hits'], stats['misses'], stats['entries'], stats['bytes']) == (2, 1, 1, 5)
+
+
+def test_external_edit_is_not_served_stale(tmp_path):
+    cache = ContentCache()
+    path = make_file(tmp_path, "a.txt", "old")
+    cache.read(path)
+    with open(path, "w") as f:
+        f.write("new")
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert cache.read(path) == "new"
+    assert cache.hits == 0
+
+
+def test_invalidate_drops_entry(tmp_path):
+    cache = ContentCache()
+    path = make_file(tmp_path, "a.txt", "text")
+    cache.read(path)
+    cache.invalidate(path)
+    assert cache.get_stats()['entries'] == 0 and cache.bytes == 0
+    assert cache.peek(path) is None
+
+
+@pytest.mark.parametrize("policy", ["lru", "fifo", "clock", "lfu", "arc"])
+def test_budgets_are_enforced(tmp_path, policy):
+    cache = ContentCache(policy, byte_budget=25, max_entries=3)
+    paths = [make_file(tmp_path, f"f{i}.txt", "x" * 10) for i in range(6)]
+    for path in paths:
+        cache.read(path)
+        assert cache.bytes <= 25 and len(cache._entries) <= 2
+        assert len(cache.policy) == len(cache._entries)
+    big = make_file(tmp_path, "big.txt", "y" * 30)
+    assert cache.read(big) == "y" * 30
+    assert big not in cache._entries
+    assert cache.evictions == 4
+
+
+def test_opt_cannot_drive_a_cache():
+    with pytest.raises(ValueError):
+        ContentCache("opt")
+
+
+def test_user_files_invalidate_on_change(tmp_path):
+    analyzer = PageFaultAnalyzer(4, log_path=None, cache_bytes=1 << 20)
+    files = UserFiles(str(tmp_path / "alice"), analyzer)
+    files.create("a.txt")
+    files.write("a.txt", "one")
+    assert files.read("a.txt") == "one\n"
+    files.write("a.txt", "two")
+    assert files.read("a.txt") == "one\ntwo\n"
+    files.modify("a.txt", "three")
+    assert files.read("a.txt") == "three\n"
+    files.replace_range("a.txt", 0, 5, "THREE")
+    assert files.read("a.txt") == "THREE\n"
+    assert files.search("a.txt", "three") == ["Line 1: THREE"]
+    files.delete("a.txt")
+    assert analyzer.content_cache.get_stats()['entries'] == 0
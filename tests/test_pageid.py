@@ -0,0 +1,48 @@
+import hashlib
+
+import pytest
+
+from pagefault.pageid import (HASH_FUNCTIONS, NO_PAGE, PageIdGenerator, format_page_key, parse_page_key,
+                              split_page_key)
+
+
+def test_default_matches_original_page_ids():
+    generator = PageIdGenerator()
+    for name in ("a.txt", "notes.md", "users_data/alice/report.txt"):
+        base = name.rsplit("/", 1)[-1]
+        assert generator(name) == int(hashlib.md5(base.encode()).hexdigest()[:8], 16) % 100 + 1
+
+
+@pytest.mark.parametrize("hash_name", sorted(HASH_FUNCTIONS))
+def test_ids_stay_in_page_space(hash_name):
+    generator = PageIdGenerator(hash_name, page_space=7)
+    ids = {generator(f"file{i}.txt") for i in range(200)}
+    assert ids <= set(range(1, 8))
+
+
+def test_cache_is_bounded_and_counted():
+    generator = PageIdGenerator(cache_size=2)
+    ids = [generator(name) for name in ("a", "b", "a", "c", "b")]
+    assert ids == [generator._compute(name) for name in ("a", "b", "a", "c", "b")]
+    assert (generator.cache_hits, generator.cache_misses) == (1, 4)
+    assert len(generator._cache) == 2
+
+
+def test_bulk_ids_match_single_ids():
+    generator = PageIdGenerator("crc32", page_space=1000)
+    names = [f"dir/f{i % 37}.txt" for i in range(500)]
+    assert generator.page_ids(names) == [generator(name) for name in names]
+
+
+def test_bad_arguments():
+    with pytest.raises(ValueError):
+        PageIdGenerator("sha1")
+    with pytest.raises(ValueError):
+        PageIdGenerator(page_space=0)
+
+
+def test_page_keys():
+    assert split_page_key(5) == (5, NO_PAGE)
+    assert split_page_key((5, 2)) == (5, 2)
+    assert parse_page_key(format_page_key((17, 3))) == (17, 3)
+    assert parse_page_key(format_page_key(17)) == 17
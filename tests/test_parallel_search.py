@@ -0,0 +1,43 @@
+import pytest
+
+from pagefault.search import ParallelSearch, search_file
+
+
+@pytest.fixture
+def folder(tmp_path):
+    for i in range(40):
+        lines = [f"line {n} of file {i}" + (" needle" if (i + n) % 7 == 0 else "") for n in range(30)]
+        (tmp_path / f"f{i:02}.txt").write_text("\n".join(lines) + "\n")
+    return tmp_path
+
+
+def expected(folder, limit=None):
+    return {path.name: search_file(str(path), "needle", limit)[0] for path in sorted(folder.iterdir())}
+
+
+@pytest.mark.parametrize("processes", [False, True])
+def test_results_match_single_file_search(folder, processes):
+    search = ParallelSearch(str(folder), "NEEDLE", limit_per_file=2, workers=2, processes=processes, group_size=8)
+    results = {filename: matches for filename, _scanned, matches in search.results()}
+    assert results == expected(folder, 2)
+
+
+def test_workers_are_spawned(folder):
+    # Forking a process that runs other threads can hand the child a held lock
+    search = ParallelSearch(str(folder), "needle", workers=2, group_size=8)
+    list(search.results())
+    assert search._executor._mp_context.get_start_method() == "spawn"
+
+
+def test_cancel_stops_results(folder):
+    search = ParallelSearch(str(folder), "needle", workers=1, processes=False, group_size=4)
+    seen = []
+    for result in search.results():
+        seen.append(result)
+        search.cancel()
+    assert len(seen) == 1
+    assert search.cancelled
+
+
+def test_empty_folder(tmp_path):
+    assert list(ParallelSearch(str(tmp_path), "needle").results()) == []
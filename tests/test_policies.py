@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+from pagefault.policies import POLICIES, make_policy
+
+# Silberschatz's reference string with 3 frames; counts and final frames
+# (next victim first) worked out by hand for each policy
+REFERENCES = [7, 0, 1, 2, 0, 3, 0, 4, 2, 3, 0, 3, 2, 1, 2, 0, 1, 7, 0, 1]
+EXPECTED = {
+    'fifo': (15, [7, 0, 1]),
+    'lru': (12, [7, 0, 1]),
+    'opt': (9, [0, 1, 7]),
+    'clock': (14, [0, 7, 1]),
+    'lfu': (11, [1, 2, 0]),
+    'arc': (13, [7, 0, 1]),
+}
+ONLINE = [name for name in POLICIES if name != "opt"]
+
+
+def build(name, capacity, references=()):
+    return make_policy(name, capacity, future=list(references)) if name == "opt" else make_policy(name, capacity)
+
+
+@pytest.mark.parametrize("name", list(POLICIES))
+def test_reference_string(name):
+    policy = build(name, 3, REFERENCES)
+    faults = sum(not policy.access(page) for page in REFERENCES)
+    assert (faults, policy.pages()) == EXPECTED[name]
+
+
+def test_fifo_belady_anomaly():
+    references = [1, 2, 3, 4, 1, 2, 5, 1, 2, 3, 4, 5]
+    faults = {}
+    for frames in (3, 4):
+        policy = make_policy("fifo", frames)
+        faults[frames] = sum(not policy.access(page) for page in references)
+    assert faults == {3: 9, 4: 10}
+
+
+@pytest.mark.parametrize("name", list(POLICIES))
+def test_never_exceeds_capacity(name):
+    rng = random.Random(7)
+    references = [rng.randint(1, 20) for _ in range(2000)]
+    policy = build(name, 5, references)
+    for page in references:
+        policy.access(page)
+        assert len(policy) <= 5
+        assert page in policy
+
+
+@pytest.mark.parametrize("name", ONLINE)
+def test_state_round_trip(name):
+    rng = random.Random(3)
+    references = [rng.randint(1, 12) for _ in range(400)]
+    original = make_policy(name, 4)
+    for page in references[:200]:
+        original.access(page)
+    copy = make_policy(name, 4)
+    copy.restore(original.state())
+    assert [copy.access(page) for page in references[200:]] == [original.access(page) for page in references[200:]]
+    assert copy.pages() == original.pages()
+
+
+def test_opt_cannot_be_saved():
+    with pytest.raises(NotImplementedError):
+        make_policy("opt", 3, future=REFERENCES).state()
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        make_policy("mru", 3)
+
+
+def test_opt_window_sees_resident_pages():
+    # B's next use enters the window while B is resident, so C evicts B
+    policy = make_policy("opt", 2, future=list("ABCAB"), lookahead=1)
+    assert sum(not policy.access(page) for page in "ABCAB") == 4
+
+
+@pytest.mark.parametrize("lookahead", [1, 10, 50])
+def test_opt_window_matches_brute_force(lookahead):
+    rng = random.Random(lookahead)
+    references = [rng.randint(1, 20) for _ in range(3000)]
+    policy = make_policy("opt", 8, future=references, lookahead=lookahead)
+    for i, page in enumerate(references):
+        window = references[i + 1:i + 1 + lookahead]
+        resident = set(policy.pages())
+        policy.access(page)
+        evicted = resident - set(policy.pages())
+        if evicted:
+            distance = {p: window.index(p) if p in window else len(window) for p in resident}
+            assert distance[evicted.pop()] == max(distance.values())
@@ -0,0 +1,112 @@
+import os
+import random
+
+import pytest
+
+from pagefault.analyzer import PageFaultAnalyzer
+from pagefault.fileops import UserFiles
+from pagefault.search import MMAP_WINDOW, InvertedIndex, mmap_search, search_file, search_text, stream_search
+
+WORDS = ["alpha", "Beta", "gamma", "delta", "NEEDLE", "épée"]
+
+
+def sample_text(lines=400, seed=4):
+    rng = random.Random(seed)
+    return "\n".join(" ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 6))) for _ in range(lines)) + "\n"
+
+
+def brute_force(text, keyword, limit=None):
+    matches = [(lineno, line) for lineno, line in enumerate(text.split("\n"), 1) if keyword.lower() in line.lower()]
+    return matches[:limit]
+
+
+def test_search_text():
+    text = sample_text()
+    assert search_text(text, "needle")[0] == brute_force(text, "needle")
+    matches, end = search_text(text, "needle", 3)
+    assert matches == brute_force(text, "needle", 3)
+    assert text[:end].count("\n") == matches[-1][0] - 1 and text[end] == "\n"
+    assert search_text("ÉPÉE x\nno\n", "épée") == ([(1, "ÉPÉE x")], 10)
+
+
+@pytest.mark.parametrize("keyword", ["needle", "beta", "épée", "missing"])
+@pytest.mark.parametrize("chunk_size", [7, 64, 1 << 20])
+def test_stream_search_matches_brute_force(tmp_path, keyword, chunk_size):
+    text = sample_text()
+    path = tmp_path / "a.txt"
+    path.write_text(text, encoding="utf-8")
+    matches, scanned = stream_search(str(path), keyword, chunk_size=chunk_size)
+    assert matches == brute_force(text, keyword)
+    assert scanned == path.stat().st_size
+
+
+@pytest.mark.parametrize("window", [50, 4096])
+def test_mmap_search_matches_brute_force(tmp_path, window):
+    text = sample_text()
+    path = tmp_path / "a.txt"
+    path.write_text(text, encoding="utf-8")
+    assert mmap_search(str(path), "needle", window=window)[0] == brute_force(text, "needle")
+    matches, scanned = mmap_search(str(path), "needle", 2, window=window)
+    assert matches == brute_force(text, "needle", 2)
+    assert scanned < path.stat().st_size
+
+
+def write_big(path):
+    # Larger than one mmap window, so a search that stops early leaves a window unread
+    with open(path, "w") as f:
+        f.write("needle here\n" + "filler line\n" * (MMAP_WINDOW // 12 + 200000))
+    return os.path.getsize(path)
+
+
+def test_limit_stops_reading_early(tmp_path):
+    path = tmp_path / "big.txt"
+    size = write_big(path)
+    for search in (search_file, stream_search):
+        matches, scanned = search(str(path), "needle", 1)
+        assert matches == [(1, "needle here")]
+        assert scanned < size
+
+
+def test_search_records_only_what_was_read(tmp_path):
+    analyzer = PageFaultAnalyzer(64, log_path=None, page_size=4096)
+    files = UserFiles(str(tmp_path / "alice"), analyzer)
+    files.create("big.txt")
+    size = write_big(files.get_full_path("big.txt"))
+    assert files.search("big.txt", "needle", 1) == ["Line 1: needle here"]
+    pages = [entry[0][1] for entry in analyzer.page_history if entry[1] == "SEARCH"]
+    assert pages and max(pages) < size // 4096 - 1
+
+
+def test_inverted_index(tmp_path):
+    folder = tmp_path / "alice"
+    folder.mkdir()
+    (folder / "a.txt").write_text("red fox\nblue whale\n")
+    (folder / "b.txt").write_text("the red whale\n")
+    index = InvertedIndex(str(folder)).build()
+    assert index.lookup("red") == {'a.txt': [1], 'b.txt': [1]}
+    assert index.lookup("Red Whale") == {'b.txt': [1]}
+    assert index.lookup("  ") == {}
+
+    with open(folder / "a.txt", "a") as f:
+        f.write("red whale\n")
+    index.appended("a.txt", "red whale")
+    assert index.lookup("red whale") == {'a.txt': [3], 'b.txt': [1]}
+
+    (folder / "b.txt").write_text("nothing\n")
+    index.replaced("b.txt")
+    assert index.lookup("whale") == {'a.txt': [2, 3]}
+
+    index.removed("a.txt")
+    assert index.lookup("whale") == {}
+
+
+def test_index_refresh_picks_up_outside_changes(tmp_path):
+    folder = tmp_path / "alice"
+    folder.mkdir()
+    (folder / "a.txt").write_text("old\n")
+    index = InvertedIndex(str(folder)).build()
+    (folder / "a.txt").unlink()
+    (folder / "c.txt").write_text("new\n")
+    index.refresh()
+    assert index.lookup("old") == {}
+    assert index.lookup("new") == {'c.txt': [1]}
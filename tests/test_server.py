@@ -0,0 +1,166 @@
+import asyncio
+import base64
+import json
+import threading
+
+import pytest
+
+from pagefault import server as server_module
+from pagefault.server import FileServer
+from pagefault.service import AnalyzerService
+from pagefault.users import UserStore
+
+AUTH = "Basic " + base64.b64encode(b"alice:secret").decode()
+
+
+@pytest.fixture
+def server(tmp_path):
+    users = UserStore(str(tmp_path / "users.txt"), iterations=1000)
+    users.set_password("alice", "secret")
+    service = AnalyzerService(4, 8, "lru", log_path=None)
+    server = FileServer(service, users, str(tmp_path / "data"), workers=2, idle_timeout=0.5)
+    yield server
+    server.close()
+
+
+def exchange(server, data, close_write=False):
+    """Send raw bytes to a fresh connection and return (status, payload) of the reply"""
+    async def run():
+        listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(data)
+            if close_write:
+                writer.write_eof()
+            await writer.drain()
+            reply = await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+            return reply
+    reply = asyncio.run(run())
+    head, _, body = reply.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+
+def post(payload):
+    body = json.dumps(payload).encode()
+    return (f"POST / HTTP/1.1\r\nAuthorization: {AUTH}\r\nContent-Length: {len(body)}\r\n"
+            f"Connection: close\r\n\r\n").encode() + body
+
+
+def test_batch_continues_after_failing_operation(server):
+    status, results = exchange(server, post([
+        {"op": "create", "file": "a.txt"},
+        {"op": "search", "file": "a.txt", "keyword": 5},
+        {"op": "write", "file": "a.txt", "content": "hello"},
+        {"op": "read", "file": "a.txt"},
+    ]))
+    assert status == 200
+    assert [result['ok'] for result in results] == [True, False, True, True]
+    assert results[3]['result'] == "hello\n"
+
+
+def test_operation_errors(server):
+    assert server.execute("alice", {"op": "read", "file": "missing.txt"})['ok'] is False
+    assert "Missing field" in server.execute("alice", {"op": "write", "file": "a.txt"})['error']
+    assert server.execute("alice", {"op": "create", "file": "../escape"})['ok'] is False
+    assert server.execute("alice", {"op": "nope"})['error'] == "Unknown operation: 'nope'"
+    assert server.execute("alice", ["not", "an", "object"])['ok'] is False
+
+
+def test_unexpected_failure_answers_500(server, monkeypatch):
+    def broken(username, payload):
+        raise RuntimeError("boom")
+    monkeypatch.setattr(server, "execute_batch", broken)
+    status, payload = exchange(server, post({"op": "stats"}))
+    assert status == 500 and payload['ok'] is False
+
+
+def test_short_body_answers_400(server):
+    request = f"POST / HTTP/1.1\r\nAuthorization: {AUTH}\r\nContent-Length: 100\r\n\r\n{{}}".encode()
+    assert exchange(server, request, close_write=True)[0] == 400
+
+
+def test_stalled_body_times_out(server):
+    request = f"POST / HTTP/1.1\r\nAuthorization: {AUTH}\r\nContent-Length: 100\r\n\r\n{{}}".encode()
+    assert exchange(server, request)[0] == 408
+
+
+def test_bad_requests(server):
+    assert exchange(server, b"GARBAGE\r\n\r\n")[0] == 400
+    assert exchange(server, b"POST / HTTP/1.1\r\nContent-Length: -5\r\n\r\n")[0] == 400
+    assert exchange(server, b"POST / HTTP/1.1\r\nContent-Length: 2\r\n\r\n{}")[0] == 401
+    request = f"POST / HTTP/1.1\r\nAuthorization: {AUTH}\r\nContent-Length: 3\r\n\r\n{{x}}".encode()
+    assert exchange(server, request)[0] == 400
+    request = f"GET /nowhere HTTP/1.1\r\nAuthorization: {AUTH}\r\n\r\n".encode()
+    assert exchange(server, request, close_write=True)[0] == 404
+
+
+def test_keep_alive_authenticates_once(server, monkeypatch):
+    calls = []
+    verify = server.users.verify
+    monkeypatch.setattr(server.users, "verify", lambda *args: calls.append(args) or verify(*args))
+    body = json.dumps([{"op": "create", "file": "a.txt"}, {"op": "write", "file": "a.txt", "content": "hi"}])
+    data = (f"POST / HTTP/1.1\r\nAuthorization: {AUTH}\r\nContent-Length: {len(body)}\r\n\r\n{body}"
+            f"GET /stats/all HTTP/1.1\r\nAuthorization: {AUTH}\r\n\r\n"
+            f"GET /stats HTTP/1.1\r\nAuthorization: {AUTH}\r\nConnection: close\r\n\r\n").encode()
+
+    async def run():
+        listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(data)
+            replies = []
+            for _ in range(3):
+                head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 5)
+                length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+                replies.append((int(head.split()[1]), json.loads(await reader.readexactly(length))))
+            assert await reader.read() == b""
+            writer.close()
+            return replies
+
+    (status, batch), (_, everyone), (_, mine) = asyncio.run(run())
+    assert status == 200 and [result['ok'] for result in batch] == [True, True]
+    assert everyone['result']['users']['alice']['total'] == mine['result']['total'] == 2
+    assert len(calls) == 1
+
+
+def test_building_one_users_files_does_not_block_others(server, monkeypatch):
+    release = threading.Event()
+    built = []
+
+    class SlowFiles:
+        def __init__(self, folder, session, indexed=False):
+            if folder.endswith("alice"):
+                release.wait(5)
+            built.append(folder)
+
+    monkeypatch.setattr(server_module, "UserFiles", SlowFiles)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(server.files("alice"))) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    server.files("bob")
+    assert [folder[-3:] for folder in built] == ["bob"] and not results
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert results[0] is results[1]
+    assert len(built) == 2
+
+
+def test_failed_files_build_is_retried(server, monkeypatch):
+    calls = []
+
+    class FlakyFiles:
+        def __init__(self, folder, session, indexed=False):
+            calls.append(folder)
+            if len(calls) == 1:
+                raise OSError("disk busy")
+
+    monkeypatch.setattr(server_module, "UserFiles", FlakyFiles)
+    with pytest.raises(OSError):
+        server.files("alice")
+    assert isinstance(server.files("alice"), FlakyFiles)
+    assert len(calls) == 2
@@ -0,0 +1,93 @@
+import threading
+
+import pytest
+
+from pagefault.service import AnalyzerService, SharedFramePool
+
+
+def test_pool_counts_stolen_frames():
+    pool = SharedFramePool(2, "lru")
+    assert not pool.access("alice", 1)
+    assert not pool.access("alice", 2)
+    assert pool.access("alice", 1)
+    assert not pool.access("bob", 1)
+    assert pool.get_stats("alice")['stolen'] == 1
+    assert pool.get_stats("alice")['resident'] == 1
+    stats = pool.get_stats()
+    assert (stats['hits'], stats['faults'], stats['resident']) == (1, 3, 2)
+    pool.remove_user("alice")
+    assert pool.get_stats()['resident'] == 1
+    assert pool.get_stats("alice")['faults'] == 0
+
+
+@pytest.mark.parametrize("shards", [1, 3])
+def test_pool_shards_share_the_capacity(shards):
+    pool = SharedFramePool(10, "clock", shards)
+    for key in range(50):
+        pool.access("alice", key)
+    stats = pool.get_stats()
+    assert stats['shards'] == shards and stats['resident'] <= 10 and stats['faults'] == 50
+
+
+def test_pool_refuses_opt():
+    with pytest.raises(ValueError):
+        SharedFramePool(4, "opt")
+
+
+def test_whole_file_references_use_the_analyzers_key():
+    service = AnalyzerService(4, 8, log_path=None, page_size=4096, shards=1)
+    session = service.session("alice")
+    session.process_page("a.txt", "CREATE")
+    session.process_range("a.txt", "WRITE", 0, 5000)
+    keys = [page[1] for page in service.pool._shards[0].policy.pages()]
+    page_id = session.analyzer.generate_page_id("a.txt")
+    assert keys == [page_id, (page_id, 0), (page_id, 1)]
+    assert keys == session.analyzer.frames
+
+
+def test_sessions_in_parallel():
+    service = AnalyzerService(4, 16, log_path=None)
+    names = [f"user{i}" for i in range(4)]
+
+    def work(username):
+        session = service.session(username)
+        for i in range(500):
+            session.process_page(f"f{i % 9}.txt", "READ")
+
+    threads = [threading.Thread(target=work, args=(name,)) for name in names]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = service.get_stats()
+    assert service.users == names
+    assert stats['total'] == 2000 and stats['pool']['total'] == 2000
+    assert all(user['total'] == 500 for user in stats['users'].values())
+
+
+def test_reset_user_and_flush(tmp_path):
+    log = tmp_path / "log.txt"
+    service = AnalyzerService(4, 8, log_path=str(log))
+    alice, bob = service.session("alice"), service.session("bob")
+    alice.process_page("a.txt", "READ")
+    bob.process_page("b.txt", "READ")
+    alice.flush()
+    assert log.read_text().count("\n") == 2
+    alice.reset()
+    assert alice.get_stats()['total'] == 0
+    assert alice.get_stats()['pool']['resident'] == 0
+    assert bob.get_stats()['total'] == 1
+    service.close()
+
+
+def test_state_survives_a_restart(tmp_path):
+    state = str(tmp_path / "state")
+    service = AnalyzerService(3, 8, log_path=None, state_dir=state)
+    for name in ("a", "b", "c", "a", "d"):
+        service.session("alice").process_page(f"{name}.txt", "READ")
+    frames = service.analyzer("alice").frames
+    service.close()
+    restored = AnalyzerService(3, 8, log_path=None, state_dir=state)
+    assert restored.analyzer("alice").frames == frames
+    assert restored.session("alice").get_stats()['total'] == 5
+    restored.close()
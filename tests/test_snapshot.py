@@ -0,0 +1,99 @@
+import os
+import random
+
+import pytest
+
+from pagefault import snapshot
+from pagefault.analyzer import PageFaultAnalyzer
+
+
+def analyzer(tmp_path, policy="lru", **options):
+    return PageFaultAnalyzer(4, log_path=None, policy=policy, binary_log_path=str(tmp_path / "trace.bin"),
+                             snapshot_path=str(tmp_path / "state.snap"), **options)
+
+
+def feed(target, count, seed):
+    rng = random.Random(seed)
+    for _ in range(count):
+        name = f"file{rng.randint(1, 12)}.txt"
+        if target.page_size:
+            target.process_range(name, "READ", rng.randint(0, 20000), rng.randint(1, 9000))
+        else:
+            target.process_page(name, "READ")
+
+
+def summary(target):
+    stats = target.get_stats()
+    return stats['hits'], stats['faults'], stats['frames'], stats['history'], stats['metrics']
+
+
+def test_encoding_round_trip():
+    value = {'none': None, 'flags': [True, False], 'int': -2 ** 40, 'float': 1.5, 'text': "héllo",
+             'bytes': b"\x00\xff", 'keys': [(3, 0), 7], 1: {'nested': ()}}
+    assert snapshot.loads(snapshot.dumps(value)) == value
+
+
+def test_corrupt_snapshot_rejected():
+    data = bytearray(snapshot.dumps({'a': 1}))
+    data[-1] ^= 0xFF
+    with pytest.raises(ValueError):
+        snapshot.loads(bytes(data))
+    with pytest.raises(ValueError):
+        snapshot.loads(b"PFSNAP")
+
+
+@pytest.mark.parametrize("policy", ["fifo", "lru", "clock", "lfu", "arc"])
+@pytest.mark.parametrize("page_size", [None, 4096])
+def test_resume_after_close(tmp_path, policy, page_size):
+    first = analyzer(tmp_path, policy, page_size=page_size, working_set_window=50)
+    feed(first, 300, 1)
+    expected = summary(first)
+    first.close()
+    resumed = analyzer(tmp_path, policy, page_size=page_size, working_set_window=50)
+    assert summary(resumed) == expected
+    resumed.close()
+
+
+def test_resume_replays_trace_tail(tmp_path):
+    # No close(): the last checkpoint is behind and the trace holds the rest
+    first = analyzer(tmp_path, checkpoint_every=64)
+    feed(first, 250, 2)
+    first.binary_log.flush()
+    expected = summary(first)
+    resumed = analyzer(tmp_path)
+    assert summary(resumed) == expected
+    assert first.get_stats()['total'] % 64 != 0
+
+
+def test_incompatible_snapshot_replays_whole_trace(tmp_path):
+    first = analyzer(tmp_path)
+    feed(first, 100, 3)
+    first.close()
+    other = PageFaultAnalyzer(6, log_path=None, binary_log_path=str(tmp_path / "trace.bin"),
+                              snapshot_path=str(tmp_path / "state.snap"))
+    assert other.get_stats()['total'] == 100
+
+
+def test_reset_removes_snapshot(tmp_path):
+    first = analyzer(tmp_path)
+    feed(first, 50, 4)
+    first.checkpoint()
+    first.reset()
+    assert not os.path.exists(tmp_path / "state.snap")
+    first.close()
+    assert analyzer(tmp_path).get_stats()['total'] == 0
+
+
+def test_opt_cannot_be_snapshotted(tmp_path):
+    with pytest.raises(ValueError):
+        analyzer(tmp_path, "opt")
+
+
+def test_checkpoint_size_does_not_grow_with_distinct_files(tmp_path):
+    first = analyzer(tmp_path, history_size=10)
+    for i in range(20000):
+        first.process_page(f"file{i}.txt", "READ")
+    expected = summary(first)
+    first.close()
+    assert os.path.getsize(tmp_path / "state.snap") < 4096
+    assert summary(analyzer(tmp_path, history_size=10)) == expected
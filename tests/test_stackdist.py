@@ -0,0 +1,60 @@
+import random
+
+from pagefault import cli
+from pagefault.policies import make_policy
+from pagefault.stackdist import StackDistanceAnalyzer, belady_anomalies, fifo_sweep
+
+
+def references(n=3000, pages=40, seed=11):
+    rng = random.Random(seed)
+    return [rng.randint(1, pages) for _ in range(n)]
+
+
+def faults(name, frames, ids):
+    policy = make_policy(name, frames)
+    return sum(not policy.access(page) for page in ids)
+
+
+def test_lru_curve_matches_per_size_simulation():
+    ids = references()
+    curve = StackDistanceAnalyzer().feed(ids).miss_ratio_curve(24)
+    assert [point['frames'] for point in curve] == list(range(1, 25))
+    for point in curve:
+        assert point['faults'] == faults("lru", point['frames'], ids)
+        assert point['hits'] + point['faults'] == len(ids)
+
+
+def test_stack_distances():
+    analyzer = StackDistanceAnalyzer()
+    assert [analyzer.access(page) for page in [1, 2, 3, 1, 1, 3, 2]] == [None, None, None, 3, 1, 2, 3]
+
+
+def test_fifo_sweep_matches_per_size_simulation():
+    ids = references(seed=5)
+    for point in fifo_sweep(ids, range(1, 16)):
+        assert point['faults'] == faults("fifo", point['frames'], ids)
+
+
+def test_belady_anomaly_detected():
+    curve = fifo_sweep([1, 2, 3, 4, 1, 2, 5, 1, 2, 3, 4, 5], range(1, 6))
+    assert (3, 4) in belady_anomalies(curve)
+
+
+
+def test_compaction_keeps_distances():
+    # A tiny tree forces many compactions; page keys may be tuples
+    ids = [(page % 30, page % 2) for page in references(5000, 200, seed=8)]
+    small = StackDistanceAnalyzer(initial_size=4)
+    large = StackDistanceAnalyzer(initial_size=1 << 16)
+    assert [small.access(page) for page in ids] == [large.access(page) for page in ids]
+
+
+def test_curve_command(tmp_path, capsys):
+    trace = tmp_path / "trace.txt"
+    trace.write_text("\n".join(map(str, [1, 2, 3, 4, 1, 2, 5, 1, 2, 3, 4, 5])) + "\n")
+    assert cli.main(["curve", str(trace), "--fifo", "--max-frames", "5"]) == 0
+    out = capsys.readouterr().out
+    assert "3 -> 4 frames" in out
+    assert cli.main(["curve", str(trace), "--max-frames", "5"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[5].split("|")[2].strip() == str(faults("lru", 3, [1, 2, 3, 4, 1, 2, 5, 1, 2, 3, 4, 5]))
@@ -0,0 +1,66 @@
+import pytest
+
+from pagefault.users import UserStore, check_password, hash_password, is_hashed
+
+
+def store(path, **options):
+    options.setdefault('iterations', 1000)
+    return UserStore(str(path), **options)
+
+
+@pytest.mark.parametrize("kdf, options", [("pbkdf2_sha256", {'iterations': 1000}), ("scrypt", {'n': 16})])
+def test_hash_and_check(kdf, options):
+    encoded = hash_password("secret", kdf, **options)
+    assert is_hashed(encoded) and " " not in encoded
+    assert check_password("secret", encoded)
+    assert not check_password("wrong", encoded)
+    assert not check_password("secret", "secret")
+
+
+def test_plaintext_users_are_migrated(tmp_path):
+    path = tmp_path / "users.txt"
+    path.write_text("alice secret\nbob hunter2\n")
+    users = store(path)
+    assert users.verify("alice", "secret")
+    assert not users.verify("alice", "hunter2")
+    assert not users.verify("carol", "secret")
+    lines = path.read_text().splitlines()
+    assert [line.split(" ")[0] for line in lines] == ["alice", "bob"]
+    assert all(is_hashed(line.split(" ", 1)[1]) for line in lines)
+    assert store(path).verify("bob", "hunter2")
+
+
+def test_migration_can_be_left_to_the_caller(tmp_path):
+    path = tmp_path / "users.txt"
+    path.write_text("alice secret\n")
+    assert store(path, migrate=False).verify("alice", "secret")
+    assert path.read_text() == "alice secret\n"
+
+
+def test_outdated_hash_is_upgraded_on_login(tmp_path):
+    path = tmp_path / "users.txt"
+    store(path, iterations=1000).set_password("alice", "secret")
+    users = store(path, iterations=2000)
+    assert users.verify("alice", "secret")
+    assert path.read_text().split(" ", 1)[1].startswith("pbkdf2_sha256$2000$")
+    assert store(path, iterations=2000).verify("alice", "secret")
+
+
+def test_edits_to_the_file_are_picked_up(tmp_path):
+    path = tmp_path / "users.txt"
+    users = store(path)
+    users.set_password("alice", "secret")
+    assert "alice" in users and len(users) == 1
+    other = store(path)
+    other.set_password("bob", "pw")
+    assert users.verify("bob", "pw")
+    assert users.remove("alice") and not users.remove("alice")
+    assert "alice" not in other
+
+
+def test_bad_usernames_and_kdfs(tmp_path):
+    users = store(tmp_path / "users.txt")
+    with pytest.raises(ValueError):
+        users.set_password("two words", "pw")
+    with pytest.raises(ValueError):
+        UserStore(str(tmp_path / "users.txt"), kdf="md5")